@@ -0,0 +1,72 @@
+from datetime import datetime
+from typing import List, Optional
+
+from fastapi import APIRouter, HTTPException, Query
+from fastapi.responses import StreamingResponse
+
+from app.auth import AuthorizedUser
+from app.libs.lead_export import (
+    LeadExportError,
+    LeadExportFilters,
+    decode_cursor,
+    export_leads,
+    next_cursor,
+    to_timestamp,
+)
+from app.libs.lead_store import get_lead_store
+from app.libs.prospect_scoring import OutputFormat
+
+router = APIRouter(prefix="/export", tags=["export"])
+
+MEDIA_TYPES = {"ndjson": "application/x-ndjson", "csv": "text/csv"}
+
+
+@router.get("/leads")
+def export_stored_leads(
+    user: AuthorizedUser,
+    output_format: OutputFormat = Query(default="ndjson", alias="format"),
+    created_from: Optional[datetime] = None,
+    created_to: Optional[datetime] = None,
+    industry: Optional[List[str]] = Query(default=None),
+    min_savings: Optional[float] = None,
+    max_savings: Optional[float] = None,
+    cursor: Optional[str] = None,
+    limit: Optional[int] = Query(default=None, ge=1, le=1_000_000),
+) -> StreamingResponse:
+    """Stream stored leads with their ROI metrics as flat columns.
+
+    Rows come in insertion order. Without `limit` the whole filtered set is
+    streamed; with it, `X-Next-Cursor` carries the cursor for the next page
+    and is absent on the last one.
+    """
+
+    filters = LeadExportFilters(
+        created_from=to_timestamp(created_from),
+        created_to=to_timestamp(created_to),
+        industries=industry or [],
+        min_savings=min_savings,
+        max_savings=max_savings,
+    )
+    try:
+        filters.validate()
+        after = decode_cursor(cursor)
+    except LeadExportError as exc:
+        raise HTTPException(status_code=422, detail=str(exc)) from exc
+
+    conn = get_lead_store().open_reader()
+    headers = {}
+    if limit is not None:
+        try:
+            following = next_cursor(conn, filters, after, limit)
+        except BaseException:
+            conn.close()
+            raise
+        if following:
+            headers["X-Next-Cursor"] = following
+    if output_format == "csv":
+        headers["Content-Disposition"] = 'attachment; filename="leads.csv"'
+    return StreamingResponse(
+        export_leads(conn, filters, output_format, after=after, limit=limit),
+        media_type=MEDIA_TYPES[output_format],
+        headers=headers,
+    )
@@ -0,0 +1,68 @@
+import time
+from datetime import datetime
+from typing import List, Optional
+
+from fastapi import APIRouter, HTTPException, Query
+
+from app.auth import AuthorizedUser
+from app.libs.lead_export import LeadExportError, LeadExportFilters, to_timestamp
+from app.libs.lead_query import (
+    MAX_QUERY_LIMIT,
+    LeadQuery,
+    LeadQueryResult,
+    LeadSortField,
+    SortOrder,
+    run_lead_query,
+)
+from app.libs.lead_store import get_lead_store
+
+router = APIRouter(prefix="/lead-query", tags=["leads"])
+
+
+@router.get("/leads", response_model=LeadQueryResult)
+def query_leads(
+    user: AuthorizedUser,
+    industry: Optional[List[str]] = Query(default=None),
+    created_from: Optional[datetime] = None,
+    created_to: Optional[datetime] = None,
+    last_days: Optional[int] = Query(default=None, ge=1, description="Shorthand for created_from = now - last_days"),
+    min_savings: Optional[float] = None,
+    max_savings: Optional[float] = None,
+    company: Optional[str] = Query(default=None, min_length=1, description="Case-insensitive company name prefix"),
+    sort: LeadSortField = "created_at",
+    order: SortOrder = "desc",
+    limit: int = Query(default=50, ge=1, le=MAX_QUERY_LIMIT),
+    cursor: Optional[str] = None,
+    explain: bool = Query(default=False, description="Include the query plan, indexes used and timing"),
+) -> LeadQueryResult:
+    """Filter and sort stored leads, one keyset page at a time.
+
+    For example `?industry=automotive&min_savings=50000&last_days=30`. Pass
+    the returned `next_cursor` back with the same filters and sort for the
+    next page.
+    """
+
+    since = to_timestamp(created_from)
+    if last_days is not None:
+        since = max(since or 0.0, time.time() - last_days * 86400)
+    query = LeadQuery(
+        filters=LeadExportFilters(
+            created_from=since,
+            created_to=to_timestamp(created_to),
+            industries=industry or [],
+            min_savings=min_savings,
+            max_savings=max_savings,
+            company_prefix=company,
+        ),
+        sort=sort,
+        order=order,
+        limit=limit,
+        cursor=cursor,
+    )
+    conn = get_lead_store().open_reader()
+    try:
+        return run_lead_query(conn, query, explain=explain)
+    except LeadExportError as exc:
+        raise HTTPException(status_code=422, detail=str(exc)) from exc
+    finally:
+        conn.close()
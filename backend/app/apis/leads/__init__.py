@@ -1,19 +1,32 @@
 from __future__ import annotations
 
 from typing import Optional
-import logging
 
-from fastapi import APIRouter
+from fastapi import APIRouter, Depends, Header, HTTPException, Request
+from fastapi.responses import Response
 from pydantic import BaseModel, EmailStr, Field
 
+from app.auth import require_stats_token
 from app.libs.domain_model import RoiCalculationResult, RoiInputs
+from app.libs.idempotency import (
+    MAX_KEY_LENGTH,
+    IdempotencyConflictError,
+    IdempotencyInProgressError,
+    IdempotentResponse,
+    body_hash,
+    get_idempotency_store,
+)
+from app.libs.lead_outbox import OutboxWorkerStats
+from app.libs.lead_store import LeadStoreError, get_lead_store, new_lead_record
+from app.libs.monday_client import LeadDetails
 from app.libs.roi_calculator import calculate_roi
-
-# Setup logging
-logger = logging.getLogger("uvicorn")
+from app.libs.structured_log import LogPipelineStats, get_lead_log
 
 router = APIRouter(prefix="/leads", tags=["leads"])
 
+# Seconds a client should wait before retrying when the lead store is saturated
+LEAD_STORE_RETRY_AFTER = 1
+
 
 class LeadContact(BaseModel):
     name: str = Field(..., min_length=2)
@@ -31,30 +44,90 @@ class LeadSubmissionRequest(BaseModel):
 class LeadSubmissionResponse(BaseModel):
     roi: RoiCalculationResult
     message: str
+    lead_id: Optional[str] = None
 
 
 @router.post("/submit", response_model=LeadSubmissionResponse)
-def submit_lead(payload: LeadSubmissionRequest) -> LeadSubmissionResponse:
+def submit_lead(
+    payload: LeadSubmissionRequest,
+    idempotency_key: Optional[str] = Header(default=None, alias="Idempotency-Key"),
+) -> Response:
+    """Store a lead with its ROI calculation.
+
+    Clients retrying a submission should send the same `Idempotency-Key`;
+    repeats get the original response back, marked `Idempotent-Replayed`,
+    and concurrent repeats wait for the first one instead of running again.
+    """
+
+    if idempotency_key is None:
+        return Response(content=_submit_lead(payload).model_dump_json(), media_type="application/json")
+    if not idempotency_key or len(idempotency_key) > MAX_KEY_LENGTH:
+        raise HTTPException(status_code=400, detail=f"Idempotency-Key must be 1-{MAX_KEY_LENGTH} characters")
+
+    try:
+        result = get_idempotency_store().run(
+            idempotency_key,
+            body_hash(payload.model_dump_json().encode()),
+            lambda: IdempotentResponse(200, _submit_lead(payload).model_dump_json().encode()),
+        )
+    except IdempotencyConflictError as exc:
+        raise HTTPException(status_code=422, detail=str(exc)) from exc
+    except IdempotencyInProgressError as exc:
+        raise HTTPException(status_code=409, detail=str(exc)) from exc
+    headers = {"Idempotent-Replayed": "true"} if result.replayed else None
+    return Response(content=result.body, status_code=result.status_code, media_type="application/json", headers=headers)
+
+
+def _submit_lead(payload: LeadSubmissionRequest) -> LeadSubmissionResponse:
     # 1. Calculate ROI first
     roi_result = calculate_roi(payload.inputs)
 
-    # 2. Log the lead details (This serves as your "database" in Vercel logs for now)
-    lead_info = (
-        f"NEW LEAD SUBMITTED:\n"
-        f"Name: {payload.contact.name}\n"
-        f"Email: {payload.contact.email}\n"
-        f"Company: {payload.contact.company}\n"
-        f"Phone: {payload.contact.phone}\n"
-        f"Notes: {payload.contact.notes}\n"
-        f"Potential Savings: ${roi_result.metrics.net_annual_savings:,.2f}"
+    # 2. Persist the lead, the background writer group-commits it to disk
+    record = new_lead_record(LeadDetails(**payload.contact.model_dump()), roi_result)
+    try:
+        get_lead_store().append(record)
+    except LeadStoreError as exc:
+        # The writer is behind; nothing was stored, so a retry is safe
+        raise HTTPException(
+            status_code=503, detail=str(exc), headers={"Retry-After": str(LEAD_STORE_RETRY_AFTER)}
+        ) from exc
+
+    # 3. Log the lead as one JSON line, written off the request path with contact details redacted
+    get_lead_log().logger.info(
+        "Lead submitted",
+        extra={
+            "lead": {
+                "lead_id": record.lead_id,
+                "merged": record.merged,
+                **payload.contact.model_dump(),
+                "industry": roi_result.profile.key,
+                "net_annual_savings": roi_result.metrics.net_annual_savings,
+            }
+        },
     )
-    logger.info(lead_info)
-    print(lead_info) # Ensure it prints to stdout
 
-    # 3. TODO: Add Email Sending Logic Here (SendGrid/SMTP)
+    # 4. TODO: Add Email Sending Logic Here (SendGrid/SMTP)
     # For now, we just return success.
 
     return LeadSubmissionResponse(
         roi=roi_result,
-        message="Lead received successfully. Check logs.",
+        message="Lead received successfully.",
+        lead_id=record.lead_id,
     )
+
+
+@router.get("/log-stats", response_model=LogPipelineStats, dependencies=[Depends(require_stats_token)])
+def get_log_stats() -> LogPipelineStats:
+    """Report the lead log queue depth and how many records were dropped."""
+
+    return get_lead_log().stats()
+
+
+@router.get("/delivery-stats", response_model=OutboxWorkerStats, dependencies=[Depends(require_stats_token)])
+def get_delivery_stats(request: Request) -> OutboxWorkerStats:
+    """Report Monday.com delivery progress, pacing and circuit breaker state."""
+
+    worker = getattr(request.app.state, "outbox_worker", None)
+    if worker is None:
+        raise HTTPException(status_code=404, detail="Monday.com delivery is not configured")
+    return worker.stats()
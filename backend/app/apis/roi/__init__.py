@@ -1,13 +1,244 @@
-from fastapi import APIRouter
+import io
+import os
 
-from app.libs.domain_model import RoiCalculationResult, RoiInputs
-from app.libs.roi_calculator import calculate_roi
+import numpy as np
+from fastapi import APIRouter, Depends, Header, HTTPException, Query, UploadFile
+from fastapi.responses import Response, StreamingResponse
+from pydantic import ValidationError
+
+from app.auth import require_stats_token
+from app.libs.domain_model import (
+    RoiBatchRequest,
+    RoiBatchResult,
+    RoiCalculationResult,
+    RoiComparisonRequest,
+    RoiComparisonResult,
+    RoiInputs,
+    RoiMonteCarloRequest,
+    RoiMonteCarloResult,
+    RoiProjectionRequest,
+    RoiProjectionResult,
+    RoiSensitivityGrid,
+    RoiSensitivityRequest,
+    RoiSolveRequest,
+    RoiSolveResult,
+)
+from app.libs.prospect_scoring import (
+    OutputFormat,
+    ProspectCsvError,
+    open_prospect_csv,
+    score_prospect_rows,
+)
+from app.libs.roi_cache import RoiCacheStats, roi_result_cache, snap_inputs
+from app.libs.roi_calculator import calculate_roi_batch
+from app.libs.roi_comparison import compare_scenarios
+from app.libs.roi_montecarlo import simulate_roi, summarize_simulation
+from app.libs.roi_projection import ProjectionAssumptions, downsample_timeline, project_cash_flows
+from app.libs.roi_sensitivity import calculate_roi_grid, to_sensitivity_grid
+from app.libs.roi_solver import solve_roi_batch
 
 router = APIRouter(prefix="/roi", tags=["roi"])
 
+# Edge cache lifetime for GET /roi/calculate. Responses only change when the
+# assumption table does, and the table version is part of every ETag.
+ROI_EDGE_MAX_AGE = int(os.environ.get("ROI_EDGE_MAX_AGE", "86400"))
+
 
 @router.post("/calculate", response_model=RoiCalculationResult)
-def run_roi_calculation(request: RoiInputs) -> RoiCalculationResult:
+def run_roi_calculation(request: RoiInputs) -> Response:
     """Calculate automation ROI using shared calculator assumptions."""
 
-    return calculate_roi(request)
+    return Response(content=roi_result_cache.get_json(request), media_type="application/json")
+
+
+def _etag_matches(if_none_match: str | None, etag: str) -> bool:
+    if not if_none_match:
+        return False
+    candidates = [tag.strip() for tag in if_none_match.split(",")]
+    # If-None-Match uses the weak comparison, so W/ prefixes are ignored
+    return "*" in candidates or etag in (tag.removeprefix("W/") for tag in candidates)
+
+
+@router.get("/calculate", response_model=RoiCalculationResult)
+def get_roi_calculation(
+    # nan and inf would fail to snap, so they are rejected with a 422 up front
+    hours_per_week: float = Query(allow_inf_nan=False),
+    labor_rate: float = Query(allow_inf_nan=False),
+    tool_cost: float = Query(allow_inf_nan=False),
+    industry: str = "general",
+    if_none_match: str | None = Header(default=None),
+) -> Response:
+    """CDN-cacheable variant of the ROI calculation.
+
+    Inputs are snapped to the calculator slider steps before calculating, so
+    nearby values share one cached response. Responses carry a strong ETag
+    tied to the assumption table version and honor If-None-Match.
+    """
+
+    try:
+        payload = snap_inputs(hours_per_week, labor_rate, tool_cost, industry)
+    except ValidationError as exc:
+        raise HTTPException(status_code=422, detail=exc.errors(include_url=False)) from exc
+
+    entry = roi_result_cache.lookup(payload)
+    headers = {
+        "ETag": entry.etag,
+        "Cache-Control": f"public, max-age=0, s-maxage={ROI_EDGE_MAX_AGE}, stale-while-revalidate=60",
+    }
+    if _etag_matches(if_none_match, entry.etag):
+        return Response(status_code=304, headers=headers)
+    return Response(content=entry.body, media_type="application/json", headers=headers)
+
+
+@router.get("/cache-stats", response_model=RoiCacheStats, dependencies=[Depends(require_stats_token)])
+def get_roi_cache_stats() -> RoiCacheStats:
+    """Report hit/miss/eviction counters for the ROI result cache."""
+
+    return roi_result_cache.stats()
+
+
+@router.post("/calculate-batch", response_model=RoiBatchResult)
+def run_roi_batch_calculation(request: RoiBatchRequest) -> RoiBatchResult:
+    """Calculate automation ROI for many prospects in one vectorized pass."""
+
+    try:
+        batch = calculate_roi_batch(
+            request.hours_per_week,
+            request.labor_rate,
+            request.tool_cost,
+            request.industry,
+        )
+    except ValueError as exc:
+        raise HTTPException(status_code=422, detail=str(exc)) from exc
+
+    payback = batch.payback_months
+    return RoiBatchResult(
+        profile=batch.profile_keys.tolist(),
+        annual_labor_cost=batch.annual_labor_cost.tolist(),
+        annual_savings_low=batch.annual_savings_low.tolist(),
+        annual_savings_expected=batch.annual_savings_expected.tolist(),
+        annual_savings_high=batch.annual_savings_high.tolist(),
+        monthly_savings=batch.monthly_savings.tolist(),
+        annual_tool_cost=batch.annual_tool_cost.tolist(),
+        net_annual_savings=batch.net_annual_savings.tolist(),
+        payback_months=np.where(np.isnan(payback), None, payback).tolist(),
+    )
+
+
+@router.post("/sensitivity", response_model=RoiSensitivityGrid)
+def run_roi_sensitivity(request: RoiSensitivityRequest) -> RoiSensitivityGrid:
+    """Heatmap of net annual savings and payback across input ranges."""
+
+    try:
+        metrics = calculate_roi_grid(
+            request.industry,
+            request.hours_per_week,
+            request.labor_rate,
+            request.tool_cost,
+        )
+    except ValueError as exc:
+        raise HTTPException(status_code=422, detail=str(exc)) from exc
+    return to_sensitivity_grid(metrics)
+
+
+@router.post("/monte-carlo", response_model=RoiMonteCarloResult)
+def run_roi_monte_carlo(request: RoiMonteCarloRequest) -> RoiMonteCarloResult:
+    """Probabilistic ROI: savings and payback distributions from seeded draws."""
+
+    simulation = simulate_roi(
+        request.inputs,
+        draws=request.draws,
+        seed=request.seed,
+        hours_spread=request.hours_spread,
+        labor_rate_spread=request.labor_rate_spread,
+    )
+    return summarize_simulation(request.inputs, simulation)
+
+
+@router.post("/solve", response_model=RoiSolveResult)
+def run_roi_solver(request: RoiSolveRequest) -> RoiSolveResult:
+    """Inverse ROI: break-even or target-payback values for many prospects."""
+
+    try:
+        result = solve_roi_batch(
+            request.solve_for,
+            request.target,
+            request.target_value,
+            industries=request.industry,
+            hours_per_week=request.hours_per_week,
+            labor_rate=request.labor_rate,
+            tool_cost=request.tool_cost,
+            scenario=request.scenario,
+        )
+    except ValueError as exc:
+        raise HTTPException(status_code=422, detail=str(exc)) from exc
+
+    return RoiSolveResult(
+        solve_for=request.solve_for,
+        target=request.target,
+        target_value=request.target_value,
+        scenario=request.scenario,
+        values=np.where(np.isnan(result.values), None, result.values).tolist(),
+        feasible=result.feasible.tolist(),
+    )
+
+
+@router.post("/projection", response_model=RoiProjectionResult)
+def run_roi_projection(request: RoiProjectionRequest) -> RoiProjectionResult:
+    """Multi-year cash-flow projection with ramp-up, escalation, NPV and IRR."""
+
+    scenarios = request.scenarios
+    timeline = project_cash_flows(
+        [s.hours_per_week for s in scenarios],
+        [s.labor_rate for s in scenarios],
+        [s.tool_cost for s in scenarios],
+        [s.industry for s in scenarios],
+        ProjectionAssumptions(
+            years=request.years,
+            ramp_months=request.ramp_months,
+            ramp_curve=request.ramp_curve,
+            tool_escalation=request.tool_escalation,
+            wage_inflation=request.wage_inflation,
+            discount_rate=request.discount_rate,
+            implementation_cost=request.implementation_cost,
+        ),
+    )
+    return downsample_timeline(timeline, request.resolution)
+
+
+@router.post("/compare", response_model=RoiComparisonResult)
+def run_roi_comparison(request: RoiComparisonRequest) -> RoiComparisonResult:
+    """Compare pricing tiers or automation scopes against one base in a single call."""
+
+    try:
+        return compare_scenarios(request)
+    except ValueError as exc:
+        raise HTTPException(status_code=422, detail=str(exc)) from exc
+
+
+_STREAM_MEDIA_TYPES = {"ndjson": "application/x-ndjson", "csv": "text/csv"}
+
+
+@router.post("/score-csv")
+def score_prospect_csv(
+    file: UploadFile,
+    output_format: OutputFormat = Query(default="ndjson", alias="format"),
+) -> StreamingResponse:
+    """Score an uploaded prospect CSV and stream the results back row by row.
+
+    The CSV needs `hours_per_week`, `labor_rate` and `tool_cost` columns, plus an
+    optional `industry` column. Rows are scored in fixed-size chunks so the file
+    is never fully loaded into memory. A file that cannot be read past some
+    point ends with a record holding only `error`.
+    """
+
+    source = io.TextIOWrapper(file.file, encoding="utf-8-sig", newline="")
+    try:
+        reader = open_prospect_csv(source)
+    except (ProspectCsvError, UnicodeDecodeError) as exc:
+        raise HTTPException(status_code=400, detail=str(exc)) from exc
+
+    return StreamingResponse(
+        score_prospect_rows(reader, output_format),
+        media_type=_STREAM_MEDIA_TYPES[output_format],
+    )
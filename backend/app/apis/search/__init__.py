@@ -0,0 +1,30 @@
+from fastapi import APIRouter, Query
+
+from app.auth import AuthorizedUser
+from app.libs.lead_search import MAX_SEARCH_LIMIT, LeadSearchResult, get_lead_search_index, search_leads
+from app.libs.lead_store import get_lead_store
+
+router = APIRouter(prefix="/search", tags=["leads"])
+
+
+@router.get("/leads", response_model=LeadSearchResult)
+def search_stored_leads(
+    user: AuthorizedUser,
+    q: str = Query(min_length=1, max_length=200, description="Words to find in company names and notes"),
+    limit: int = Query(default=20, ge=1, le=MAX_SEARCH_LIMIT),
+    offset: int = Query(default=0, ge=0, le=1000),
+) -> LeadSearchResult:
+    """Rank leads by how well their company and notes match `q`.
+
+    Every word must match, and matches word prefixes, so `acm rob` finds
+    "Acme Robotics". `company` and the `notes` snippet are HTML-escaped,
+    with matched words wrapped in `<mark>` tags.
+    """
+
+    # Keeps the index following new leads in this process too
+    get_lead_search_index().start()
+    conn = get_lead_store().open_reader()
+    try:
+        return search_leads(conn, q, limit=limit, offset=offset)
+    finally:
+        conn.close()
@@ -1,3 +1,4 @@
+from .ops import require_stats_token
 from .user import AuthorizedUser, User
 
-__all__ = ["AuthorizedUser", "User"]
+__all__ = ["AuthorizedUser", "User", "require_stats_token"]
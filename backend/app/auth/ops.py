@@ -0,0 +1,37 @@
+"""Fastapi dependency guarding operational endpoints with a shared bearer token.
+
+main_prod has no user auth, so endpoints reporting process counters check
+`Authorization: Bearer <token>` against the OPS_STATS_TOKEN env var instead.
+Without the env var every call is refused.
+
+Usage:
+
+    from app.auth import require_stats_token
+
+    @router.get("/example-stats", dependencies=[Depends(require_stats_token)])
+    def get_example_stats():
+        return example_stats()
+"""
+
+import hmac
+import os
+from http import HTTPStatus
+
+from fastapi import HTTPException, Request
+
+STATS_TOKEN_ENV = "OPS_STATS_TOKEN"
+
+
+def require_stats_token(request: Request) -> None:
+    expected = os.environ.get(STATS_TOKEN_ENV, "")
+    scheme, _, token = request.headers.get("Authorization", "").partition(" ")
+    if not (
+        expected
+        and scheme.lower() == "bearer"
+        and hmac.compare_digest(token.strip().encode(), expected.encode())
+    ):
+        raise HTTPException(
+            status_code=HTTPStatus.UNAUTHORIZED,
+            detail="Not authenticated",
+            headers={"WWW-Authenticate": "Bearer"},
+        )
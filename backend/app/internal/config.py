@@ -51,9 +51,18 @@ class Config(BaseModel):
     DEVX_API_PORT: int | None = None
     DEVX_URL_INTERNAL: str | None = None
 
+    # Talk HTTP/2 to the devx server (needs the h2 package)
+    DEVX_HTTP2: bool = False
+
     # Toggle publishing messages to devx server
     ENABLE_WORKSPACE_PUBLISH: bool | None = None
 
+    # Request events waiting to be published, oldest are dropped beyond this
+    PUBLISH_QUEUE_SIZE: int = 1000
+
+    # Seconds to collect request events before posting them to devx
+    PUBLISH_FLUSH_INTERVAL: float = 0.05
+
     # Root path of the app
     DEVX_BACKEND_DIR: str = ""
 
@@ -186,7 +195,10 @@ def log_config(
         f"devx_backend_dir          = {cfg.DEVX_BACKEND_DIR}",
         f"devx_api_port             = {cfg.DEVX_API_PORT}",
         f"devx_url_internal         = {cfg.DEVX_URL_INTERNAL}",
+        f"devx_http2                = {cfg.DEVX_HTTP2}",
         f"enable_workspace_publish  = {cfg.ENABLE_WORKSPACE_PUBLISH}",
+        f"publish_queue_size        = {cfg.PUBLISH_QUEUE_SIZE}",
+        f"publish_flush_interval    = {cfg.PUBLISH_FLUSH_INTERVAL}",
         f"devx_host                 = {cfg.DEVX_HOST}",
         f"devx_base_path            = {cfg.DEVX_BASE_PATH}",
         f"databutton_extensions     = {cfg.DATABUTTON_EXTENSIONS}",
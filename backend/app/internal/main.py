@@ -109,6 +109,10 @@ async def lifespan(app: FastAPI):
 
     enable_publishing = bool(cfg.ENABLE_WORKSPACE_PUBLISH and not skip_init)
 
+    # Request events are queued by the middleware and posted from here on
+    if cfg.ENABLE_WORKSPACE_PUBLISH:
+        app_state.publisher.start()
+
     # Generate and post openapi spec to devx
     spec: Dict[str, Any] | None = None
     signature: str | None = None
@@ -153,7 +157,9 @@ async def lifespan(app: FastAPI):
     # Yield for the active lifespan of the app
     yield
 
-    # App is shutting down
+    # App is shutting down, send the last request events first
+    await app_state.publisher.stop()
+
     if enable_publishing:
         await devx.notify_devx_async(
             Topics.backend_shutdown,
@@ -163,6 +169,9 @@ async def lifespan(app: FastAPI):
             ),
         )
 
+    # Close the pooled connections to devx
+    await devx.aclose()
+
 
 def add_middleware(app: FastAPI):
     """Adds middleware to the app."""
@@ -175,7 +184,6 @@ def add_middleware(app: FastAPI):
 
     app_state = get_app_state(app)
     cfg = app_state.cfg
-    devx = app_state.devx
 
     # Publish request checkpoint messages to workspace if enabled
     if cfg.ENABLE_WORKSPACE_PUBLISH:
@@ -186,7 +194,7 @@ def add_middleware(app: FastAPI):
         app.add_middleware(
             WorkspacePublishMiddleware,
             exception_to_model=e2m,
-            publish=devx.notify_devx_async,
+            publish=app_state.publisher.publish,
         )
 
     # Kill cookies (can perhaps open up when all apps are on subdomains, although if we
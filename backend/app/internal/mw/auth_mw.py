@@ -31,8 +31,15 @@ class User(BaseModel):
 
 
 def get_auth_configs(request: HTTPConnection) -> list[AuthConfig]:
+    # Apps without databutton state, such as main_prod, have no auth configs
+    # and so reject every request
     auth_configs: list[AuthConfig] = (
-        getattr(request.app.state.databutton_app_state, "auth_configs", None) or []
+        getattr(
+            getattr(request.app.state, "databutton_app_state", None),
+            "auth_configs",
+            None,
+        )
+        or []
     )
     return auth_configs
 
@@ -41,7 +48,9 @@ AuthConfigsDep = Annotated[list[AuthConfig], Depends(get_auth_configs)]
 
 
 def get_audit_log(request: HTTPConnection) -> Callable[[str], None] | None:
-    return getattr(request.app.state.databutton_app_state, "audit_log", None)
+    return getattr(
+        getattr(request.app.state, "databutton_app_state", None), "audit_log", None
+    )
 
 
 AuditLogDep = Annotated[Callable[[str], None] | None, Depends(get_audit_log)]
@@ -1,31 +1,29 @@
-from starlette.middleware.base import BaseHTTPMiddleware, RequestResponseEndpoint
-from starlette.requests import Request
-from starlette.responses import Response
-from starlette.types import ASGIApp
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
 
 from .utils import remove_header
 
 
-class CookieKillerMiddleware(BaseHTTPMiddleware):
+class CookieKillerMiddleware:
     def __init__(
         self,
         app: ASGIApp,
     ) -> None:
-        super().__init__(app)
+        self.app = app
 
-    async def dispatch(
-        self,
-        request: Request,
-        call_next: RequestResponseEndpoint,
-    ) -> Response:
-        # Redact incoming cookies if any
-        remove_header(request, "Cookie")
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
 
-        # Call request handler
-        response = await call_next(request)
+        # Redact incoming cookies if any
+        remove_header(scope, "Cookie")
 
-        # Redact attempt at setting cookie if any
-        if "Set-Cookie" in response.headers:
-            del response.headers["Set-Cookie"]
+        async def send_without_cookies(message: Message) -> None:
+            # Redact attempt at setting cookie if any
+            if message["type"] == "http.response.start":
+                headers = message.get("headers") or []
+                if any(name.lower() == b"set-cookie" for name, _ in headers):
+                    message["headers"] = [(name, value) for name, value in headers if name.lower() != b"set-cookie"]
+            await send(message)
 
-        return response
+        await self.app(scope, receive, send_without_cookies)
@@ -0,0 +1,274 @@
+from __future__ import annotations
+
+import json
+import math
+import os
+import sqlite3
+import threading
+import time
+from dataclasses import dataclass
+from typing import Dict, List, Mapping, Optional, Protocol, Sequence, Tuple
+
+import anyio.to_thread
+from starlette.types import ASGIApp, Receive, Scope, Send
+
+
+@dataclass(frozen=True, slots=True)
+class RateLimit:
+    """Token bucket: `rate` requests per second on average, bursts of up to `burst`."""
+
+    rate: float
+    burst: int
+
+    @property
+    def idle_after(self) -> float:
+        """Seconds without requests after which a bucket is full again."""
+
+        return self.burst / self.rate
+
+
+# Per client IP, across every route
+DEFAULT_CLIENT_LIMIT = RateLimit(rate=10.0, burst=40)
+# Per client IP on top of the client limit, for the expensive public routes
+DEFAULT_ROUTE_LIMITS: Dict[str, RateLimit] = {
+    "/roi/calculate": RateLimit(rate=5.0, burst=20),
+    "/leads/submit": RateLimit(rate=0.2, burst=5),
+}
+DEFAULT_MAX_KEYS = 100_000
+
+_TOO_MANY = json.dumps({"detail": "Too many requests"}).encode()
+
+
+Bucket = Tuple[str, RateLimit]
+
+
+class BucketStore(Protocol):
+    # Set when `take` does I/O, so the middleware runs it in a worker thread
+    blocking: bool
+
+    def take(self, buckets: Sequence[Bucket], now: float) -> float:
+        """Take one token from each bucket if every one has a token; nothing is taken otherwise.
+
+        Returns 0 if allowed, else seconds until every bucket has a token.
+        """
+        ...
+
+
+def _refilled(tokens: float, updated_at: float, limit: RateLimit, now: float) -> float:
+    tokens += (now - updated_at) * limit.rate
+    return limit.burst if tokens > limit.burst else tokens
+
+
+class MemoryBucketStore:
+    """Token buckets in a dict bounded to `max_keys` entries.
+
+    When the dict is full, buckets idle long enough to have refilled are
+    dropped. Dropping one loses nothing, because a missing bucket starts full.
+    If that is not enough (many distinct clients at once), the oldest
+    buckets go too. Those clients then start over with a full bucket.
+    """
+
+    blocking = False
+
+    def __init__(self, max_keys: int = DEFAULT_MAX_KEYS) -> None:
+        self.max_keys = max_keys
+        self.evicted = 0
+        # key -> [tokens, updated_at, idle_after]
+        self._buckets: Dict[str, list] = {}
+
+    def __len__(self) -> int:
+        return len(self._buckets)
+
+    def take(self, buckets: Sequence[Bucket], now: float) -> float:
+        found = self._buckets
+        wait = 0.0
+        refilled: List[Tuple[str, RateLimit, Optional[list], float]] = []
+        for key, limit in buckets:
+            bucket = found.get(key)
+            # A missing bucket is full
+            tokens = limit.burst if bucket is None else _refilled(bucket[0], bucket[1], limit, now)
+            if tokens < 1.0:
+                wait = max(wait, (1.0 - tokens) / limit.rate)
+            refilled.append((key, limit, bucket, tokens))
+        # Denied: leave every bucket as it was, refilling is a function of time
+        if wait:
+            return wait
+        for key, limit, bucket, tokens in refilled:
+            if bucket is None:
+                if len(found) >= self.max_keys:
+                    self._evict(now)
+                found[key] = [tokens - 1.0, now, limit.idle_after]
+            else:
+                bucket[0] = tokens - 1.0
+                bucket[1] = now
+        return 0.0
+
+    def _evict(self, now: float) -> None:
+        buckets = self._buckets
+        before = len(buckets)
+        for key in [key for key, (_, updated_at, idle_after) in buckets.items() if now - updated_at >= idle_after]:
+            del buckets[key]
+        # Still full: drop the oldest tenth, dicts iterate in insertion order
+        if len(buckets) >= self.max_keys:
+            for key in list(buckets)[: max(self.max_keys // 10, 1)]:
+                del buckets[key]
+        self.evicted += before - len(buckets)
+
+
+SQLITE_SCHEMA = """
+CREATE TABLE IF NOT EXISTS rate_buckets (
+    key TEXT PRIMARY KEY,
+    tokens REAL NOT NULL,
+    updated_at REAL NOT NULL,
+    idle_until REAL NOT NULL
+) WITHOUT ROWID;
+CREATE INDEX IF NOT EXISTS rate_buckets_idle ON rate_buckets (idle_until);
+"""
+
+SAVE_BUCKET = """
+INSERT INTO rate_buckets (key, tokens, updated_at, idle_until) VALUES (?, ?, ?, ?)
+ON CONFLICT (key) DO UPDATE SET tokens = excluded.tokens, updated_at = excluded.updated_at, idle_until = excluded.idle_until
+"""
+
+
+class SqliteBucketStore:
+    """Token buckets in a local SQLite file, shared by every worker on the host.
+
+    Each check is one short write transaction. BEGIN IMMEDIATE makes checks
+    from concurrent workers take turns, so two of them cannot both spend the
+    last token. Nothing is fsynced: after a crash, buckets simply start full.
+    Idle buckets are purged every `purge_every` checks. Checks block on disk
+    and on other workers' locks, so the middleware runs them in a thread.
+    """
+
+    blocking = True
+
+    def __init__(self, path: str, *, max_keys: int = DEFAULT_MAX_KEYS, purge_every: int = 1000) -> None:
+        self.path = path
+        self.max_keys = max_keys
+        self.purge_every = purge_every
+        self._conn: Optional[sqlite3.Connection] = None
+        self._lock = threading.Lock()
+        self._checks = 0
+
+    def _db(self) -> sqlite3.Connection:
+        if self._conn is None:
+            os.makedirs(os.path.dirname(self.path) or ".", exist_ok=True)
+            conn = sqlite3.connect(self.path, check_same_thread=False, isolation_level=None, timeout=1.0)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=OFF")
+            conn.executescript(SQLITE_SCHEMA)
+            self._conn = conn
+        return self._conn
+
+    def take(self, buckets: Sequence[Bucket], now: float) -> float:
+        with self._lock:
+            conn = self._db()
+            conn.execute("BEGIN IMMEDIATE")
+            try:
+                wait = 0.0
+                refilled = []
+                for key, limit in buckets:
+                    row = conn.execute("SELECT tokens, updated_at FROM rate_buckets WHERE key = ?", (key,)).fetchone()
+                    tokens = limit.burst if row is None else _refilled(row[0], row[1], limit, now)
+                    if tokens < 1.0:
+                        wait = max(wait, (1.0 - tokens) / limit.rate)
+                    refilled.append((key, tokens - 1.0, now, now + limit.idle_after))
+                if not wait:
+                    conn.executemany(SAVE_BUCKET, refilled)
+                self._checks += 1
+                if self._checks % self.purge_every == 0:
+                    self._purge(conn, now)
+            except BaseException:
+                conn.execute("ROLLBACK")
+                raise
+            conn.execute("COMMIT")
+            return wait
+
+    def _purge(self, conn: sqlite3.Connection, now: float) -> None:
+        conn.execute("DELETE FROM rate_buckets WHERE idle_until < ?", (now,))
+        excess = conn.execute("SELECT COUNT(*) FROM rate_buckets").fetchone()[0] - self.max_keys
+        if excess > 0:
+            conn.execute(
+                "DELETE FROM rate_buckets WHERE key IN (SELECT key FROM rate_buckets ORDER BY updated_at LIMIT ?)",
+                (excess,),
+            )
+
+
+class RateLimitMiddleware:
+    """Pure ASGI per-client rate limiting with token buckets.
+
+    Every request spends a token from its client's bucket, and requests to a
+    path in `route_limits` also spend one from that client's bucket for the
+    route. Both are checked before either is spent, so a request the route
+    limit turns away costs the client nothing. An empty bucket gets a 429
+    with `Retry-After` before the app runs.
+    Clients are keyed by IP, taken from the first `X-Forwarded-For` entry
+    when `trust_forwarded` is set (only behind a proxy that overwrites it).
+    """
+
+    def __init__(
+        self,
+        app: ASGIApp,
+        *,
+        client_limit: RateLimit = DEFAULT_CLIENT_LIMIT,
+        route_limits: Mapping[str, RateLimit] = DEFAULT_ROUTE_LIMITS,
+        store: Optional[BucketStore] = None,
+        trust_forwarded: bool = False,
+    ) -> None:
+        self.app = app
+        self.client_limit = client_limit
+        self.route_limits = dict(route_limits)
+        self.store = store or MemoryBucketStore()
+        self.trust_forwarded = trust_forwarded
+        self.limited = 0
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        if self.trust_forwarded:
+            client = self._forwarded_client(scope)
+        else:
+            client = scope["client"][0] if scope.get("client") else "unknown"
+        buckets = [(client, self.client_limit)]
+        path = scope["path"]
+        route_limit = self.route_limits.get(path)
+        if route_limit is None:
+            root_path = scope.get("root_path")
+            if root_path and path.startswith(root_path):
+                path = path[len(root_path) :]
+                route_limit = self.route_limits.get(path)
+        if route_limit is not None:
+            buckets.append((f"{client} {path}", route_limit))
+        store = self.store
+        if store.blocking:
+            wait = await anyio.to_thread.run_sync(store.take, buckets, time.time())
+        else:
+            wait = store.take(buckets, time.time())
+        if not wait:
+            await self.app(scope, receive, send)
+            return
+
+        self.limited += 1
+        await send(
+            {
+                "type": "http.response.start",
+                "status": 429,
+                "headers": [
+                    (b"content-type", b"application/json"),
+                    (b"content-length", str(len(_TOO_MANY)).encode()),
+                    (b"retry-after", str(math.ceil(wait)).encode()),
+                ],
+            }
+        )
+        await send({"type": "http.response.body", "body": _TOO_MANY})
+
+    @staticmethod
+    def _forwarded_client(scope: Scope) -> str:
+        for name, value in scope["headers"]:
+            if name == b"x-forwarded-for":
+                return value.split(b",", 1)[0].strip().decode("latin-1")
+        client = scope.get("client")
+        return client[0] if client else "unknown"
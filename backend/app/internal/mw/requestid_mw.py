@@ -1,32 +1,35 @@
 import random
 
-from starlette.middleware.base import BaseHTTPMiddleware, RequestResponseEndpoint
 from starlette.requests import Request
-from starlette.responses import Response
-from starlette.types import ASGIApp
+from starlette.types import ASGIApp, Receive, Scope, Send
 
 
 def get_current_request_id(request: Request) -> str:
     return request.state.request_id
 
 
+def get_scope_request_id(scope: Scope) -> str:
+    """Request id for middleware that works on the raw ASGI scope."""
+    return scope["state"]["request_id"]
+
+
 # Note: There's possibly some standard middleware for this, maybe it does something smart
-class RequestIdMiddleware(BaseHTTPMiddleware):
+class RequestIdMiddleware:
     def __init__(
         self,
         app: ASGIApp,
     ) -> None:
-        super().__init__(app)
+        self.app = app
 
-    async def dispatch(
-        self,
-        request: Request,
-        call_next: RequestResponseEndpoint,
-    ) -> Response:
-        # If missing, make up a request id (in practice this
-        # only happens during testing with a funky environment)
-        request_id = (
-            request.headers.get("x-request-id") or "req-" + random.randbytes(8).hex()
-        )
-        request.state.request_id = request_id
-        return await call_next(request)
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] == "http":
+            request_id = None
+            for name, value in scope["headers"]:
+                if name == b"x-request-id":
+                    request_id = value.decode("latin-1")
+                    break
+            # If missing, make up a request id (in practice this
+            # only happens during testing with a funky environment)
+            # Stored where request.state reads from
+            scope.setdefault("state", {})["request_id"] = request_id or "req-" + random.randbytes(8).hex()
+        await self.app(scope, receive, send)
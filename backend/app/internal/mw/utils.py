@@ -1,20 +1,40 @@
-from starlette.requests import Request
+from starlette.types import Scope
 
 
-def set_header(request: Request, header: str, value: str) -> None:
-    """Adds the given Header to the available Request headers.
+def set_header(scope: Scope, header: str, value: str) -> None:
+    """Sets the given Header on the request in `scope`, in place.
 
     If the Header already exists, its value is overwritten.
     """
-    hkey = header.encode("latin-1")
+    hkey = header.lower().encode("latin-1")
     hval = value.encode("latin-1")
-    request.scope["headers"] = [
-        *(h for h in request.scope["headers"] if h[0] != hkey),
-        (hkey, hval),
-    ]
+    headers = _mutable_headers(scope)
+    found = False
+    for i in range(len(headers) - 1, -1, -1):
+        if headers[i][0] == hkey:
+            if found:
+                del headers[i]
+            else:
+                headers[i] = (hkey, hval)
+                found = True
+    if not found:
+        headers.append((hkey, hval))
 
 
-def remove_header(request: Request, header: str) -> None:
-    """Removes the given Header from the available Request headers."""
-    hkey = header.encode("latin-1")
-    request.scope["headers"] = [h for h in request.scope["headers"] if h[0] != hkey]
+def remove_header(scope: Scope, header: str) -> None:
+    """Removes the given Header from the request in `scope`, in place."""
+    hkey = header.lower().encode("latin-1")
+    if not any(name == hkey for name, _ in scope["headers"]):
+        return
+    headers = _mutable_headers(scope)
+    for i in range(len(headers) - 1, -1, -1):
+        if headers[i][0] == hkey:
+            del headers[i]
+
+
+def _mutable_headers(scope: Scope) -> list:
+    # Servers pass a list; anything else is copied once so it can be edited
+    headers = scope["headers"]
+    if not isinstance(headers, list):
+        headers = scope["headers"] = list(headers)
+    return headers
@@ -1,68 +1,65 @@
 import time
-from typing import Any, Callable, Coroutine
+from typing import Callable
 
 from fastapi import HTTPException
 from pydantic import BaseModel
-from starlette.middleware.base import BaseHTTPMiddleware, RequestResponseEndpoint
-from starlette.requests import Request
-from starlette.responses import Response
-from starlette.types import ASGIApp
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
 
 from ..exceptionmodel import ExceptionModel
 from ..messages import RequestFinished, RequestStarted, Topics
 from ..utils import utc_now
-from .requestid_mw import get_current_request_id
+from .requestid_mw import get_scope_request_id
 
 
-class WorkspacePublishMiddleware(BaseHTTPMiddleware):
+class WorkspacePublishMiddleware:
     def __init__(
         self,
         app: ASGIApp,
         # Exception converter
         exception_to_model: Callable[[BaseException], ExceptionModel],
-        # Callback for publishing events
-        publish: Callable[[Topics, BaseModel], Coroutine[Any, Any, None]],
+        # Callback for publishing events, must not block (e.g. EventPublisher.publish)
+        publish: Callable[[Topics, BaseModel], None],
     ) -> None:
-        super().__init__(app)
+        self.app = app
         self.exception_to_model = exception_to_model
         self.publish = publish
 
-    async def publish_request_started(
+    def publish_request_started(
         self,
-        request: Request,
+        scope: Scope,
         *,
         request_id: str,
     ):
-        await self.publish(
+        self.publish(
             Topics.request_started,
             RequestStarted(
                 requestId=request_id,
-                method=request.method,
-                url=str(request.url.path),
+                method=scope["method"],
+                url=scope["path"],
                 timestamp=utc_now(),
             ),
         )
 
-    async def publish_request_finished(
+    def publish_request_finished(
         self,
-        request: Request,
+        scope: Scope,
         *,
-        response: Response | None,
+        status_code: int | None,
         exception: Exception | None,
         duration: float,
         request_id: str,
     ):
-        await self.publish(
+        self.publish(
             Topics.request_finished,
             RequestFinished(
                 requestId=request_id,
-                method=request.method,
-                url=str(request.url.path),
+                method=scope["method"],
+                url=scope["path"],
                 timestamp=utc_now(),
                 duration=duration,
                 statusCode=(
-                    response.status_code
-                    if response is not None
+                    status_code
+                    if status_code is not None
                     else exception.status_code
                     if isinstance(exception, HTTPException)
                     else 500
@@ -73,33 +70,43 @@ class WorkspacePublishMiddleware(BaseHTTPMiddleware):
             ),
         )
 
-    async def dispatch(
-        self,
-        request: Request,
-        call_next: RequestResponseEndpoint,
-    ) -> Response:
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
         # Assuming RequestIdMiddleware is already in place
-        request_id = get_current_request_id(request)
+        request_id = get_scope_request_id(scope)
 
-        await self.publish_request_started(request, request_id=request_id)
+        self.publish_request_started(scope, request_id=request_id)
         start_time = time.monotonic()
-        try:
-            response: Response = await call_next(request)
+        status_code: int | None = None
 
-            await self.publish_request_finished(
-                request,
-                response=response,
-                exception=None,
-                duration=time.monotonic() - start_time,
-                request_id=request_id,
-            )
-            return response
+        async def send_recording_status(message: Message) -> None:
+            nonlocal status_code
+            if message["type"] == "http.response.start":
+                status_code = message["status"]
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_recording_status)
         except Exception as exc:
-            await self.publish_request_finished(
-                request,
-                response=None,
+            # A response that already started keeps its status
+            self.publish_request_finished(
+                scope,
+                status_code=status_code,
                 exception=exc,
                 duration=time.monotonic() - start_time,
                 request_id=request_id,
             )
             raise exc
+
+        # Published once the response body has been sent, so streamed
+        # responses are timed to the end
+        self.publish_request_finished(
+            scope,
+            status_code=status_code,
+            exception=None,
+            duration=time.monotonic() - start_time,
+            request_id=request_id,
+        )
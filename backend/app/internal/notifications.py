@@ -1,6 +1,8 @@
+import asyncio
 import inspect
+import threading
 import time
-from typing import Awaitable, Callable, Literal
+from typing import Awaitable, Callable, Literal, Sequence
 
 import anyio
 import httpx
@@ -44,40 +46,139 @@ def is_recursive_call() -> bool:
     return any(stack[i].function == current_func_name for i in range(2, len(stack)))
 
 
-def get_devx_client(url: str) -> httpx.Client:
+# Pool for the connections to devx, which are reused across notifications
+DEFAULT_DEVX_LIMITS = httpx.Limits(
+    max_connections=10,
+    max_keepalive_connections=10,
+    keepalive_expiry=60.0,
+)
+
+
+def _h2_available() -> bool:
+    try:
+        import h2  # noqa: F401
+    except ImportError:
+        return False
+    return True
+
+
+def get_devx_client(
+    url: str,
+    *,
+    http2: bool = False,
+    limits: httpx.Limits = DEFAULT_DEVX_LIMITS,
+    transport: httpx.BaseTransport | None = None,
+) -> httpx.Client:
     "Mockable client creation."
-    return httpx.Client(base_url=url)
+    return httpx.Client(base_url=url, http2=http2, limits=limits, transport=transport)
 
 
-def get_devx_async_client(url: str) -> httpx.AsyncClient:
+def get_devx_async_client(
+    url: str,
+    *,
+    http2: bool = False,
+    limits: httpx.Limits = DEFAULT_DEVX_LIMITS,
+    transport: httpx.AsyncBaseTransport | None = None,
+) -> httpx.AsyncClient:
     "Mockable client creation."
-    return httpx.AsyncClient(base_url=url)
+    return httpx.AsyncClient(
+        base_url=url, http2=http2, limits=limits, transport=transport
+    )
 
 
 class DevxClient:
-    def __init__(self, cfg: Config):
+    """Notifications to the internal devx server.
+
+    Posts go through one long-lived sync and one long-lived async httpx client,
+    created on first use, so connections are kept alive and reused instead of
+    set up again for every notification, log line and ping. HTTP/2 is used
+    when `http2` (or the DEVX_HTTP2 config) is set and the `h2` package is
+    installed; over plain http this needs a devx server that accepts HTTP/2
+    with prior knowledge. Tests can pass `transport` and `async_transport`,
+    e.g. httpx.MockTransport, to intercept the posts.
+
+    The app lifespan calls `aclose` on shutdown.
+    """
+
+    def __init__(
+        self,
+        cfg: Config,
+        *,
+        http2: bool | None = None,
+        limits: httpx.Limits = DEFAULT_DEVX_LIMITS,
+        transport: httpx.BaseTransport | None = None,
+        async_transport: httpx.AsyncBaseTransport | None = None,
+    ):
         self.cfg = cfg
+        if http2 is None:
+            http2 = str(cfg.DEVX_HTTP2).lower() in ("1", "true")
+        self.http2 = http2 and _h2_available()
+        self.limits = limits
+        self.transport = transport
+        self.async_transport = async_transport
+        self._client: httpx.Client | None = None
+        self._client_lock = threading.Lock()
+        self._async_client: httpx.AsyncClient | None = None
+        self._async_client_loop: asyncio.AbstractEventLoop | None = None
 
     def _get_devx_client(self) -> httpx.Client | None:
-        if self.cfg.DEVX_URL_INTERNAL:
-            return get_devx_client(self.cfg.DEVX_URL_INTERNAL)
-        return None
+        if not self.cfg.DEVX_URL_INTERNAL:
+            return None
+        # Called from any thread by log forwarding, httpx.Client itself is thread safe
+        with self._client_lock:
+            if self._client is None or self._client.is_closed:
+                self._client = get_devx_client(
+                    self.cfg.DEVX_URL_INTERNAL,
+                    http2=self.http2,
+                    limits=self.limits,
+                    transport=self.transport,
+                )
+            return self._client
 
     def _get_devx_async_client(self) -> httpx.AsyncClient | None:
-        if self.cfg.DEVX_URL_INTERNAL:
-            return get_devx_async_client(self.cfg.DEVX_URL_INTERNAL)
-        return None
+        if not self.cfg.DEVX_URL_INTERNAL:
+            return None
+        # Pooled connections belong to the event loop that opened them, so a
+        # different loop (e.g. a TestClient started after an earlier one
+        # stopped without closing us) gets a client of its own
+        loop = asyncio.get_running_loop()
+        client = self._async_client
+        if client is None or client.is_closed or self._async_client_loop is not loop:
+            client = get_devx_async_client(
+                self.cfg.DEVX_URL_INTERNAL,
+                http2=self.http2,
+                limits=self.limits,
+                transport=self.async_transport,
+            )
+            self._async_client = client
+            self._async_client_loop = loop
+        return client
+
+    def close(self) -> None:
+        """Close the sync client; it is created again if used afterwards."""
+        with self._client_lock:
+            client, self._client = self._client, None
+        if client is not None:
+            client.close()
+
+    async def aclose(self) -> None:
+        """Close both clients, for the app lifespan to call on shutdown."""
+        client, self._async_client = self._async_client, None
+        loop, self._async_client_loop = self._async_client_loop, None
+        # A client opened on another, finished loop can't be closed from here
+        if client is not None and loop is asyncio.get_running_loop():
+            await client.aclose()
+        self.close()
 
     def ping(self) -> bool:
         """Ping devx server once."""
         client = self._get_devx_client()
         if client is None:
             return True
-        with client:
-            try:
-                return client.get("/ready").status_code == 200
-            except Exception:
-                pass
+        try:
+            return client.get("/ready").status_code == 200
+        except Exception:
+            pass
         return False
 
     def wait_for_devx_ready(
@@ -105,12 +206,11 @@ class DevxClient:
             # in an attempt to make test setup more useful...
             # This should never happen outside of tests.
             return anyio.run(self._post_devx_async, *(path, params))
-        with client:
-            return client.post(
-                f"/workspace{path}",
-                headers={"Content-Type": "application/json"},
-                content=params_as_json(params),
-            )
+        return client.post(
+            f"/workspace{path}",
+            headers={"Content-Type": "application/json"},
+            content=params_as_json(params),
+        )
 
     async def _post_devx_async(self, path: str, params: BaseModel | None = None):
         """Make post request endpoint in internal devx server."""
@@ -118,12 +218,16 @@ class DevxClient:
         if client is None:
             _print_instead_of_post(path, params)
             return
-        async with client:
-            return await client.post(
-                f"/workspace{path}",
-                headers={"Content-Type": "application/json"},
-                content=params_as_json(params),
-            )
+        return await self._post_with_async_client(client, path, params)
+
+    async def _post_with_async_client(
+        self, client: httpx.AsyncClient, path: str, params: BaseModel | None = None
+    ):
+        return await client.post(
+            f"/workspace{path}",
+            headers={"Content-Type": "application/json"},
+            content=params_as_json(params),
+        )
 
     async def notify_devx_refresh_openapi_spec(self, params: RefreshOpenapiSpecParams):
         await self._post_devx_async(
@@ -137,6 +241,20 @@ class DevxClient:
         """
         await self._post_devx_async(f"/internal/publish/{topic.value}", params)
 
+    async def notify_devx_batch_async(
+        self, events: Sequence[tuple[Topics, BaseModel]]
+    ) -> None:
+        """Post several messages to the publish endpoint in order."""
+        client = self._get_devx_async_client()
+        if client is None:
+            for topic, params in events:
+                _print_instead_of_post(f"/internal/publish/{topic.value}", params)
+            return
+        for topic, params in events:
+            await self._post_with_async_client(
+                client, f"/internal/publish/{topic.value}", params
+            )
+
     def notify_devx_sync(self, topic: Topics, params: BaseModel) -> None:
         """Post message to publish endpoint in internal devx server.
 
@@ -0,0 +1,102 @@
+import asyncio
+from collections import deque
+from typing import Awaitable, Callable, Sequence
+
+from pydantic import BaseModel
+
+from .messages import Topics
+
+PublishedEvent = tuple[Topics, BaseModel]
+
+PublishBatchType = Callable[[Sequence[PublishedEvent]], Awaitable[None]]
+
+
+class EventPublisher:
+    """Publishes events to devx from a background task.
+
+    `publish` only appends to a bounded queue, so the request path never waits
+    on devx. Once an event arrives the task waits `flush_interval` seconds for
+    more, then hands everything queued to `publish_batch` in batches of up to
+    `max_batch` events, in order. When devx falls behind and the queue is full,
+    the oldest events are dropped: they are progress notifications, and the
+    newest ones matter most to whoever is watching.
+    """
+
+    def __init__(
+        self,
+        publish_batch: PublishBatchType,
+        *,
+        max_queued: int = 1000,
+        flush_interval: float = 0.05,
+        max_batch: int = 100,
+    ) -> None:
+        self.publish_batch = publish_batch
+        self.max_queued = max_queued
+        self.flush_interval = flush_interval
+        self.max_batch = max_batch
+        self.published = 0
+        self.dropped = 0
+        self.failed = 0
+        self._events: deque[PublishedEvent] = deque(maxlen=max_queued)
+        self._wake: asyncio.Event | None = None
+        self._task: asyncio.Task | None = None
+        self._closing = False
+
+    def __len__(self) -> int:
+        return len(self._events)
+
+    def publish(self, topic: Topics, params: BaseModel) -> None:
+        """Queue an event; never blocks. Events queued before `start` wait for it."""
+        if len(self._events) == self.max_queued:
+            self.dropped += 1
+        self._events.append((topic, params))
+        if self._wake is not None:
+            self._wake.set()
+
+    def start(self) -> None:
+        """Start the flush task on the running event loop."""
+        if self._task is not None and not self._task.done():
+            return
+        self._closing = False
+        self._wake = asyncio.Event()
+        if self._events:
+            self._wake.set()
+        self._task = asyncio.create_task(self._run(), name="devx-event-publisher")
+
+    async def stop(self, timeout: float = 5.0) -> None:
+        """Publish whatever is queued, waiting at most `timeout` seconds, then stop."""
+        task, self._task = self._task, None
+        if task is None:
+            return
+        self._closing = True
+        if self._wake is not None:
+            self._wake.set()
+        try:
+            await asyncio.wait_for(task, timeout)
+        except asyncio.TimeoutError:
+            pass
+        self._wake = None
+
+    async def flush(self) -> None:
+        events = self._events
+        while events:
+            batch = [events.popleft() for _ in range(min(self.max_batch, len(events)))]
+            try:
+                await self.publish_batch(batch)
+            except Exception:
+                # Best effort: no retries, and no logging since logs are forwarded to devx too
+                self.failed += len(batch)
+            else:
+                self.published += len(batch)
+
+    async def _run(self) -> None:
+        wake = self._wake
+        assert wake is not None
+        while not self._closing:
+            await wake.wait()
+            if not self._closing:
+                # Let the rest of a burst arrive so it goes out together
+                await asyncio.sleep(self.flush_interval)
+            wake.clear()
+            await self.flush()
+        await self.flush()
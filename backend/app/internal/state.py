@@ -10,11 +10,13 @@ from .messages import (
     ImportResult,
 )
 from .notifications import DevxClient
+from .publisher import EventPublisher
 
 
 class AppState:
     cfg: Config
     devx: DevxClient
+    publisher: EventPublisher
     app_created_time: float
     started_event: Event
     submodule_import_results: list[ImportResult]
@@ -26,6 +28,11 @@ def init_app_state(cfg: Config) -> AppState:
     s = AppState()
     s.cfg = cfg
     s.devx = DevxClient(cfg)
+    s.publisher = EventPublisher(
+        s.devx.notify_devx_batch_async,
+        max_queued=int(cfg.PUBLISH_QUEUE_SIZE),
+        flush_interval=float(cfg.PUBLISH_FLUSH_INTERVAL),
+    )
     s.app_created_time = time.monotonic()
     s.started_event = Event()
     s.submodule_import_results = []
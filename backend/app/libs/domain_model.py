@@ -1,8 +1,8 @@
 from __future__ import annotations
 
-from typing import List, Optional
+from typing import List, Literal, Optional
 
-from pydantic import BaseModel, Field
+from pydantic import BaseModel, Field, model_validator
 
 
 class IndustryProfile(BaseModel):
@@ -61,3 +61,238 @@ class RoiCalculationResult(BaseModel):
     metrics: RoiMetrics
     chart: List[RoiChartBar]
     narrative: RoiNarrative
+
+
+# Rows per batch or solve request; keeps one public request well inside the
+# function's memory and time limits
+MAX_BATCH_ROWS = 50_000
+
+
+class RoiBatchRequest(BaseModel):
+    """Column-oriented calculator inputs for scoring many prospects at once."""
+
+    hours_per_week: List[float] = Field(..., max_length=MAX_BATCH_ROWS, description="Manual hours per week, one entry per prospect")
+    labor_rate: List[float] = Field(..., max_length=MAX_BATCH_ROWS, description="Hourly labor rate, one entry per prospect")
+    tool_cost: List[float] = Field(..., max_length=MAX_BATCH_ROWS, description="Monthly platform cost, one entry per prospect")
+    industry: List[str] = Field(..., max_length=MAX_BATCH_ROWS, description="Industry profile key, one entry per prospect")
+
+    @model_validator(mode="after")
+    def _check_column_lengths(self) -> "RoiBatchRequest":
+        lengths = {len(self.hours_per_week), len(self.labor_rate), len(self.tool_cost), len(self.industry)}
+        if len(lengths) != 1:
+            raise ValueError("All input columns must have the same length")
+        return self
+
+
+class RoiBatchResult(BaseModel):
+    """Column-oriented metrics, row i corresponds to row i of the request."""
+
+    profile: List[str]
+    annual_labor_cost: List[float]
+    annual_savings_low: List[float]
+    annual_savings_expected: List[float]
+    annual_savings_high: List[float]
+    monthly_savings: List[float]
+    annual_tool_cost: List[float]
+    net_annual_savings: List[float]
+    payback_months: List[Optional[float]]
+
+
+class RoiGridAxis(BaseModel):
+    """Evenly spaced range of one calculator input, endpoints included."""
+
+    start: float
+    stop: float
+    steps: int = Field(..., ge=1, le=500, description="Number of points along the axis")
+
+
+class RoiSensitivityRequest(BaseModel):
+    """Input ranges for a sensitivity heatmap over one industry profile."""
+
+    industry: str = Field(default="general", description="Industry profile key")
+    hours_per_week: RoiGridAxis
+    labor_rate: RoiGridAxis
+    tool_cost: float | RoiGridAxis = Field(
+        default=0, description="Fixed monthly tool cost, or a third axis to sweep"
+    )
+
+
+class RoiSensitivityAxis(BaseModel):
+    name: str
+    values: List[float]
+
+
+class RoiSensitivityGrid(BaseModel):
+    """Heatmap values as base64-encoded row-major little-endian float32 arrays.
+
+    The first axis varies slowest. Cells without a payback period hold NaN.
+    """
+
+    profile: IndustryProfile
+    axes: List[RoiSensitivityAxis]
+    shape: List[int]
+    dtype: str = "<f4"
+    net_annual_savings: str
+    payback_months: str
+
+
+class RoiMonteCarloRequest(BaseModel):
+    """Opt-in probabilistic ROI run around one set of calculator inputs."""
+
+    inputs: RoiInputs
+    draws: int = Field(default=100_000, ge=1_000, le=1_000_000, description="Number of simulated scenarios")
+    seed: Optional[int] = Field(default=None, ge=0, description="RNG seed, a random one is picked and echoed when omitted")
+    hours_spread: float = Field(default=0.1, ge=0, le=1, description="Relative standard deviation of hours_per_week")
+    labor_rate_spread: float = Field(default=0.05, ge=0, le=1, description="Relative standard deviation of labor_rate")
+
+
+class RoiPercentiles(BaseModel):
+    p5: float
+    p10: float
+    p25: float
+    p50: float
+    p75: float
+    p90: float
+    p95: float
+
+
+class RoiMonteCarloResult(BaseModel):
+    """Distribution summary of a Monte Carlo ROI run."""
+
+    profile: IndustryProfile
+    inputs: RoiInputs
+    draws: int
+    seed: int
+    net_annual_savings_mean: float
+    net_annual_savings: RoiPercentiles
+    payback_months: Optional[RoiPercentiles] = Field(
+        default=None, description="Percentiles over the draws that pay back at all"
+    )
+    probability_payback_within_12_months: float
+    probability_no_payback: float
+    payback_histogram_edges: List[float] = Field(..., description="Month bin edges, the last bin is open-ended")
+    payback_histogram_counts: List[int]
+
+
+SolveFor = Literal["tool_cost", "hours_per_week", "labor_rate"]
+SolveTarget = Literal["break_even", "payback_months", "net_annual_savings"]
+SavingsScenario = Literal["expected", "low", "high"]
+
+
+class RoiSolveRequest(BaseModel):
+    """Inverse ROI query over one or more prospects, given as columns.
+
+    The column named by `solve_for` is the unknown and may be omitted; the
+    other columns are required and must have equal lengths.
+    """
+
+    solve_for: SolveFor
+    target: SolveTarget
+    target_value: Optional[float] = Field(
+        default=None, description="Payback months or net annual savings, unused for break_even"
+    )
+    scenario: SavingsScenario = Field(default="expected", description="Savings rate assumption to solve against")
+    hours_per_week: Optional[List[float]] = Field(default=None, max_length=MAX_BATCH_ROWS)
+    labor_rate: Optional[List[float]] = Field(default=None, max_length=MAX_BATCH_ROWS)
+    tool_cost: Optional[List[float]] = Field(default=None, max_length=MAX_BATCH_ROWS)
+    industry: List[str] = Field(..., max_length=MAX_BATCH_ROWS)
+
+    @model_validator(mode="after")
+    def _check_query(self) -> "RoiSolveRequest":
+        if self.target != "break_even" and self.target_value is None:
+            raise ValueError(f"target_value is required for target {self.target}")
+        if self.target == "payback_months" and self.target_value is not None and self.target_value <= 0:
+            raise ValueError("target_value must be positive for payback_months")
+        for name in ("hours_per_week", "labor_rate", "tool_cost"):
+            column = getattr(self, name)
+            if name == self.solve_for:
+                continue
+            if column is None:
+                raise ValueError(f"{name} is required when solving for {self.solve_for}")
+            if len(column) != len(self.industry):
+                raise ValueError("All input columns must have the same length")
+        return self
+
+
+class RoiSolveResult(BaseModel):
+    """Solved values per prospect.
+
+    For tool_cost the value is the highest monthly cost that meets the target,
+    for hours and labor rate it is the lowest value that does. `feasible` is
+    false when no value inside the calculator bounds meets the target, and the
+    value is null when the target cannot be met at any level.
+    """
+
+    solve_for: SolveFor
+    target: SolveTarget
+    target_value: Optional[float]
+    scenario: SavingsScenario
+    values: List[Optional[float]]
+    feasible: List[bool]
+
+
+ProjectionResolution = Literal["month", "quarter", "year"]
+
+
+class RoiProjectionRequest(BaseModel):
+    """Multi-year cash-flow projection for one or more calculator scenarios."""
+
+    scenarios: List[RoiInputs] = Field(..., min_length=1, max_length=500)
+    years: int = Field(default=3, ge=1, le=5)
+    ramp_months: int = Field(default=3, ge=0, le=24, description="Months until automation savings reach full rate")
+    ramp_curve: Literal["linear", "s_curve"] = "linear"
+    tool_escalation: float = Field(default=0.03, ge=-0.5, le=1, description="Annual price escalation on tool_cost")
+    wage_inflation: float = Field(default=0.03, ge=-0.5, le=1, description="Annual wage inflation on labor_rate")
+    discount_rate: float = Field(default=0.08, ge=0, le=1, description="Annual discount rate used for NPV")
+    implementation_cost: float = Field(default=0, ge=0, le=1_000_000, description="One-off cost paid at month zero")
+    resolution: ProjectionResolution = Field(default="quarter", description="Period length of the returned series")
+
+
+class RoiProjectionSeries(BaseModel):
+    """Downsampled timeline and summary figures for one scenario."""
+
+    cash_flow: List[float] = Field(..., description="Net cash flow per period, month zero costs land in the first period")
+    cumulative: List[float] = Field(..., description="Cumulative net cash flow at the end of each period")
+    total_net_savings: float
+    npv: float
+    irr: Optional[float] = Field(default=None, description="Annualized IRR, null when the flows never change sign")
+    payback_month: Optional[int] = Field(default=None, description="First month with non-negative cumulative cash flow")
+
+
+class RoiProjectionResult(BaseModel):
+    months: int
+    resolution: ProjectionResolution
+    period_end_months: List[int]
+    scenarios: List[RoiProjectionSeries]
+
+
+class RoiScenarioOverride(BaseModel):
+    """Named variation of the base inputs, unset fields inherit from the base."""
+
+    name: str = Field(..., min_length=1, max_length=100)
+    hours_per_week: Optional[float] = None
+    labor_rate: Optional[float] = None
+    tool_cost: Optional[float] = None
+    industry: Optional[str] = None
+
+
+class RoiComparisonRequest(BaseModel):
+    base: RoiInputs
+    scenarios: List[RoiScenarioOverride] = Field(..., min_length=1, max_length=50)
+
+
+class RoiScenarioComparison(BaseModel):
+    name: str
+    inputs: RoiInputs
+    profile: str = Field(..., description="Industry profile key the scenario resolved to")
+    metrics: RoiMetrics
+    deltas: RoiMetrics = Field(..., description="Scenario metrics minus base metrics, payback is null unless both pay back")
+
+
+class RoiComparisonResult(BaseModel):
+    """Side-by-side scenarios sharing one profile and base inputs block."""
+
+    profile: IndustryProfile
+    inputs: RoiInputs
+    metrics: RoiMetrics
+    scenarios: List[RoiScenarioComparison]
@@ -0,0 +1,293 @@
+from __future__ import annotations
+
+import hashlib
+import os
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+from concurrent.futures import Future
+from concurrent.futures import TimeoutError as FutureTimeoutError
+from dataclasses import dataclass
+from typing import Callable, Optional, Tuple
+
+DEFAULT_IDEMPOTENCY_STORE_PATH = "/tmp/roileads/idempotency.sqlite3"
+MAX_KEY_LENGTH = 255
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS idempotency (
+    key TEXT PRIMARY KEY,
+    body_hash TEXT NOT NULL,
+    state TEXT NOT NULL,
+    status_code INTEGER,
+    body BLOB,
+    expires_at REAL NOT NULL
+) WITHOUT ROWID;
+CREATE INDEX IF NOT EXISTS idempotency_expiry ON idempotency (expires_at);
+"""
+
+
+class IdempotencyError(RuntimeError):
+    """Base class for Idempotency-Key misuse."""
+
+
+class IdempotencyConflictError(IdempotencyError):
+    """The key was already used with a different request body."""
+
+
+class IdempotencyInProgressError(IdempotencyError):
+    """Another request holds the key and did not finish within the lease."""
+
+
+@dataclass(slots=True)
+class IdempotentResponse:
+    status_code: int
+    body: bytes
+    replayed: bool = False
+
+
+@dataclass(slots=True)
+class IdempotencyStats:
+    executed: int = 0
+    replayed: int = 0
+    coalesced: int = 0
+    conflicts: int = 0
+    purged: int = 0
+
+
+def body_hash(body: bytes) -> str:
+    return hashlib.sha256(body).hexdigest()
+
+
+def _connect(path: str) -> sqlite3.Connection:
+    conn = sqlite3.connect(path, check_same_thread=False, isolation_level=None, timeout=5.0)
+    conn.execute("PRAGMA journal_mode=WAL")
+    # A lost cache entry only costs a re-execution, so skip the per-commit fsync
+    conn.execute("PRAGMA synchronous=NORMAL")
+    conn.executescript(SCHEMA)
+    return conn
+
+
+class IdempotencyStore:
+    """Response cache for `Idempotency-Key` requests, shared across workers.
+
+    Responses are kept for `ttl` seconds in a SQLite file that every uvicorn
+    worker on the host opens, fronted by a small in-process LRU. A key is
+    claimed with a `pending` row before the handler runs; duplicates in the
+    same process wait on the leader's future (single-flight), duplicates in
+    other workers poll the row until it is done or its `lease` runs out.
+    Reusing a key with a different body is an error, never a replay.
+    """
+
+    def __init__(
+        self,
+        path: str,
+        *,
+        ttl: float = 24 * 3600,
+        lease: float = 30.0,
+        max_entries: int = 100_000,
+        local_size: int = 1024,
+    ) -> None:
+        self.path = path
+        self.ttl = ttl
+        self.lease = lease
+        self.max_entries = max_entries
+        self.local_size = local_size
+        self.stats = IdempotencyStats()
+        self._conn: Optional[sqlite3.Connection] = None
+        self._db_lock = threading.Lock()
+        self._lock = threading.Lock()
+        self._local: OrderedDict[str, Tuple[str, IdempotentResponse, float]] = OrderedDict()
+        self._inflight: dict[str, Tuple[str, Future]] = {}
+        self._writes = 0
+
+    def close(self) -> None:
+        with self._db_lock:
+            if self._conn is not None:
+                self._conn.close()
+                self._conn = None
+
+    def run(self, key: str, request_hash: str, handler: Callable[[], IdempotentResponse]) -> IdempotentResponse:
+        """Return the stored response for `key`, or run `handler` once to produce it.
+
+        Only successful (2xx) responses are stored. If the handler raises or
+        fails, the key is released so a retry runs it again.
+        """
+
+        with self._lock:
+            cached = self._local_get(key)
+            if cached is not None:
+                return self._replay(key, request_hash, *cached[:2])
+            inflight = self._inflight.get(key)
+            if inflight is None:
+                future: Future = Future()
+                self._inflight[key] = (request_hash, future)
+
+        if inflight is not None:
+            leader_hash, leader = inflight
+            if leader_hash != request_hash:
+                self.stats.conflicts += 1
+                raise IdempotencyConflictError("Idempotency-Key was already used with a different request body")
+            self.stats.coalesced += 1
+            try:
+                response = leader.result(timeout=self.lease)
+            except FutureTimeoutError as exc:
+                raise IdempotencyInProgressError("A request with this Idempotency-Key is still in progress") from exc
+            return IdempotentResponse(response.status_code, response.body, replayed=True)
+
+        try:
+            response = self._lead(key, request_hash, handler)
+        except BaseException as exc:
+            future.set_exception(exc)
+            raise
+        else:
+            future.set_result(response)
+            return response
+        finally:
+            with self._lock:
+                self._inflight.pop(key, None)
+
+    def _lead(self, key: str, request_hash: str, handler: Callable[[], IdempotentResponse]) -> IdempotentResponse:
+        deadline = time.monotonic() + self.lease
+        delay = 0.01
+        while True:
+            claimed, stored = self._claim(key, request_hash)
+            if claimed:
+                break
+            if stored is not None:
+                stored_hash, response, expires_at = stored
+                self._local_put(key, stored_hash, response, expires_at)
+                return self._replay(key, request_hash, stored_hash, response)
+            # Another worker is running this key; wait for its response
+            if time.monotonic() >= deadline:
+                raise IdempotencyInProgressError("A request with this Idempotency-Key is still in progress")
+            time.sleep(delay)
+            delay = min(delay * 2, 0.25)
+
+        try:
+            response = handler()
+        except BaseException:
+            self._release(key)
+            raise
+        if not 200 <= response.status_code < 300:
+            self._release(key)
+            return response
+        expires_at = time.time() + self.ttl
+        self._store(key, request_hash, response, expires_at)
+        self._local_put(key, request_hash, response, expires_at)
+        self.stats.executed += 1
+        return response
+
+    def _replay(self, key: str, request_hash: str, stored_hash: str, response: IdempotentResponse) -> IdempotentResponse:
+        if stored_hash != request_hash:
+            self.stats.conflicts += 1
+            raise IdempotencyConflictError("Idempotency-Key was already used with a different request body")
+        self.stats.replayed += 1
+        return IdempotentResponse(response.status_code, response.body, replayed=True)
+
+    # In-process LRU, guarded by _lock
+
+    def _local_get(self, key: str) -> Optional[Tuple[str, IdempotentResponse, float]]:
+        entry = self._local.get(key)
+        if entry is None:
+            return None
+        if entry[2] < time.time():
+            del self._local[key]
+            return None
+        self._local.move_to_end(key)
+        return entry
+
+    def _local_put(self, key: str, request_hash: str, response: IdempotentResponse, expires_at: float) -> None:
+        with self._lock:
+            self._local[key] = (request_hash, response, expires_at)
+            self._local.move_to_end(key)
+            while len(self._local) > self.local_size:
+                self._local.popitem(last=False)
+
+    # Shared SQLite rows, guarded by _db_lock
+
+    def _db(self) -> sqlite3.Connection:
+        if self._conn is None:
+            os.makedirs(os.path.dirname(self.path) or ".", exist_ok=True)
+            self._conn = _connect(self.path)
+        return self._conn
+
+    def _claim(
+        self, key: str, request_hash: str
+    ) -> Tuple[bool, Optional[Tuple[str, IdempotentResponse, float]]]:
+        """Claim `key` for this request, or report the stored response if there is one.
+
+        Returns (claimed, stored); neither means another worker holds a live claim.
+        """
+
+        now = time.time()
+        with self._db_lock:
+            conn = self._db()
+            conn.execute("BEGIN IMMEDIATE")
+            try:
+                row = conn.execute(
+                    "SELECT body_hash, state, status_code, body, expires_at FROM idempotency WHERE key = ?",
+                    (key,),
+                ).fetchone()
+                if row is None or row[4] < now:
+                    conn.execute(
+                        "INSERT OR REPLACE INTO idempotency (key, body_hash, state, expires_at) "
+                        "VALUES (?, ?, 'pending', ?)",
+                        (key, request_hash, now + self.lease),
+                    )
+                    claimed, stored = True, None
+                elif row[1] == "done":
+                    claimed, stored = False, (row[0], IdempotentResponse(row[2], row[3]), row[4])
+                else:
+                    claimed, stored = False, None
+            except BaseException:
+                conn.execute("ROLLBACK")
+                raise
+            conn.execute("COMMIT")
+        return claimed, stored
+
+    def _store(self, key: str, request_hash: str, response: IdempotentResponse, expires_at: float) -> None:
+        with self._db_lock:
+            conn = self._db()
+            conn.execute(
+                "UPDATE idempotency SET state = 'done', status_code = ?, body = ?, expires_at = ? "
+                "WHERE key = ? AND body_hash = ?",
+                (response.status_code, response.body, expires_at, key, request_hash),
+            )
+            self._writes += 1
+            if self._writes % 100 == 0:
+                self._purge(conn)
+
+    def _release(self, key: str) -> None:
+        with self._db_lock:
+            self._db().execute("DELETE FROM idempotency WHERE key = ? AND state = 'pending'", (key,))
+
+    def _purge(self, conn: sqlite3.Connection) -> None:
+        """Drop expired rows, then the soonest-expiring ones beyond `max_entries`."""
+
+        purged = conn.execute("DELETE FROM idempotency WHERE expires_at < ?", (time.time(),)).rowcount
+        excess = conn.execute("SELECT COUNT(*) FROM idempotency").fetchone()[0] - self.max_entries
+        if excess > 0:
+            purged += conn.execute(
+                "DELETE FROM idempotency WHERE key IN "
+                "(SELECT key FROM idempotency WHERE state = 'done' ORDER BY expires_at LIMIT ?)",
+                (excess,),
+            ).rowcount
+        self.stats.purged += purged
+
+
+_store: Optional[IdempotencyStore] = None
+_store_lock = threading.Lock()
+
+
+def get_idempotency_store() -> IdempotencyStore:
+    """Process-wide store, configured through IDEMPOTENCY_STORE_PATH and IDEMPOTENCY_TTL_SECONDS."""
+
+    global _store
+    with _store_lock:
+        if _store is None:
+            _store = IdempotencyStore(
+                os.environ.get("IDEMPOTENCY_STORE_PATH", DEFAULT_IDEMPOTENCY_STORE_PATH),
+                ttl=float(os.environ.get("IDEMPOTENCY_TTL_SECONDS", 24 * 3600)),
+            )
+        return _store
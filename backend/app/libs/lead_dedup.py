@@ -0,0 +1,106 @@
+from __future__ import annotations
+
+import hashlib
+import math
+import re
+import unicodedata
+from typing import Iterable, List
+
+import numpy as np
+
+from app.libs.monday_client import LeadDetails
+
+# Mailbox providers that ignore dots in the local part
+_DOTLESS_DOMAINS = {"gmail.com", "googlemail.com"}
+_DOMAIN_ALIASES = {"googlemail.com": "gmail.com"}
+
+_COMPANY_SUFFIXES = {
+    "ag", "bv", "co", "company", "corp", "corporation", "gmbh", "inc", "incorporated",
+    "limited", "llc", "llp", "ltd", "plc", "pty", "sa", "sarl", "srl",
+}
+_NON_WORD = re.compile(r"[^\w]+")
+_MASK64 = (1 << 64) - 1
+
+
+def normalize_email(email: str) -> str:
+    """Case-fold an address and drop `+tag` sub-addressing (and Gmail dots)."""
+
+    local, _, domain = email.strip().casefold().rpartition("@")
+    if not local:
+        return domain
+    domain = _DOMAIN_ALIASES.get(domain, domain)
+    local = local.split("+", 1)[0]
+    if domain in _DOTLESS_DOMAINS:
+        local = local.replace(".", "")
+    return f"{local}@{domain}"
+
+
+def normalize_company(company: str) -> str:
+    """Reduce a company name to its distinguishing words.
+
+    "ACME, Inc." and "Acme Corp" both become "acme".
+    """
+
+    text = unicodedata.normalize("NFKD", company).encode("ascii", "ignore").decode()
+    words = _NON_WORD.sub(" ", text.casefold()).split()
+    while len(words) > 1 and words[-1] in _COMPANY_SUFFIXES:
+        words.pop()
+    return " ".join(words)
+
+
+def dedup_key(lead: LeadDetails) -> bytes:
+    """16-byte identity of a lead: normalized email plus normalized company."""
+
+    identity = f"{normalize_email(lead.email)}\x1f{normalize_company(lead.company)}"
+    return hashlib.blake2b(identity.encode(), digest_size=16).digest()
+
+
+class BloomFilter:
+    """Bloom filter over 16-byte dedup keys.
+
+    Keys are already uniform hashes, so the `k` probe positions come from
+    double hashing the two 64-bit halves of the key instead of rehashing.
+    The arithmetic wraps at 64 bits so `add_many` can do the same in NumPy
+    when the filter is loaded from the index.
+    """
+
+    def __init__(self, capacity: int, error_rate: float = 0.01) -> None:
+        self.capacity = max(capacity, 1)
+        self.error_rate = error_rate
+        self.size = max(int(-self.capacity * math.log(error_rate) / math.log(2) ** 2), 8)
+        self.hashes = max(int(round(self.size / self.capacity * math.log(2))), 1)
+        self.count = 0
+        self._bits = bytearray((self.size + 7) // 8)
+
+    def _positions(self, key: bytes) -> Iterable[int]:
+        h1 = int.from_bytes(key[:8], "little")
+        h2 = int.from_bytes(key[8:16], "little") | 1
+        size = self.size
+        return (((h1 + i * h2) & _MASK64) % size for i in range(self.hashes))
+
+    def add(self, key: bytes) -> None:
+        bits = self._bits
+        for pos in self._positions(key):
+            bits[pos >> 3] |= 1 << (pos & 7)
+        self.count += 1
+
+    def add_many(self, keys: List[bytes]) -> None:
+        if not keys:
+            return
+        halves = np.frombuffer(b"".join(keys), dtype="<u8").reshape(-1, 2)
+        h1 = halves[:, 0]
+        h2 = halves[:, 1] | np.uint64(1)
+        bits = np.unpackbits(np.frombuffer(self._bits, dtype=np.uint8), bitorder="little")
+        size = np.uint64(self.size)
+        for i in range(self.hashes):
+            bits[(h1 + np.uint64(i) * h2) % size] = 1
+        self._bits = bytearray(np.packbits(bits, bitorder="little").tobytes())
+        self.count += len(keys)
+
+    def __contains__(self, key: bytes) -> bool:
+        bits = self._bits
+        return all(bits[pos >> 3] & (1 << (pos & 7)) for pos in self._positions(key))
+
+    @property
+    def full(self) -> bool:
+        return self.count > self.capacity
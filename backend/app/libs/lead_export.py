@@ -0,0 +1,218 @@
+from __future__ import annotations
+
+import base64
+import csv
+import io
+import json
+import sqlite3
+from dataclasses import dataclass, field
+from datetime import datetime, timezone
+from typing import Collection, Iterator, List, Optional, Tuple
+
+from app.libs.domain_model import RoiMetrics
+from app.libs.prospect_scoring import OutputFormat
+
+# Rows fetched per keyset query; each query is a short read on the rowid range
+# after the previous chunk, so memory stays flat and no read transaction is
+# held open across the whole export.
+DEFAULT_EXPORT_CHUNK_ROWS = 2000
+
+LEAD_COLUMNS = (
+    "lead_id",
+    "created_at",
+    "name",
+    "email",
+    "company",
+    "phone",
+    "notes",
+    "industry",
+    "hours_per_week",
+    "labor_rate",
+    "tool_cost",
+)
+METRIC_COLUMNS = tuple(RoiMetrics.model_fields)
+EXPORT_COLUMNS = LEAD_COLUMNS + METRIC_COLUMNS
+
+# Exports walk the rowid. Left to itself, SQLite would serve a filter from a
+# secondary index and then re-sort the whole range by id for every chunk.
+EXPORT_SOURCE = "leads NOT INDEXED"
+
+# Timestamps are formatted and metrics pulled out of the stored result by
+# SQLite itself, so rows reach Python ready to write
+EXPORT_SELECT = (
+    "SELECT id, lead_id, strftime('%Y-%m-%dT%H:%M:%fZ', created_at, 'unixepoch'), "
+    "name, email, company, phone, notes, industry, hours_per_week, labor_rate, tool_cost, "
+    + ", ".join(f"json_extract(roi_json, '$.metrics.{name}')" for name in METRIC_COLUMNS)
+    + f" FROM {EXPORT_SOURCE}"
+)
+
+
+class LeadExportError(ValueError):
+    """Raised for an unreadable cursor or inconsistent filters."""
+
+
+@dataclass(slots=True)
+class LeadExportFilters:
+    """Server-side filters; timestamps are Unix seconds, ranges are inclusive.
+
+    `company_prefix` matches case-insensitively (ASCII, like SQLite's NOCASE).
+    """
+
+    created_from: Optional[float] = None
+    created_to: Optional[float] = None
+    industries: List[str] = field(default_factory=list)
+    min_savings: Optional[float] = None
+    max_savings: Optional[float] = None
+    company_prefix: Optional[str] = None
+
+    def where(self) -> Tuple[str, list]:
+        """SQL condition and parameters."""
+
+        clauses = []
+        params: list = []
+        if self.created_from is not None:
+            clauses.append("created_at >= ?")
+            params.append(self.created_from)
+        if self.created_to is not None:
+            clauses.append("created_at <= ?")
+            params.append(self.created_to)
+        if self.industries:
+            clauses.append(f"industry IN ({','.join('?' * len(self.industries))})")
+            params.extend(self.industries)
+        if self.min_savings is not None:
+            clauses.append("net_annual_savings >= ?")
+            params.append(self.min_savings)
+        if self.max_savings is not None:
+            clauses.append("net_annual_savings <= ?")
+            params.append(self.max_savings)
+        if self.company_prefix:
+            # A range rather than LIKE so the NOCASE company index always applies
+            prefix = self.company_prefix.lower()
+            clauses.append("company >= ? COLLATE NOCASE AND company < ? COLLATE NOCASE")
+            params.extend([prefix, prefix[:-1] + chr(ord(prefix[-1]) + 1)])
+        return " AND ".join(clauses) or "1", params
+
+    @property
+    def columns(self) -> List[str]:
+        """Columns this filter constrains."""
+
+        used = []
+        if self.created_from is not None or self.created_to is not None:
+            used.append("created_at")
+        if self.industries:
+            used.append("industry")
+        if self.min_savings is not None or self.max_savings is not None:
+            used.append("net_annual_savings")
+        if self.company_prefix:
+            used.append("company")
+        return used
+
+    def restrict(self, columns: Collection[str]) -> LeadExportFilters:
+        """Copy keeping only the constraints on `columns`."""
+
+        return LeadExportFilters(
+            created_from=self.created_from if "created_at" in columns else None,
+            created_to=self.created_to if "created_at" in columns else None,
+            industries=list(self.industries) if "industry" in columns else [],
+            min_savings=self.min_savings if "net_annual_savings" in columns else None,
+            max_savings=self.max_savings if "net_annual_savings" in columns else None,
+            company_prefix=self.company_prefix if "company" in columns else None,
+        )
+
+    def validate(self) -> None:
+        if None not in (self.created_from, self.created_to) and self.created_from > self.created_to:
+            raise LeadExportError("created_from must not be after created_to")
+        if None not in (self.min_savings, self.max_savings) and self.min_savings > self.max_savings:
+            raise LeadExportError("min_savings must not exceed max_savings")
+
+
+def to_timestamp(value: Optional[datetime]) -> Optional[float]:
+    """Unix seconds for a filter bound; naive datetimes are taken as UTC."""
+
+    if value is None:
+        return None
+    if value.tzinfo is None:
+        value = value.replace(tzinfo=timezone.utc)
+    return value.timestamp()
+
+
+def encode_cursor(row_id: int) -> str:
+    return base64.urlsafe_b64encode(f"id:{row_id}".encode()).decode().rstrip("=")
+
+
+def decode_cursor(cursor: Optional[str]) -> int:
+    """Row id to resume after; an absent cursor starts from the beginning."""
+
+    if not cursor:
+        return 0
+    try:
+        raw = base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4)).decode()
+        prefix, _, value = raw.partition(":")
+        if prefix != "id":
+            raise ValueError(raw)
+        return int(value)
+    except ValueError as exc:
+        raise LeadExportError("Invalid export cursor") from exc
+
+
+def next_cursor(conn: sqlite3.Connection, filters: LeadExportFilters, after: int, limit: int) -> Optional[str]:
+    """Cursor for the page after `limit` rows, or None when this is the last page.
+
+    Only row ids are read, so this is cheap next to the export itself and lets
+    the cursor go out in a header before the body streams.
+    """
+
+    where, params = filters.where()
+    row = conn.execute(
+        f"SELECT id FROM {EXPORT_SOURCE} WHERE {where} AND id > ? ORDER BY id LIMIT 1 OFFSET ?",
+        params + [after, limit - 1],
+    ).fetchone()
+    if row is None:
+        return None
+    more = conn.execute(f"SELECT 1 FROM {EXPORT_SOURCE} WHERE {where} AND id > ? LIMIT 1", params + [row[0]]).fetchone()
+    return encode_cursor(row[0]) if more else None
+
+
+def export_leads(
+    conn: sqlite3.Connection,
+    filters: LeadExportFilters,
+    output_format: OutputFormat = "ndjson",
+    *,
+    after: int = 0,
+    limit: Optional[int] = None,
+    chunk_rows: int = DEFAULT_EXPORT_CHUNK_ROWS,
+) -> Iterator[str]:
+    """Yield matching leads as NDJSON or CSV text, one keyset chunk at a time.
+
+    Closes `conn` when the export finishes or the consumer goes away.
+    """
+
+    where, params = filters.where()
+    sql = f"{EXPORT_SELECT} WHERE {where} AND id > ? ORDER BY id LIMIT ?"
+    buffer = io.StringIO()
+    writer = csv.writer(buffer, lineterminator="\n")
+    remaining = limit
+    try:
+        if output_format == "csv":
+            writer.writerow(EXPORT_COLUMNS)
+        while remaining is None or remaining > 0:
+            size = chunk_rows if remaining is None else min(chunk_rows, remaining)
+            rows = conn.execute(sql, params + [after, size]).fetchall()
+            if not rows:
+                break
+            after = rows[-1][0]
+            if remaining is not None:
+                remaining -= len(rows)
+            if output_format == "csv":
+                writer.writerows(row[1:] for row in rows)
+            else:
+                buffer.writelines(json.dumps(dict(zip(EXPORT_COLUMNS, row[1:]))) + "\n" for row in rows)
+            yield buffer.getvalue()
+            buffer.seek(0)
+            buffer.truncate()
+            if len(rows) < size:
+                break
+        if output_format == "csv" and buffer.tell():
+            yield buffer.getvalue()
+    finally:
+        conn.close()
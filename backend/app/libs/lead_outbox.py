@@ -0,0 +1,183 @@
+from __future__ import annotations
+
+import asyncio
+import logging
+import random
+import time
+from typing import Dict, List, Optional
+
+from pydantic import BaseModel
+
+from app.libs.lead_store import LeadStore, OutboxItem
+from app.libs.monday_client import (
+    AsyncMondayClient,
+    MondayError,
+    MondayPartialDeliveryError,
+    MondayRateLimitedError,
+)
+from app.libs.monday_governor import MondayGovernorStats
+
+logger = logging.getLogger("uvicorn")
+
+
+class OutboxWorkerStats(BaseModel):
+    """Delivery counters for the outbox worker and the state of its Monday client."""
+
+    outbox: Dict[str, int]
+    delivered: int
+    retried: int
+    deferred: int
+    dead: int
+    governor: Optional[MondayGovernorStats] = None
+
+
+class OutboxWorker:
+    """Drains the lead outbox to Monday.com off the request path.
+
+    Runs as an asyncio task started from the app lifespan. Due deliveries are
+    claimed in batches under a lease, split into at most `concurrency` groups
+    that each go out as batched Monday mutations over the shared pooled
+    client, retried with jittered exponential backoff and moved to the
+    dead-letter table after `max_attempts` failures. Deliveries held back by
+    rate limiting are deferred for as long as Monday asks, and that does not
+    count as an attempt. The worker does not own the client; whoever created
+    it closes it.
+    """
+
+    def __init__(
+        self,
+        store: LeadStore,
+        client: AsyncMondayClient,
+        *,
+        concurrency: int = 4,
+        batch_size: int = 32,
+        poll_interval: float = 1.0,
+        lease: float = 120.0,
+        max_attempts: int = 8,
+        base_backoff: float = 2.0,
+        max_backoff: float = 600.0,
+    ) -> None:
+        self.store = store
+        self.client = client
+        self.concurrency = concurrency
+        self.batch_size = batch_size
+        self.poll_interval = poll_interval
+        self.lease = lease
+        self.max_attempts = max_attempts
+        self.base_backoff = base_backoff
+        self.max_backoff = max_backoff
+        self.delivered = 0
+        self.retried = 0
+        self.dead = 0
+        self.deferred = 0
+        self._task: Optional[asyncio.Task] = None
+        self._wakeup = asyncio.Event()
+
+    def start(self) -> None:
+        if self._task is None:
+            self._task = asyncio.create_task(self.run(), name="lead-outbox-worker")
+
+    async def stop(self) -> None:
+        task, self._task = self._task, None
+        if task is not None:
+            task.cancel()
+            try:
+                await task
+            except asyncio.CancelledError:
+                pass
+
+    def wake(self) -> None:
+        """Skip the rest of the current poll interval."""
+
+        self._wakeup.set()
+
+    def stats(self) -> OutboxWorkerStats:
+        governor = self.client.governor
+        return OutboxWorkerStats(
+            outbox=self.store.outbox_counts(),
+            delivered=self.delivered,
+            retried=self.retried,
+            deferred=self.deferred,
+            dead=self.dead,
+            governor=governor.stats() if governor is not None else None,
+        )
+
+    def backoff(self, attempts: int) -> float:
+        delay = min(self.base_backoff * 2 ** (attempts - 1), self.max_backoff)
+        return delay * random.uniform(0.5, 1.0)
+
+    async def run(self) -> None:
+        while True:
+            items = await asyncio.to_thread(self.store.claim_outbox, self.batch_size, self.lease)
+            if items:
+                await self._deliver_all(items)
+                continue
+            self._wakeup.clear()
+            try:
+                await asyncio.wait_for(self._wakeup.wait(), timeout=self.poll_interval)
+            except asyncio.TimeoutError:
+                pass
+
+    async def drain(self) -> int:
+        """Deliver everything currently due, then return. Meant for tests and scripts."""
+
+        handled = 0
+        while items := await asyncio.to_thread(self.store.claim_outbox, self.batch_size, self.lease):
+            await self._deliver_all(items)
+            handled += len(items)
+        return handled
+
+    async def _deliver_all(self, items: List[OutboxItem]) -> None:
+        size = -(-len(items) // self.concurrency)
+        groups = [items[i : i + size] for i in range(0, len(items), size)]
+        await asyncio.gather(*(self._deliver_group(group) for group in groups))
+
+    async def _deliver_group(self, items: List[OutboxItem]) -> None:
+        try:
+            results = await self.client.create_leads_with_roi(
+                [(item.lead, item.roi) for item in items],
+                item_ids=[item.item_id for item in items],
+            )
+        except Exception as exc:
+            # The client settles lead by lead, so this is unexpected; items
+            # created on earlier attempts stay known so retries only send updates
+            for item in items:
+                if item.item_id is not None and not isinstance(exc, MondayRateLimitedError):
+                    await self._record_failure(item, MondayPartialDeliveryError(str(exc), item.item_id))
+                else:
+                    await self._record_failure(item, exc)
+            return
+        for item, result in zip(items, results):
+            if result.error is None:
+                await asyncio.to_thread(self.store.mark_delivered, item.lead_id, result.item_id, result.update_id)
+                self.delivered += 1
+            elif result.retry_after is not None:
+                await self._defer(item, result.retry_after, result.error, result.item_id)
+            elif result.item_id is not None:
+                await self._record_failure(item, MondayPartialDeliveryError(result.error, result.item_id))
+            else:
+                await self._record_failure(item, MondayError(result.error))
+
+    async def _defer(
+        self, item: OutboxItem, retry_after: float, reason: str, item_id: Optional[str] = None
+    ) -> None:
+        # Spread deferred leads out so they do not all come back at once
+        retry_at = time.time() + retry_after * random.uniform(1.0, 1.25)
+        await asyncio.to_thread(self.store.defer, item.lead_id, reason, retry_at, item_id)
+        self.deferred += 1
+
+    async def _record_failure(self, item: OutboxItem, exc: Exception) -> None:
+        if isinstance(exc, MondayRateLimitedError):
+            await self._defer(item, exc.retry_after, str(exc))
+            return
+        attempts = item.attempts + 1
+        error = f"{type(exc).__name__}: {exc}"
+        if attempts >= self.max_attempts:
+            logger.error("Lead %s moved to dead letters after %d attempts: %s", item.lead_id, attempts, error)
+            await asyncio.to_thread(self.store.mark_dead, item.lead_id, error)
+            self.dead += 1
+            return
+        item_id = exc.item_id if isinstance(exc, MondayPartialDeliveryError) else None
+        retry_at = time.time() + self.backoff(attempts)
+        await asyncio.to_thread(self.store.mark_retry, item.lead_id, error, retry_at, item_id)
+        self.retried += 1
@@ -0,0 +1,213 @@
+from __future__ import annotations
+
+import base64
+import json
+import re
+import sqlite3
+import time
+from dataclasses import dataclass, field
+from datetime import datetime
+from typing import List, Literal, Optional
+
+from pydantic import BaseModel
+
+from app.libs.lead_export import LeadExportError, LeadExportFilters
+
+LeadSortField = Literal["created_at", "net_annual_savings", "company"]
+SortOrder = Literal["asc", "desc"]
+
+MAX_QUERY_LIMIT = 500
+
+# A filter index range holding fewer leads than this is narrow enough to read
+# whole and sort; past it, walking the sort index finds a page sooner. Probes
+# count index entries only up to this bound, so they stay cheap.
+BROAD_FILTER_ROWS = 5000
+
+QueryStrategy = Literal["filter_index", "sort_index"]
+
+# ORDER BY expressions and the lead store index that yields each order
+SORT_EXPRESSIONS = {
+    "created_at": "created_at",
+    "net_annual_savings": "net_annual_savings",
+    "company": "company COLLATE NOCASE",
+}
+SORT_INDEXES = {
+    "created_at": "leads_created",
+    "net_annual_savings": "leads_savings",
+    "company": "leads_company",
+}
+
+# The lead store's secondary indexes by the filter columns they cover, in order
+FILTER_INDEXES = {
+    "leads_created": ("created_at",),
+    "leads_savings": ("net_annual_savings",),
+    "leads_company": ("company",),
+    "leads_industry_created": ("industry", "created_at"),
+    "leads_industry_savings": ("industry", "net_annual_savings"),
+}
+
+SUMMARY_SELECT = (
+    "SELECT id, lead_id, created_at, name, email, company, industry, "
+    "hours_per_week, labor_rate, tool_cost, net_annual_savings, payback_months FROM leads"
+)
+
+_INDEX_NAME = re.compile(r"USING (?:COVERING )?INDEX (\w+)")
+
+
+class LeadSummary(BaseModel):
+    """A stored lead with its headline ROI figures."""
+
+    lead_id: str
+    created_at: datetime
+    name: str
+    email: str
+    company: str
+    industry: str
+    hours_per_week: float
+    labor_rate: float
+    tool_cost: float
+    net_annual_savings: float
+    payback_months: Optional[float] = None
+
+
+SUMMARY_SELECT_COLUMNS = tuple(LeadSummary.model_fields)
+
+
+class LeadQueryPlan(BaseModel):
+    """How SQLite ran a lead query, for checking which index served it."""
+
+    sql: str
+    plan: List[str]
+    indexes: List[str]
+    strategy: QueryStrategy
+    index: str
+    probed_rows: Optional[int] = None
+    elapsed_ms: float
+
+
+class LeadQueryResult(BaseModel):
+    leads: List[LeadSummary]
+    next_cursor: Optional[str] = None
+    explain: Optional[LeadQueryPlan] = None
+
+
+@dataclass(slots=True)
+class LeadQuery:
+    """Filters plus a keyset-paginated sort over stored leads."""
+
+    filters: LeadExportFilters = field(default_factory=LeadExportFilters)
+    sort: LeadSortField = "created_at"
+    order: SortOrder = "desc"
+    limit: int = 50
+    cursor: Optional[str] = None
+
+    def sql(self, index: Optional[str] = None) -> tuple[str, list]:
+        where, params = self.filters.where()
+        expression = SORT_EXPRESSIONS[self.sort]
+        direction = "DESC" if self.order == "desc" else "ASC"
+        if self.cursor:
+            value, row_id = self._decode_cursor()
+            where += f" AND ({expression}, id) {'<' if self.order == 'desc' else '>'} (?, ?)"
+            params += [value, row_id]
+        source = f"{SUMMARY_SELECT} INDEXED BY {index}" if index else SUMMARY_SELECT
+        sql = f"{source} WHERE {where} ORDER BY {expression} {direction}, id {direction} LIMIT ?"
+        # One extra row tells whether there is a next page
+        return sql, params + [self.limit + 1]
+
+    def encode_cursor(self, value: object, row_id: int) -> str:
+        raw = json.dumps([self.sort, self.order, value, row_id]).encode()
+        return base64.urlsafe_b64encode(raw).decode().rstrip("=")
+
+    def _decode_cursor(self) -> tuple[object, int]:
+        assert self.cursor is not None
+        try:
+            raw = base64.urlsafe_b64decode(self.cursor + "=" * (-len(self.cursor) % 4))
+            decoded = json.loads(raw)
+        except ValueError as exc:
+            raise LeadExportError("Invalid query cursor") from exc
+        if not isinstance(decoded, list) or len(decoded) != 4:
+            raise LeadExportError("Invalid query cursor")
+        sort, order, value, row_id = decoded
+        # Only values a sort column can hold bind as a query parameter
+        if value is not None and not isinstance(value, (str, int, float)):
+            raise LeadExportError("Invalid query cursor")
+        if (sort, order) != (self.sort, self.order) or not isinstance(row_id, int):
+            raise LeadExportError("Cursor belongs to a query with a different sort")
+        return value, row_id
+
+
+def choose_index(conn: sqlite3.Connection, query: LeadQuery) -> tuple[QueryStrategy, str, Optional[int]]:
+    """Pick the index that serves `query`: a narrow filter's, or the sort's.
+
+    SQLite's planner has no row counts for a filter's actual values, so on a
+    large table it can read a broad filter range and sort it all for one
+    page. Instead, each filter index range is counted (index entries only, up
+    to BROAD_FILTER_ROWS); the narrowest is used when it is under the bound,
+    otherwise the sort index is walked and the filters checked per row.
+
+    Returns the strategy, the index name, and the narrowest probed count.
+    """
+
+    filtered = set(query.filters.columns)
+    if filtered <= {query.sort}:
+        # The sort index is the filter index too
+        return "sort_index", SORT_INDEXES[query.sort], None
+    ranges: dict[tuple[str, ...], str] = {}
+    for index, columns in FILTER_INDEXES.items():
+        prefix = columns[: next((i for i, c in enumerate(columns) if c not in filtered), len(columns))]
+        # Of two indexes with the same filter prefix, prefer the one whose next column is the sort
+        if prefix and (prefix not in ranges or columns[len(prefix) :][:1] == (query.sort,)):
+            ranges[prefix] = index
+
+    best: Optional[tuple[int, str]] = None
+    for prefix, index in sorted(ranges.items(), key=lambda item: -len(item[0])):
+        where, params = query.filters.restrict(prefix).where()
+        count = conn.execute(
+            f"SELECT COUNT(*) FROM (SELECT 1 FROM leads INDEXED BY {index} WHERE {where} LIMIT ?)",
+            params + [BROAD_FILTER_ROWS],
+        ).fetchone()[0]
+        if best is None or count < best[0]:
+            best = (count, index)
+        if count < BROAD_FILTER_ROWS // 10:
+            break
+
+    if best is None:
+        return "sort_index", SORT_INDEXES[query.sort], None
+    if best[0] < BROAD_FILTER_ROWS:
+        return "filter_index", best[1], best[0]
+    return "sort_index", SORT_INDEXES[query.sort], best[0]
+
+
+def run_lead_query(conn: sqlite3.Connection, query: LeadQuery, *, explain: bool = False) -> LeadQueryResult:
+    """Run `query` and return one page of leads, optionally with its query plan."""
+
+    query.filters.validate()
+    started = time.perf_counter()
+    strategy, index, probed_rows = choose_index(conn, query)
+    sql, params = query.sql(index)
+    rows = conn.execute(sql, params).fetchall()
+    elapsed_ms = (time.perf_counter() - started) * 1000
+
+    page = rows[: query.limit]
+    sort_column = 1 + SUMMARY_SELECT_COLUMNS.index(query.sort)
+    next_cursor = None
+    if len(rows) > query.limit:
+        last = page[-1]
+        next_cursor = query.encode_cursor(last[sort_column], last[0])
+
+    result = LeadQueryResult(
+        leads=[LeadSummary(**dict(zip(SUMMARY_SELECT_COLUMNS, row[1:]))) for row in page],
+        next_cursor=next_cursor,
+    )
+    if explain:
+        plan = [row[3] for row in conn.execute(f"EXPLAIN QUERY PLAN {sql}", params)]
+        result.explain = LeadQueryPlan(
+            sql=sql,
+            plan=plan,
+            indexes=[match for line in plan for match in _INDEX_NAME.findall(line)],
+            strategy=strategy,
+            index=index,
+            probed_rows=probed_rows,
+            elapsed_ms=round(elapsed_ms, 3),
+        )
+    return result
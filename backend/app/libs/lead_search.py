@@ -0,0 +1,310 @@
+from __future__ import annotations
+
+import html
+import logging
+import re
+import sqlite3
+import threading
+import time
+from dataclasses import dataclass
+from datetime import datetime
+from typing import List, Optional
+
+from pydantic import BaseModel
+
+from app.libs.lead_store import LeadStore, get_lead_store
+
+logger = logging.getLogger("uvicorn")
+
+MAX_SEARCH_LIMIT = 100
+DEFAULT_BATCH_ROWS = 256
+
+_TERM = re.compile(r"\w+")
+
+# FTS5 brackets matches with these private-use characters; the text is then
+# HTML-escaped and only they become marks, so stored text can't inject markup
+_OPEN_SENTINEL = "\ue000"
+_CLOSE_SENTINEL = "\ue001"
+
+INDEX_ROWS = """
+INSERT INTO lead_search (rowid, company, notes)
+SELECT id, company, notes FROM leads WHERE id > ? AND id <= ?
+"""
+
+# Company matches outrank notes matches; bm25() is lower for better matches
+SEARCH_SQL = """
+SELECT leads.lead_id, leads.created_at, leads.name, leads.industry, leads.net_annual_savings,
+    highlight(lead_search, 0, :open, :close),
+    snippet(lead_search, 1, :open, :close, '…', :snippet_tokens),
+    bm25(lead_search, 2.0, 1.0) AS score
+FROM lead_search JOIN leads ON leads.id = lead_search.rowid
+WHERE lead_search MATCH :match
+ORDER BY score
+LIMIT :limit OFFSET :offset
+"""
+
+
+class LeadSearchHit(BaseModel):
+    """A matching lead; `company` and `notes` are HTML-escaped and carry the highlight marks."""
+
+    lead_id: str
+    created_at: datetime
+    name: str
+    company: str
+    industry: str
+    net_annual_savings: float
+    notes: Optional[str] = None
+    score: float
+
+
+class LeadSearchResult(BaseModel):
+    match: str
+    hits: List[LeadSearchHit]
+    elapsed_ms: float
+
+
+@dataclass(slots=True)
+class LeadSearchStats:
+    indexed: int = 0
+    reindexed: int = 0
+    flushes: int = 0
+    largest_flush: int = 0
+    last_flush_ms: float = 0.0
+
+
+def match_expression(text: str) -> Optional[str]:
+    """FTS5 query matching leads that contain every word of `text` as a prefix.
+
+    Each word is quoted, so user input can never form FTS5 query syntax.
+    """
+
+    terms = _TERM.findall(text)
+    if not terms:
+        return None
+    return " ".join(f'"{term}"*' for term in terms)
+
+
+def _marked_html(text: str, open_mark: str, close_mark: str) -> str:
+    """HTML-escape highlighted text, then turn the sentinels into the marks."""
+
+    escaped = html.escape(text, quote=True)
+    return escaped.replace(_OPEN_SENTINEL, open_mark).replace(_CLOSE_SENTINEL, close_mark)
+
+
+def search_leads(
+    conn: sqlite3.Connection,
+    text: str,
+    *,
+    limit: int = 20,
+    offset: int = 0,
+    open_mark: str = "<mark>",
+    close_mark: str = "</mark>",
+    snippet_tokens: int = 16,
+) -> LeadSearchResult:
+    """Best-ranked leads whose company or notes match `text`.
+
+    `company` and `notes` come back HTML-escaped with the matches wrapped in
+    `open_mark` and `close_mark`, which are inserted as given.
+    """
+
+    match = match_expression(text)
+    if match is None:
+        return LeadSearchResult(match="", hits=[], elapsed_ms=0.0)
+    started = time.perf_counter()
+    rows = conn.execute(
+        SEARCH_SQL,
+        {
+            "open": _OPEN_SENTINEL,
+            "close": _CLOSE_SENTINEL,
+            "snippet_tokens": snippet_tokens,
+            "match": match,
+            "limit": limit,
+            "offset": offset,
+        },
+    ).fetchall()
+    elapsed_ms = (time.perf_counter() - started) * 1000
+    hits = [
+        LeadSearchHit(
+            lead_id=lead_id,
+            created_at=created_at,
+            name=name,
+            company=_marked_html(company, open_mark, close_mark),
+            industry=industry,
+            net_annual_savings=savings,
+            notes=_marked_html(notes, open_mark, close_mark) if notes else None,
+            score=-score,
+        )
+        for lead_id, created_at, name, industry, savings, company, notes, score in rows
+    ]
+    return LeadSearchResult(match=match, hits=hits, elapsed_ms=round(elapsed_ms, 3))
+
+
+class LeadSearchIndex:
+    """Keeps the `lead_search` full-text index in step with stored leads.
+
+    Inserting into FTS5 inside the lead store's group commit would lengthen
+    every ingestion transaction, so the index trails it instead. The store
+    wakes this indexer after each committed batch; the indexer lets commits
+    accumulate for up to `min_interval` seconds, then indexes all leads past
+    its watermark (plus merged leads whose text changed) in transactions of
+    at most `batch_rows` rows. Leads written by other processes are picked up
+    every `poll_interval` seconds. Search results can therefore lag
+    ingestion by about `min_interval`.
+    """
+
+    def __init__(
+        self,
+        store: LeadStore,
+        *,
+        batch_rows: int = DEFAULT_BATCH_ROWS,
+        min_interval: float = 0.5,
+        poll_interval: float = 5.0,
+        merge_pages: int = 64,
+    ) -> None:
+        self.store = store
+        self.batch_rows = batch_rows
+        self.min_interval = min_interval
+        self.poll_interval = poll_interval
+        self.merge_pages = merge_pages
+        self.stats = LeadSearchStats()
+        self._conn: Optional[sqlite3.Connection] = None
+        self._thread: Optional[threading.Thread] = None
+        self._lock = threading.Lock()
+        self._flush_lock = threading.Lock()
+        self._wake = threading.Event()
+        self._stop = threading.Event()
+
+    def start(self) -> None:
+        with self._lock:
+            if self._thread is not None:
+                return
+            # The store creates the index tables and the merge trigger
+            self.store.start()
+            conn = sqlite3.connect(self.store.path, check_same_thread=False, isolation_level=None)
+            conn.execute("PRAGMA busy_timeout=5000")
+            # The index can be rebuilt from the leads table, so skip the per-commit fsync
+            conn.execute("PRAGMA synchronous=NORMAL")
+            # Leave WAL checkpoints to the lead store's writer rather than run them under its lock
+            conn.execute("PRAGMA wal_autocheckpoint=0")
+            # FTS5 would otherwise merge index segments inside whichever insert
+            # tips a level over, stalling that batch; merges run as separate
+            # bounded steps after each batch instead
+            conn.execute("INSERT INTO lead_search (lead_search, rank) VALUES ('automerge', 0)")
+            conn.execute("INSERT INTO lead_search (lead_search, rank) VALUES ('crisismerge', 64)")
+            self._conn = conn
+            self._stop.clear()
+            self.store.add_commit_listener(self._wake.set)
+            self._thread = threading.Thread(target=self._run, name="lead-search-indexer", daemon=True)
+            self._thread.start()
+
+    def close(self, timeout: float = 5.0) -> None:
+        """Index whatever is left, then stop the indexer."""
+
+        with self._lock:
+            thread, self._thread = self._thread, None
+        if thread is None:
+            return
+        self._stop.set()
+        self._wake.set()
+        thread.join(timeout)
+        with self._flush_lock:
+            if self._conn is not None:
+                self._conn.close()
+                self._conn = None
+
+    def refresh(self) -> int:
+        """Index every lead stored so far; returns how many rows were written."""
+
+        total = 0
+        while written := self._flush_batch():
+            total += written
+            # Let a waiting lead store commit go between index transactions
+            time.sleep(0.001)
+        return total
+
+    def _run(self) -> None:
+        last_flush = 0.0
+        while not self._stop.is_set():
+            self._wake.wait(self.poll_interval)
+            # Fold the commits of a burst into one flush
+            delay = last_flush + self.min_interval - time.monotonic()
+            if delay > 0:
+                self._stop.wait(delay)
+            self._wake.clear()
+            try:
+                self.refresh()
+            except sqlite3.Error:
+                logger.exception("Lead search indexing failed")
+            last_flush = time.monotonic()
+        try:
+            self.refresh()
+        except sqlite3.Error:
+            logger.exception("Lead search indexing failed")
+
+    def _flush_batch(self) -> int:
+        with self._flush_lock:
+            conn = self._conn
+            if conn is None:
+                return 0
+            started = time.perf_counter()
+            with self.store.write_lock:
+                written = self._write_batch(conn)
+            if written:
+                # Pay down segment merging in a bounded step of its own
+                with self.store.write_lock:
+                    conn.execute("INSERT INTO lead_search (lead_search, rank) VALUES ('merge', ?)", (self.merge_pages,))
+                self.stats.flushes += 1
+                self.stats.largest_flush = max(self.stats.largest_flush, written)
+                self.stats.last_flush_ms = round((time.perf_counter() - started) * 1000, 3)
+            return written
+
+    def _write_batch(self, conn: sqlite3.Connection) -> int:
+        conn.execute("BEGIN IMMEDIATE")
+        try:
+            row = conn.execute("SELECT indexed_through FROM lead_search_state WHERE id = 1").fetchone()
+            through = row[0] if row else 0
+            # Rows are copied within SQLite in one statement rather than fetched
+            # into Python, so the GIL is given up once per batch, not per row
+            upto = conn.execute(
+                "SELECT MAX(id) FROM (SELECT id FROM leads WHERE id > ? ORDER BY id LIMIT ?)",
+                (through, self.batch_rows),
+            ).fetchone()[0]
+            indexed = 0
+            if upto is not None:
+                indexed = conn.execute(INDEX_ROWS, (through, upto)).rowcount
+                through = upto
+                conn.execute("INSERT OR REPLACE INTO lead_search_state (id, indexed_through) VALUES (1, ?)", (through,))
+            # Merged leads past the watermark were just indexed with their new text
+            dirty = [
+                lead_id for (lead_id,) in conn.execute("SELECT id FROM lead_search_dirty LIMIT ?", (self.batch_rows,))
+            ]
+            if dirty:
+                placeholders = ",".join("?" * len(dirty))
+                conn.execute(f"DELETE FROM lead_search WHERE rowid IN ({placeholders})", dirty)
+                conn.execute(
+                    "INSERT INTO lead_search (rowid, company, notes) "
+                    f"SELECT id, company, notes FROM leads WHERE id IN ({placeholders}) AND id <= ?",
+                    dirty + [through],
+                )
+                conn.execute(f"DELETE FROM lead_search_dirty WHERE id IN ({placeholders})", dirty)
+        except BaseException:
+            conn.execute("ROLLBACK")
+            raise
+        conn.execute("COMMIT")
+        self.stats.indexed += indexed
+        self.stats.reindexed += len(dirty)
+        return indexed + len(dirty)
+
+
+_index: Optional[LeadSearchIndex] = None
+_index_lock = threading.Lock()
+
+
+def get_lead_search_index() -> LeadSearchIndex:
+    """Process-wide indexer over the process-wide lead store."""
+
+    global _index
+    with _index_lock:
+        if _index is None:
+            _index = LeadSearchIndex(get_lead_store())
+        return _index
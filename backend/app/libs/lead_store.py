@@ -0,0 +1,659 @@
+from __future__ import annotations
+
+import logging
+import os
+import queue
+import sqlite3
+import threading
+import time
+import uuid
+from concurrent.futures import Future
+from contextlib import contextmanager
+from dataclasses import dataclass, field
+from typing import Callable, Iterator, List, Optional
+
+from app.libs.domain_model import RoiCalculationResult
+from app.libs.lead_dedup import BloomFilter, dedup_key
+from app.libs.monday_client import LeadDetails
+
+logger = logging.getLogger("uvicorn")
+
+# Vercel functions can only write below /tmp, override for long-lived hosts
+DEFAULT_LEAD_STORE_PATH = "/tmp/roileads/leads.sqlite3"
+DEFAULT_DEDUP_WINDOW_DAYS = 30
+DEFAULT_DEDUP_CAPACITY = 1_000_000
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS leads (
+    id INTEGER PRIMARY KEY,
+    lead_id TEXT NOT NULL UNIQUE,
+    created_at REAL NOT NULL,
+    name TEXT NOT NULL,
+    email TEXT NOT NULL,
+    company TEXT NOT NULL,
+    phone TEXT NOT NULL,
+    notes TEXT,
+    industry TEXT NOT NULL,
+    hours_per_week REAL NOT NULL,
+    labor_rate REAL NOT NULL,
+    tool_cost REAL NOT NULL,
+    net_annual_savings REAL NOT NULL,
+    payback_months REAL,
+    roi_json TEXT NOT NULL
+);
+
+-- Secondary indexes for the lead query API; each also serves keyset pages
+-- because SQLite appends the rowid (id) to every index entry
+CREATE INDEX IF NOT EXISTS leads_created ON leads (created_at);
+CREATE INDEX IF NOT EXISTS leads_savings ON leads (net_annual_savings);
+CREATE INDEX IF NOT EXISTS leads_industry_created ON leads (industry, created_at);
+CREATE INDEX IF NOT EXISTS leads_industry_savings ON leads (industry, net_annual_savings);
+CREATE INDEX IF NOT EXISTS leads_company ON leads (company COLLATE NOCASE);
+
+-- Transactional outbox: one delivery row per lead, written in the same
+-- transaction as the lead and drained by the Monday.com outbox worker
+CREATE TABLE IF NOT EXISTS lead_outbox (
+    lead_id TEXT PRIMARY KEY REFERENCES leads (lead_id),
+    status TEXT NOT NULL DEFAULT 'pending',
+    attempts INTEGER NOT NULL DEFAULT 0,
+    next_attempt_at REAL NOT NULL,
+    item_id TEXT,
+    update_id TEXT,
+    last_error TEXT,
+    updated_at REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS lead_outbox_due ON lead_outbox (status, next_attempt_at);
+
+CREATE TABLE IF NOT EXISTS lead_dead_letters (
+    lead_id TEXT PRIMARY KEY REFERENCES leads (lead_id),
+    failed_at REAL NOT NULL,
+    attempts INTEGER NOT NULL,
+    error TEXT NOT NULL
+);
+
+-- Dedup index: normalized email + company hash -> the lead repeats merge into
+CREATE TABLE IF NOT EXISTS lead_dedup (
+    key BLOB PRIMARY KEY,
+    lead_id TEXT NOT NULL REFERENCES leads (lead_id),
+    first_seen REAL NOT NULL,
+    last_seen REAL NOT NULL,
+    submissions INTEGER NOT NULL DEFAULT 1
+) WITHOUT ROWID;
+
+-- Full-text index over company and notes (rowid = leads.id), kept up to date
+-- in batches by app.libs.lead_search: new leads are picked up past the
+-- indexed_through watermark, and merges that change the text queue their id
+CREATE VIRTUAL TABLE IF NOT EXISTS lead_search USING fts5 (
+    company, notes, tokenize = 'unicode61 remove_diacritics 2', prefix = '2 3'
+);
+CREATE TABLE IF NOT EXISTS lead_search_state (
+    id INTEGER PRIMARY KEY CHECK (id = 1),
+    indexed_through INTEGER NOT NULL
+);
+CREATE TABLE IF NOT EXISTS lead_search_dirty (id INTEGER PRIMARY KEY);
+CREATE TRIGGER IF NOT EXISTS lead_search_merge AFTER UPDATE OF company, notes ON leads
+WHEN OLD.company IS NOT NEW.company OR OLD.notes IS NOT NEW.notes
+BEGIN
+    INSERT OR IGNORE INTO lead_search_dirty (id) VALUES (NEW.id);
+END;
+"""
+
+INSERT_LEAD = """
+INSERT INTO leads (
+    lead_id, created_at, name, email, company, phone, notes, industry,
+    hours_per_week, labor_rate, tool_cost, net_annual_savings, payback_months, roi_json
+) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+"""
+
+INSERT_OUTBOX = """
+INSERT INTO lead_outbox (lead_id, next_attempt_at, updated_at) VALUES (?, ?, ?)
+"""
+
+UPSERT_DEDUP = """
+INSERT OR REPLACE INTO lead_dedup (key, lead_id, first_seen, last_seen) VALUES (?, ?, ?, ?)
+"""
+
+# A repeat submission refreshes the lead with its latest details and inputs;
+# an undelivered outbox row then picks those up, a delivered one is left alone
+MERGE_LEAD = """
+UPDATE leads SET
+    name = ?, phone = ?, notes = COALESCE(?, notes), industry = ?,
+    hours_per_week = ?, labor_rate = ?, tool_cost = ?,
+    net_annual_savings = ?, payback_months = ?, roi_json = ?
+WHERE lead_id = ?
+"""
+
+TOUCH_DEDUP = """
+UPDATE lead_dedup SET last_seen = ?, submissions = submissions + 1 WHERE key = ?
+"""
+
+# Rows stuck in 'delivering' past their lease (worker crashed) become due again
+CLAIM_OUTBOX = """
+UPDATE lead_outbox SET status = 'delivering', next_attempt_at = ?, updated_at = ?
+WHERE lead_id IN (
+    SELECT lead_id FROM lead_outbox
+    WHERE status IN ('pending', 'delivering') AND next_attempt_at <= ?
+    ORDER BY next_attempt_at LIMIT ?
+)
+RETURNING lead_id, attempts, item_id
+"""
+
+
+class LeadStoreError(RuntimeError):
+    """Raised when the lead store is closed or fails its startup check."""
+
+
+@dataclass(slots=True)
+class LeadRecord:
+    lead_id: str
+    created_at: float
+    lead: LeadDetails
+    roi: RoiCalculationResult
+    # Set by LeadStore.append; `merged` records update an existing lead
+    dedup_key: Optional[bytes] = None
+    merged: bool = False
+
+    def row(self) -> tuple:
+        inputs = self.roi.inputs
+        metrics = self.roi.metrics
+        return (
+            self.lead_id,
+            self.created_at,
+            self.lead.name,
+            self.lead.email,
+            self.lead.company,
+            self.lead.phone,
+            self.lead.notes,
+            self.roi.profile.key,
+            inputs.hours_per_week,
+            inputs.labor_rate,
+            inputs.tool_cost,
+            metrics.net_annual_savings,
+            metrics.payback_months,
+            self.roi.model_dump_json(),
+        )
+
+    def merge_row(self) -> tuple:
+        inputs = self.roi.inputs
+        metrics = self.roi.metrics
+        return (
+            self.lead.name,
+            self.lead.phone,
+            self.lead.notes,
+            self.roi.profile.key,
+            inputs.hours_per_week,
+            inputs.labor_rate,
+            inputs.tool_cost,
+            metrics.net_annual_savings,
+            metrics.payback_months,
+            self.roi.model_dump_json(),
+            self.lead_id,
+        )
+
+
+@dataclass(slots=True)
+class OutboxItem:
+    """A lead claimed for delivery, with the state of earlier attempts."""
+
+    lead_id: str
+    attempts: int
+    item_id: Optional[str]
+    lead: LeadDetails
+    roi: RoiCalculationResult
+
+
+def new_lead_record(lead: LeadDetails, roi: RoiCalculationResult) -> LeadRecord:
+    return LeadRecord(lead_id=uuid.uuid4().hex, created_at=time.time(), lead=lead, roi=roi)
+
+
+@dataclass(slots=True)
+class LeadStoreStats:
+    queued: int = 0
+    written: int = 0
+    batches: int = 0
+    largest_batch: int = 0
+    failed_batches: int = 0
+    deduplicated: int = 0
+    bloom_skips: int = 0
+    index_reads: int = 0
+    recovered_from: Optional[str] = None
+
+
+@dataclass(slots=True)
+class _PendingWrite:
+    record: LeadRecord
+    future: Future = field(default_factory=Future)
+
+
+def _connect(path: str) -> sqlite3.Connection:
+    conn = sqlite3.connect(path, check_same_thread=False, isolation_level=None)
+    conn.execute("PRAGMA journal_mode=WAL")
+    # FULL syncs the WAL on every commit; with group commit that is one fsync per batch
+    conn.execute("PRAGMA synchronous=FULL")
+    conn.execute("PRAGMA busy_timeout=5000")
+    return conn
+
+
+class LeadStore:
+    """SQLite (WAL mode) lead store with a group-committing background writer.
+
+    `append` only enqueues and returns a future, so request handlers never
+    wait on disk. The writer thread drains the queue in batches of up to
+    `max_batch` records, lingering at most `max_delay` seconds for a batch to
+    fill, and commits each batch in one transaction.
+
+    Leads are deduplicated on the way in: a submission whose normalized email
+    and company match a lead seen within `dedup_window` seconds is merged into
+    that lead instead of becoming a new one (a window of 0 turns this off).
+    An in-memory Bloom filter answers "never seen" without touching disk, so
+    only likely repeats cost one primary-key read of the dedup index.
+    """
+
+    def __init__(
+        self,
+        path: str,
+        *,
+        max_batch: int = 256,
+        max_delay: float = 0.005,
+        max_queue: int = 100_000,
+        dedup_window: float = DEFAULT_DEDUP_WINDOW_DAYS * 86400,
+        dedup_capacity: int = DEFAULT_DEDUP_CAPACITY,
+    ) -> None:
+        self.path = path
+        self.max_batch = max_batch
+        self.max_delay = max_delay
+        self.dedup_window = dedup_window
+        self.dedup_capacity = dedup_capacity
+        self.stats = LeadStoreStats()
+        self._queue: queue.Queue[Optional[_PendingWrite]] = queue.Queue(maxsize=max_queue)
+        self._thread: Optional[threading.Thread] = None
+        self._lock = threading.Lock()
+        self._conn: Optional[sqlite3.Connection] = None
+        # Second connection for outbox bookkeeping so it never touches the
+        # writer thread's connection
+        self._aux_conn: Optional[sqlite3.Connection] = None
+        self._aux_lock = threading.Lock()
+        # Dedup state, all guarded by _dedup_lock. Keys of leads still in the
+        # write queue live in _pending_keys until their batch commits.
+        self._dedup_conn: Optional[sqlite3.Connection] = None
+        self._dedup_lock = threading.Lock()
+        self._bloom = BloomFilter(dedup_capacity)
+        self._pending_keys: dict[bytes, str] = {}
+        self._commit_listeners: List[Callable[[], None]] = []
+        # Held for each batch commit. Other writers to this file in the same
+        # process (the search indexer) take it too, so the writer queues on a
+        # lock instead of backing off in SQLite's sleeping busy handler.
+        self.write_lock = threading.Lock()
+
+    # Lifecycle
+
+    def start(self) -> None:
+        with self._lock:
+            if self._thread is not None:
+                return
+            os.makedirs(os.path.dirname(self.path) or ".", exist_ok=True)
+            self._conn = self._open_checked()
+            self._aux_conn = _connect(self.path)
+            self._dedup_conn = _connect(self.path)
+            if self.dedup_window > 0:
+                self._load_dedup_index()
+            self._thread = threading.Thread(target=self._run, name="lead-store-writer", daemon=True)
+            self._thread.start()
+
+    def close(self, timeout: float = 5.0) -> None:
+        """Flush queued writes, stop the writer and close the connection."""
+
+        with self._lock:
+            thread, self._thread = self._thread, None
+        if thread is None:
+            return
+        self._queue.put(None)
+        thread.join(timeout)
+        for conn in (self._conn, self._aux_conn, self._dedup_conn):
+            if conn is not None:
+                conn.close()
+        self._conn = self._aux_conn = self._dedup_conn = None
+
+    def add_commit_listener(self, listener: Callable[[], None]) -> None:
+        """Call `listener` on the writer thread after each committed batch; it must not block."""
+
+        self._commit_listeners.append(listener)
+
+    def _open_checked(self) -> sqlite3.Connection:
+        """Open the database, moving it aside if it fails an integrity check."""
+
+        conn: Optional[sqlite3.Connection] = None
+        try:
+            conn = _connect(self.path)
+            status = conn.execute("PRAGMA quick_check").fetchone()[0]
+        except sqlite3.DatabaseError as exc:
+            status = str(exc)
+        if status != "ok":
+            if conn is not None:
+                conn.close()
+            moved = f"{self.path}.corrupt-{int(time.time())}"
+            for suffix in ("", "-wal", "-shm"):
+                if os.path.exists(self.path + suffix):
+                    os.replace(self.path + suffix, moved + suffix)
+            logger.error("Lead store failed integrity check (%s), moved to %s", status, moved)
+            self.stats.recovered_from = moved
+            conn = _connect(self.path)
+        conn.executescript(SCHEMA)
+        # Cheap sampled statistics so the planner can choose between indexes
+        conn.execute("PRAGMA analysis_limit=1000")
+        conn.execute("ANALYZE")
+        return conn
+
+    # Dedup
+
+    def _load_dedup_index(self) -> None:
+        """Fill the Bloom filter with every key still inside the window.
+
+        Leads stored before the dedup index existed are indexed once here.
+        """
+
+        conn = self._dedup_conn
+        assert conn is not None
+        cutoff = time.time() - self.dedup_window
+        if not conn.execute("SELECT EXISTS (SELECT 1 FROM lead_dedup)").fetchone()[0]:
+            rows = conn.execute(
+                "SELECT lead_id, created_at, email, company FROM leads WHERE created_at >= ? ORDER BY created_at",
+                (cutoff,),
+            ).fetchall()
+            if rows:
+                conn.execute("BEGIN IMMEDIATE")
+                conn.executemany(
+                    UPSERT_DEDUP,
+                    [
+                        (dedup_key(LeadDetails(name="", email=email, company=company, phone="")), lead_id, at, at)
+                        for lead_id, at, email, company in rows
+                    ],
+                )
+                conn.execute("COMMIT")
+        with self._dedup_lock:
+            live = conn.execute("SELECT COUNT(*) FROM lead_dedup WHERE last_seen >= ?", (cutoff,)).fetchone()[0]
+            self._bloom = BloomFilter(max(self.dedup_capacity, live * 2))
+            keys = conn.execute("SELECT key FROM lead_dedup WHERE last_seen >= ?", (cutoff,)).fetchall()
+            self._bloom.add_many([key for (key,) in keys])
+
+    def _deduplicate(self, record: LeadRecord) -> None:
+        """Point a repeat submission at the lead it repeats, or register a new key."""
+
+        key = dedup_key(record.lead)
+        record.dedup_key = key
+        with self._dedup_lock:
+            existing = self._pending_keys.get(key)
+            if existing is None and key in self._bloom:
+                self.stats.index_reads += 1
+                assert self._dedup_conn is not None
+                row = self._dedup_conn.execute(
+                    "SELECT lead_id FROM lead_dedup WHERE key = ? AND last_seen >= ?",
+                    (key, record.created_at - self.dedup_window),
+                ).fetchone()
+                existing = row[0] if row else None
+            elif existing is None:
+                self.stats.bloom_skips += 1
+            if existing is not None:
+                record.lead_id = existing
+                record.merged = True
+                self.stats.deduplicated += 1
+                return
+            if self._bloom.full:
+                self._grow_bloom()
+            self._bloom.add(key)
+            self._pending_keys[key] = record.lead_id
+
+    def _grow_bloom(self) -> None:
+        """Rebuild the filter at twice the size once it holds more than it was sized for."""
+
+        assert self._dedup_conn is not None
+        bloom = BloomFilter(self._bloom.capacity * 2)
+        cutoff = time.time() - self.dedup_window
+        keys = self._dedup_conn.execute("SELECT key FROM lead_dedup WHERE last_seen >= ?", (cutoff,)).fetchall()
+        bloom.add_many([key for (key,) in keys] + list(self._pending_keys))
+        self._bloom = bloom
+
+    def _settle_keys(self, batch: List[_PendingWrite]) -> None:
+        with self._dedup_lock:
+            for pending in batch:
+                record = pending.record
+                if not record.merged and self._pending_keys.get(record.dedup_key) == record.lead_id:
+                    del self._pending_keys[record.dedup_key]
+
+    # Writes
+
+    def append(self, record: LeadRecord) -> Future:
+        """Queue a lead for the next group commit.
+
+        The returned future resolves once the batch holding the lead is
+        durable. Starts the writer on first use. A repeat of a recent lead is
+        merged into it, and `record.lead_id` is re-pointed at that lead.
+        """
+
+        if self._thread is None:
+            self.start()
+        if self.dedup_window > 0:
+            self._deduplicate(record)
+        pending = _PendingWrite(record)
+        try:
+            self._queue.put_nowait(pending)
+        except queue.Full as exc:
+            # The lead was never written, so a retry must not merge into it
+            self._settle_keys([pending])
+            raise LeadStoreError("Lead store write queue is full") from exc
+        self.stats.queued += 1
+        return pending.future
+
+    def _next_batch(self) -> tuple[List[_PendingWrite], bool]:
+        first = self._queue.get()
+        if first is None:
+            return [], True
+        batch = [first]
+        deadline = time.monotonic() + self.max_delay
+        while len(batch) < self.max_batch:
+            try:
+                item = self._queue.get(timeout=max(deadline - time.monotonic(), 0))
+            except queue.Empty:
+                break
+            if item is None:
+                return batch, True
+            batch.append(item)
+        return batch, False
+
+    def _commit(self, batch: List[_PendingWrite]) -> None:
+        with self.write_lock:
+            self._write_batch(batch)
+        for listener in self._commit_listeners:
+            listener()
+
+    def _write_batch(self, batch: List[_PendingWrite]) -> None:
+        conn = self._conn
+        assert conn is not None
+        try:
+            conn.execute("BEGIN IMMEDIATE")
+            self._insert_leads([p.record for p in batch if not p.record.merged])
+            touched = []
+            for p in batch:
+                if not p.record.merged:
+                    continue
+                if conn.execute(MERGE_LEAD, p.record.merge_row()).rowcount:
+                    touched.append((p.record.created_at, p.record.dedup_key))
+                else:
+                    # The lead this repeats was lost with a failed batch, so
+                    # the repeat becomes that lead
+                    self._insert_leads([p.record])
+            conn.executemany(TOUCH_DEDUP, touched)
+            conn.execute("COMMIT")
+        except Exception as exc:
+            if conn.in_transaction:
+                conn.execute("ROLLBACK")
+            self._settle_keys(batch)
+            self.stats.failed_batches += 1
+            logger.exception("Lead store batch of %d failed", len(batch))
+            for pending in batch:
+                pending.future.set_exception(exc)
+            return
+        self._settle_keys(batch)
+        self.stats.batches += 1
+        self.stats.written += len(batch)
+        self.stats.largest_batch = max(self.stats.largest_batch, len(batch))
+        for pending in batch:
+            pending.future.set_result(pending.record.lead_id)
+
+    def _insert_leads(self, records: List[LeadRecord]) -> None:
+        conn = self._conn
+        assert conn is not None
+        conn.executemany(INSERT_LEAD, [record.row() for record in records])
+        conn.executemany(
+            INSERT_OUTBOX,
+            [(record.lead_id, record.created_at, record.created_at) for record in records],
+        )
+        conn.executemany(
+            UPSERT_DEDUP,
+            [(r.dedup_key, r.lead_id, r.created_at, r.created_at) for r in records if r.dedup_key is not None],
+        )
+
+    def _run(self) -> None:
+        stopping = False
+        while not stopping:
+            batch, stopping = self._next_batch()
+            if batch:
+                self._commit(batch)
+        # Drain anything queued behind the stop marker
+        rest = []
+        while True:
+            try:
+                item = self._queue.get_nowait()
+            except queue.Empty:
+                break
+            if item is not None:
+                rest.append(item)
+        if rest:
+            self._commit(rest)
+
+    def queue_depth(self) -> int:
+        return self._queue.qsize()
+
+    def open_reader(self) -> sqlite3.Connection:
+        """A new read-only connection for long reads such as exports.
+
+        WAL lets it read alongside the writer; the caller closes it.
+        """
+
+        if self._thread is None:
+            self.start()
+        conn = sqlite3.connect(f"file:{self.path}?mode=ro", uri=True, check_same_thread=False)
+        conn.execute("PRAGMA busy_timeout=5000")
+        return conn
+
+    # Outbox
+
+    @contextmanager
+    def _outbox_transaction(self) -> Iterator[sqlite3.Connection]:
+        with self._aux_lock:
+            if self._aux_conn is None:
+                self.start()
+            conn = self._aux_conn
+            assert conn is not None
+            conn.execute("BEGIN IMMEDIATE")
+            try:
+                yield conn
+            except BaseException:
+                conn.execute("ROLLBACK")
+                raise
+            conn.execute("COMMIT")
+
+    def claim_outbox(self, limit: int, lease: float) -> List[OutboxItem]:
+        """Claim up to `limit` due deliveries for `lease` seconds."""
+
+        now = time.time()
+        with self._outbox_transaction() as conn:
+            claimed = conn.execute(CLAIM_OUTBOX, (now + lease, now, now, limit)).fetchall()
+            if not claimed:
+                return []
+            placeholders = ",".join("?" * len(claimed))
+            leads = {
+                row[0]: row[1:]
+                for row in conn.execute(
+                    f"SELECT lead_id, name, email, company, phone, notes, roi_json FROM leads WHERE lead_id IN ({placeholders})",
+                    [lead_id for lead_id, _, _ in claimed],
+                )
+            }
+        items = []
+        for lead_id, attempts, item_id in claimed:
+            name, email, company, phone, notes, roi_json = leads[lead_id]
+            items.append(
+                OutboxItem(
+                    lead_id=lead_id,
+                    attempts=attempts,
+                    item_id=item_id,
+                    lead=LeadDetails(name=name, email=email, company=company, phone=phone, notes=notes),
+                    roi=RoiCalculationResult.model_validate_json(roi_json),
+                )
+            )
+        return items
+
+    def _update_outbox(self, sql: str, params: tuple) -> None:
+        with self._outbox_transaction() as conn:
+            conn.execute(sql, params)
+
+    def mark_delivered(self, lead_id: str, item_id: str, update_id: Optional[str]) -> None:
+        self._update_outbox(
+            "UPDATE lead_outbox SET status = 'delivered', item_id = ?, update_id = ?, "
+            "attempts = attempts + 1, last_error = NULL, updated_at = ? WHERE lead_id = ?",
+            (item_id, update_id, time.time(), lead_id),
+        )
+
+    def mark_retry(self, lead_id: str, error: str, retry_at: float, item_id: Optional[str] = None) -> None:
+        """Record a failed attempt; a known item_id is kept so retries skip create_item."""
+
+        self._update_outbox(
+            "UPDATE lead_outbox SET status = 'pending', attempts = attempts + 1, next_attempt_at = ?, "
+            "item_id = COALESCE(?, item_id), last_error = ?, updated_at = ? WHERE lead_id = ?",
+            (retry_at, item_id, error, time.time(), lead_id),
+        )
+
+    def defer(self, lead_id: str, reason: str, retry_at: float, item_id: Optional[str] = None) -> None:
+        """Reschedule a delivery that was held back by rate limiting, without using an attempt."""
+
+        self._update_outbox(
+            "UPDATE lead_outbox SET status = 'pending', next_attempt_at = ?, "
+            "item_id = COALESCE(?, item_id), last_error = ?, updated_at = ? WHERE lead_id = ?",
+            (retry_at, item_id, reason, time.time(), lead_id),
+        )
+
+    def mark_dead(self, lead_id: str, error: str) -> None:
+        now = time.time()
+        with self._outbox_transaction() as conn:
+            conn.execute(
+                "UPDATE lead_outbox SET status = 'dead', attempts = attempts + 1, last_error = ?, "
+                "updated_at = ? WHERE lead_id = ?",
+                (error, now, lead_id),
+            )
+            conn.execute(
+                "INSERT OR REPLACE INTO lead_dead_letters (lead_id, failed_at, attempts, error) "
+                "SELECT lead_id, ?, attempts, ? FROM lead_outbox WHERE lead_id = ?",
+                (now, error, lead_id),
+            )
+
+    def outbox_counts(self) -> dict[str, int]:
+        with self._outbox_transaction() as conn:
+            rows = conn.execute("SELECT status, COUNT(*) FROM lead_outbox GROUP BY status").fetchall()
+        return dict(rows)
+
+
+_store: Optional[LeadStore] = None
+_store_lock = threading.Lock()
+
+
+def get_lead_store() -> LeadStore:
+    """Process-wide lead store, configured through LEAD_STORE_PATH and LEAD_DEDUP_WINDOW_DAYS."""
+
+    global _store
+    with _store_lock:
+        if _store is None:
+            _store = LeadStore(
+                os.environ.get("LEAD_STORE_PATH", DEFAULT_LEAD_STORE_PATH),
+                dedup_window=float(os.environ.get("LEAD_DEDUP_WINDOW_DAYS", DEFAULT_DEDUP_WINDOW_DAYS)) * 86400,
+            )
+        return _store
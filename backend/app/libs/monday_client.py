@@ -3,17 +3,44 @@ from __future__ import annotations
 import json
 import os
 from dataclasses import dataclass
-from typing import Any, Dict, Optional
+from typing import TYPE_CHECKING, Any, Dict, List, Optional, Sequence, Tuple
 
+import httpx
 import requests
 
 from app.libs.domain_model import RoiCalculationResult
 
+if TYPE_CHECKING:
+    from app.libs.monday_governor import MondayGovernor
+
 
 class MondayError(RuntimeError):
     """Raised when Monday.com responds with an error or configuration is missing."""
 
 
+class MondayPartialDeliveryError(MondayError):
+    """Raised when the item was created but adding its update failed.
+
+    Carries the new item id so a retry can resume without creating a duplicate.
+    """
+
+    def __init__(self, message: str, item_id: str) -> None:
+        super().__init__(message)
+        self.item_id = item_id
+
+
+class MondayRateLimitedError(MondayError):
+    """Raised when Monday.com, or our own governor, says to come back later.
+
+    This is back-pressure, not a failed delivery: callers should reschedule
+    the work after `retry_after` seconds without counting an attempt.
+    """
+
+    def __init__(self, message: str, retry_after: float) -> None:
+        super().__init__(message)
+        self.retry_after = retry_after
+
+
 @dataclass(slots=True)
 class LeadDetails:
     name: str
@@ -23,13 +50,62 @@ class LeadDetails:
     notes: Optional[str] = None
 
 
-class MondayClient:
-    """Tiny helper around the Monday.com GraphQL API."""
+@dataclass(slots=True)
+class LeadDeliveryResult:
+    """Outcome for one lead of a batch delivery.
+
+    `item_id` without `update_id` and with `error` set means the item exists
+    but its ROI update failed, so a retry should resume from the item.
+    `retry_after` is set when the lead was not attempted because of rate
+    limiting and should simply be sent again later.
+    """
+
+    lead: LeadDetails
+    item_id: Optional[str] = None
+    update_id: Optional[str] = None
+    error: Optional[str] = None
+    retry_after: Optional[float] = None
+
+
+class _MondayClientBase:
+    """Configuration and GraphQL documents shared by the sync and async clients.
+
+    Subclasses only provide the transport; building documents and mapping
+    responses back to leads happens here.
+    """
 
     API_URL = "https://api.monday.com/v2"
 
-    def __init__(self, *, api_token: Optional[str] = None) -> None:
+    # Aliased mutations per batched document before the first response tells
+    # us what a mutation actually costs, and the per-request complexity we aim
+    # to stay under once it does.
+    INITIAL_BATCH_SIZE = 10
+    MAX_BATCH_SIZE = 100
+    BATCH_COMPLEXITY_BUDGET = 1_000_000
+    # Cost assumed for a mutation until Monday has reported a real one
+    DEFAULT_MUTATION_COMPLEXITY = 30_000
+    COMPLEXITY_FIELDS = "complexity { query before after reset_in_x_seconds }"
+
+    ITEM_MUTATION = """
+        mutation ($boardId: ID!, $itemName: String!, $columnVals: JSON!) {
+            create_item(board_id: $boardId, item_name: $itemName, column_values: $columnVals) {
+                id
+            }
+            complexity { query before after reset_in_x_seconds }
+        }
+    """
+    UPDATE_MUTATION = """
+        mutation ($itemId: ID!, $body: String!) {
+            create_update(item_id: $itemId, body: $body) {
+                id
+            }
+            complexity { query before after reset_in_x_seconds }
+        }
+    """
+
+    def __init__(self, *, api_token: Optional[str] = None, api_url: Optional[str] = None) -> None:
         self.api_token = api_token or os.environ.get("MONDAY_API_TOKEN")
+        self.api_url = api_url or os.environ.get("MONDAY_API_URL", self.API_URL)
         
         # Load configuration from environment or fall back to defaults
         self.BOARD_ID = int(os.environ.get("MONDAY_BOARD_ID", "18384756296"))
@@ -38,66 +114,53 @@ class MondayClient:
         if not self.api_token:
             raise MondayError("MONDAY_API_TOKEN is not configured")
 
-    def create_lead_with_roi(self, lead: LeadDetails, roi: RoiCalculationResult) -> Dict[str, Any]:
-        """Creates a lead item and adds a formatted ROI summary update."""
+        # Learned from the complexity field of batched responses
+        self._mutation_complexity: Optional[float] = None
 
-        item_id = self._create_item(lead, roi)
-        update_id = self._create_update(item_id, lead, roi)
-        return {"item_id": item_id, "update_id": update_id}
+    @property
+    def _headers(self) -> Dict[str, str]:
+        return {
+            "Authorization": self.api_token,
+            "Content-Type": "application/json",
+        }
 
-    def _create_item(self, lead: LeadDetails, roi: RoiCalculationResult) -> str:
+    def _item_variables(self, lead: LeadDetails, roi: RoiCalculationResult) -> Tuple[str, str]:
         item_name = f"{lead.company} — {lead.name}"
         column_values = {
             self.ROI_COLUMN_ID: f"{roi.metrics.net_annual_savings:.0f}",
         }
-        mutation = """
-            mutation ($boardId: ID!, $itemName: String!, $columnVals: JSON!) {
-                create_item(board_id: $boardId, item_name: $itemName, column_values: $columnVals) {
-                    id
-                }
-            }
-        """
-        variables = {
+        return item_name, json.dumps(column_values)
+
+    def _item_request(self, lead: LeadDetails, roi: RoiCalculationResult) -> Tuple[str, Dict[str, Any]]:
+        item_name, column_values = self._item_variables(lead, roi)
+        return self.ITEM_MUTATION, {
             "boardId": self.BOARD_ID,
             "itemName": item_name,
-            "columnVals": json.dumps(column_values),
+            "columnVals": column_values,
         }
 
-        data = self._post(mutation, variables)
+    def _update_request(
+        self, item_id: str, lead: LeadDetails, roi: RoiCalculationResult
+    ) -> Tuple[str, Dict[str, Any]]:
+        return self.UPDATE_MUTATION, {
+            "itemId": item_id,
+            "body": self._format_update_body(lead, roi),
+        }
+
+    @staticmethod
+    def _item_id(data: Dict[str, Any]) -> str:
         item_data = data.get("create_item")
         if not item_data or "id" not in item_data:
             raise MondayError("Failed to parse Monday.com create_item response")
         return item_data["id"]
 
-    def _create_update(self, item_id: str, lead: LeadDetails, roi: RoiCalculationResult) -> Optional[str]:
-        summary = self._format_update_body(lead, roi)
-        mutation = """
-            mutation ($itemId: ID!, $body: String!) {
-                create_update(item_id: $itemId, body: $body) {
-                    id
-                }
-            }
-        """
-        variables = {
-            "itemId": item_id,
-            "body": summary,
-        }
-        data = self._post(mutation, variables)
+    @staticmethod
+    def _update_id(data: Dict[str, Any]) -> Optional[str]:
         update_data = data.get("create_update")
         return update_data.get("id") if update_data else None
 
-    def _post(self, query: str, variables: Dict[str, Any]) -> Dict[str, Any]:
-        response = requests.post(
-            self.API_URL,
-            json={"query": query, "variables": variables},
-            headers={
-                "Authorization": self.api_token,
-                "Content-Type": "application/json",
-            },
-            timeout=20,
-        )
-        response.raise_for_status()
-        payload = response.json()
+    @staticmethod
+    def _data(payload: Dict[str, Any]) -> Dict[str, Any]:
         errors = payload.get("errors")
         if errors:
             first_error = errors[0]
@@ -105,9 +168,176 @@ class MondayClient:
             raise MondayError(message)
         return payload.get("data", {})
 
+    @staticmethod
+    def _batch_results(
+        leads: Sequence[Tuple[LeadDetails, RoiCalculationResult]],
+        item_ids: Optional[Sequence[Optional[str]]],
+    ) -> List[LeadDeliveryResult]:
+        results = [LeadDeliveryResult(lead=lead) for lead, _ in leads]
+        if item_ids is not None:
+            for result, item_id in zip(results, item_ids):
+                result.item_id = item_id
+        return results
+
+    def _batch_size(self) -> int:
+        if not self._mutation_complexity:
+            return self.INITIAL_BATCH_SIZE
+        fits = int(self.BATCH_COMPLEXITY_BUDGET // self._mutation_complexity)
+        return max(1, min(fits, self.MAX_BATCH_SIZE))
+
+    def _item_batch_variables(
+        self,
+        leads: Sequence[Tuple[LeadDetails, RoiCalculationResult]],
+        results: List[LeadDeliveryResult],
+        indexes: List[int],
+    ) -> Dict[int, Tuple[str, str]]:
+        """Item name and column values per lead; a lead that cannot be rendered fails on its own."""
+
+        rendered = {}
+        for i in indexes:
+            try:
+                rendered[i] = self._item_variables(*leads[i])
+            except Exception as exc:
+                results[i].error = f"{type(exc).__name__}: {exc}"
+        return rendered
+
+    def _update_batch_bodies(
+        self,
+        leads: Sequence[Tuple[LeadDetails, RoiCalculationResult]],
+        results: List[LeadDeliveryResult],
+        indexes: List[int],
+    ) -> Dict[int, str]:
+        """Update body per lead; a lead that cannot be rendered fails on its own, keeping its item."""
+
+        rendered = {}
+        for i in indexes:
+            try:
+                rendered[i] = self._format_update_body(*leads[i])
+            except Exception as exc:
+                results[i].error = f"{type(exc).__name__}: {exc}"
+        return rendered
+
+    def _items_batch_request(self, items: Dict[int, Tuple[str, str]]) -> Tuple[str, Dict[str, Any]]:
+        params = ["$boardId: ID!"]
+        fields = []
+        variables: Dict[str, Any] = {"boardId": self.BOARD_ID}
+        for i, (item_name, column_values) in items.items():
+            params.append(f"$itemName{i}: String!, $columnVals{i}: JSON!")
+            fields.append(
+                f"i{i}: create_item(board_id: $boardId, item_name: $itemName{i}, column_values: $columnVals{i}) {{ id }}"
+            )
+            variables[f"itemName{i}"], variables[f"columnVals{i}"] = item_name, column_values
+        return self._batch_document(params, fields), variables
+
+    def _updates_batch_request(
+        self, results: List[LeadDeliveryResult], bodies: Dict[int, str]
+    ) -> Tuple[str, Dict[str, Any]]:
+        params = []
+        fields = []
+        variables: Dict[str, Any] = {}
+        for i, body in bodies.items():
+            params.append(f"$itemId{i}: ID!, $body{i}: String!")
+            fields.append(f"u{i}: create_update(item_id: $itemId{i}, body: $body{i}) {{ id }}")
+            variables[f"itemId{i}"] = results[i].item_id
+            variables[f"body{i}"] = body
+        return self._batch_document(params, fields), variables
+
+    @staticmethod
+    def _batch_document(params: List[str], fields: List[str]) -> str:
+        return f"mutation ({', '.join(params)}) {{ {' '.join(fields)} {_MondayClientBase.COMPLEXITY_FIELDS} }}"
+
+    def _apply_batch(
+        self,
+        payload: Dict[str, Any],
+        results: List[LeadDeliveryResult],
+        prefix: str,
+        indexes: List[int],
+    ) -> None:
+        """Attach the outcome of one aliased document to its leads.
+
+        Errors whose path names an alias go to that lead; errors without one
+        fail every lead in the document.
+        """
+
+        data = payload.get("data") or {}
+        for error in payload.get("errors") or []:
+            message = error.get("message", "Unknown Monday.com error")
+            path = error.get("path") or []
+            alias = path[0] if path else None
+            if isinstance(alias, str) and alias.startswith(prefix) and alias[len(prefix):].isdigit():
+                results[int(alias[len(prefix):])].error = message
+            else:
+                for i in indexes:
+                    results[i].error = results[i].error or message
+
+        complexity = (data.get("complexity") or {}).get("query")
+        if complexity:
+            self._mutation_complexity = complexity / len(indexes)
+
+        for i in indexes:
+            created = data.get(f"{prefix}{i}")
+            if prefix == "u":
+                if created:
+                    results[i].update_id = created.get("id")
+            elif created and "id" in created:
+                results[i].item_id = created["id"]
+            elif not results[i].error:
+                results[i].error = "Failed to parse Monday.com create_item response"
+
+    @staticmethod
+    def _fail_batch(results: List[LeadDeliveryResult], indexes: List[int], exc: Exception) -> None:
+        for i in indexes:
+            results[i].error = str(exc)
+            if isinstance(exc, MondayRateLimitedError):
+                results[i].retry_after = exc.retry_after
+
+    @staticmethod
+    def _fail_unsettled(results: List[LeadDeliveryResult], indexes: range, exc: Exception) -> None:
+        """Fail every lead in `indexes` that is not settled yet, keeping any item it already has."""
+
+        for i in indexes:
+            if results[i].error is None and results[i].update_id is None:
+                results[i].error = f"{type(exc).__name__}: {exc}"
+
+    @staticmethod
+    def _defer_remaining(results: List[LeadDeliveryResult], start: int, exc: MondayRateLimitedError) -> None:
+        """Mark every lead from `start` on that is not settled yet as deferred."""
+
+        for result in results[start:]:
+            if result.error is None and result.update_id is None:
+                result.error = str(exc)
+                result.retry_after = exc.retry_after
+
+    def _estimated_cost(self, mutations: int) -> float:
+        return (self._mutation_complexity or self.DEFAULT_MUTATION_COMPLEXITY) * mutations
+
+    @staticmethod
+    def _rate_limit_delay(payload: Dict[str, Any]) -> Optional[float]:
+        """Seconds to wait if the GraphQL errors report an exhausted budget."""
+
+        for error in payload.get("errors") or []:
+            extensions = error.get("extensions") or {}
+            if extensions.get("code") in {
+                "ComplexityException",
+                "COMPLEXITY_BUDGET_EXHAUSTED",
+                "RATE_LIMIT_EXCEEDED",
+            } or "retry_in_seconds" in extensions:
+                return float(extensions.get("retry_in_seconds") or 60)
+        return None
+
+    @staticmethod
+    def _pending_items(results: List[LeadDeliveryResult], indexes: range) -> List[int]:
+        return [i for i in indexes if results[i].item_id is None]
+
+    @staticmethod
+    def _pending_updates(results: List[LeadDeliveryResult], indexes: range) -> List[int]:
+        return [i for i in indexes if results[i].item_id and not results[i].error]
+
     @staticmethod
     def _format_update_body(lead: LeadDetails, roi: RoiCalculationResult) -> str:
         metrics = roi.metrics
+        # No payback when the tool costs at least what it saves
+        payback = "n/a" if metrics.payback_months is None else f"{metrics.payback_months:.1f} months"
         highlights = "\n".join(f"• {point}" for point in roi.narrative.highlights)
         return (
             f"Lead: {lead.name} — {lead.company}\n"
@@ -116,7 +346,261 @@ class MondayClient:
             f"Hours automated: {roi.inputs.hours_per_week:.0f}/week\n"
             f"Monthly savings: ${metrics.monthly_savings:,.0f}\n"
             f"Net annual savings: ${metrics.net_annual_savings:,.0f}\n"
-            f"Payback: {metrics.payback_months:.1f} months if applicable\n\n"
+            f"Payback: {payback}\n\n"
             f"Highlights:\n{highlights}\n"
             + (f"Notes: {lead.notes}\n" if lead.notes else "")
         )
+
+
+class MondayClient(_MondayClientBase):
+    """Tiny helper around the Monday.com GraphQL API."""
+
+    def create_lead_with_roi(
+        self,
+        lead: LeadDetails,
+        roi: RoiCalculationResult,
+        *,
+        item_id: Optional[str] = None,
+    ) -> Dict[str, Any]:
+        """Creates a lead item and adds a formatted ROI summary update.
+
+        Pass `item_id` to resume a delivery whose item already exists.
+        """
+
+        if item_id is None:
+            item_id = self._item_id(self._post(*self._item_request(lead, roi)))
+        try:
+            update_id = self._update_id(self._post(*self._update_request(item_id, lead, roi)))
+        except Exception as exc:
+            raise MondayPartialDeliveryError(str(exc), item_id) from exc
+        return {"item_id": item_id, "update_id": update_id}
+
+    def create_leads_with_roi(
+        self,
+        leads: Sequence[Tuple[LeadDetails, RoiCalculationResult]],
+        *,
+        item_ids: Optional[Sequence[Optional[str]]] = None,
+    ) -> List[LeadDeliveryResult]:
+        """Batch version of `create_lead_with_roi`.
+
+        Each chunk costs two round trips: one aliased document with every
+        create_item mutation, then one with every create_update. Errors are
+        mapped back to the lead whose alias they name, and a lead whose
+        mutation cannot even be rendered fails on its own, so one bad lead does
+        not fail the rest. Chunk sizes adapt to the complexity Monday reports.
+        `item_ids` resumes leads whose item already exists.
+        """
+
+        results = self._batch_results(leads, item_ids)
+        start = 0
+        while start < len(leads):
+            chunk = range(start, min(start + self._batch_size(), len(leads)))
+            try:
+                if items := self._item_batch_variables(leads, results, self._pending_items(results, chunk)):
+                    self._post_batch(self._items_batch_request(items), results, "i", list(items))
+                if bodies := self._update_batch_bodies(leads, results, self._pending_updates(results, chunk)):
+                    self._post_batch(self._updates_batch_request(results, bodies), results, "u", list(bodies))
+            except Exception as exc:
+                # Report the chunk's leads as failed rather than lose the items created so far
+                self._fail_unsettled(results, chunk, exc)
+            start = chunk.stop
+        return results
+
+    def _post_batch(
+        self,
+        request: Tuple[str, Dict[str, Any]],
+        results: List[LeadDeliveryResult],
+        prefix: str,
+        indexes: List[int],
+    ) -> None:
+        try:
+            payload = self._execute(*request)
+        except Exception as exc:
+            self._fail_batch(results, indexes, exc)
+            return
+        self._apply_batch(payload, results, prefix, indexes)
+
+    def _execute(self, query: str, variables: Dict[str, Any]) -> Dict[str, Any]:
+        """POST a GraphQL document and return the raw payload, errors included."""
+
+        response = requests.post(
+            self.api_url,
+            json={"query": query, "variables": variables},
+            headers=self._headers,
+            timeout=20,
+        )
+        response.raise_for_status()
+        return response.json()
+
+    def _post(self, query: str, variables: Dict[str, Any]) -> Dict[str, Any]:
+        return self._data(self._execute(query, variables))
+
+
+class AsyncMondayClient(_MondayClientBase):
+    """Async Monday.com client on one long-lived, pooled `httpx.AsyncClient`.
+
+    Connections are kept alive and reused across deliveries, so only the first
+    request pays for the TCP and TLS handshakes. HTTP/2 is used when asked for
+    and the `h2` package is installed. Create it once, e.g. in the app
+    lifespan, and `aclose()` it on shutdown.
+
+    With a `MondayGovernor` every request is paced against the complexity
+    budget and the circuit breaker. Rate limiting then surfaces as
+    `MondayRateLimitedError`, or as `retry_after` on batch results, instead of
+    as a failure.
+    """
+
+    def __init__(
+        self,
+        *,
+        api_token: Optional[str] = None,
+        api_url: Optional[str] = None,
+        http2: Optional[bool] = None,
+        limits: Optional[httpx.Limits] = None,
+        timeout: float = 20.0,
+        transport: Optional[httpx.AsyncBaseTransport] = None,
+        governor: Optional[MondayGovernor] = None,
+    ) -> None:
+        super().__init__(api_token=api_token, api_url=api_url)
+        self.governor = governor
+        if http2 is None:
+            http2 = os.environ.get("MONDAY_HTTP2", "1") != "0"
+        if limits is None:
+            limits = httpx.Limits(
+                max_connections=int(os.environ.get("MONDAY_MAX_CONNECTIONS", "10")),
+                max_keepalive_connections=int(os.environ.get("MONDAY_MAX_KEEPALIVE", "10")),
+                keepalive_expiry=float(os.environ.get("MONDAY_KEEPALIVE_EXPIRY", "60")),
+            )
+        self.http2 = http2 and _h2_available()
+        self._http = httpx.AsyncClient(
+            headers=self._headers,
+            http2=self.http2,
+            limits=limits,
+            timeout=timeout,
+            transport=transport,
+        )
+
+    async def aclose(self) -> None:
+        await self._http.aclose()
+
+    async def __aenter__(self) -> "AsyncMondayClient":
+        return self
+
+    async def __aexit__(self, *exc_info: Any) -> None:
+        await self.aclose()
+
+    async def create_lead_with_roi(
+        self,
+        lead: LeadDetails,
+        roi: RoiCalculationResult,
+        *,
+        item_id: Optional[str] = None,
+    ) -> Dict[str, Any]:
+        """Async version of `MondayClient.create_lead_with_roi`."""
+
+        if item_id is None:
+            item_id = self._item_id(await self._post(*self._item_request(lead, roi)))
+        try:
+            update_id = self._update_id(await self._post(*self._update_request(item_id, lead, roi)))
+        except Exception as exc:
+            raise MondayPartialDeliveryError(str(exc), item_id) from exc
+        return {"item_id": item_id, "update_id": update_id}
+
+    async def create_leads_with_roi(
+        self,
+        leads: Sequence[Tuple[LeadDetails, RoiCalculationResult]],
+        *,
+        item_ids: Optional[Sequence[Optional[str]]] = None,
+    ) -> List[LeadDeliveryResult]:
+        """Async version of `MondayClient.create_leads_with_roi`."""
+
+        results = self._batch_results(leads, item_ids)
+        start = 0
+        while start < len(leads):
+            chunk = range(start, min(start + self._batch_size(), len(leads)))
+            try:
+                if items := self._item_batch_variables(leads, results, self._pending_items(results, chunk)):
+                    await self._post_batch(self._items_batch_request(items), results, "i", list(items))
+                if bodies := self._update_batch_bodies(leads, results, self._pending_updates(results, chunk)):
+                    await self._post_batch(self._updates_batch_request(results, bodies), results, "u", list(bodies))
+            except MondayRateLimitedError as exc:
+                # Everything not yet sent waits for the budget to come back
+                self._defer_remaining(results, chunk.start, exc)
+                break
+            except Exception as exc:
+                # Report the chunk's leads as failed rather than lose the items created so far
+                self._fail_unsettled(results, chunk, exc)
+            start = chunk.stop
+        return results
+
+    async def _post_batch(
+        self,
+        request: Tuple[str, Dict[str, Any]],
+        results: List[LeadDeliveryResult],
+        prefix: str,
+        indexes: List[int],
+    ) -> None:
+        """Send one aliased document; only rate limiting propagates."""
+
+        try:
+            payload = await self._execute(*request, mutations=len(indexes))
+        except MondayRateLimitedError as exc:
+            self._fail_batch(results, indexes, exc)
+            raise
+        except Exception as exc:
+            self._fail_batch(results, indexes, exc)
+            return
+        self._apply_batch(payload, results, prefix, indexes)
+
+    async def _execute(self, query: str, variables: Dict[str, Any], *, mutations: int = 1) -> Dict[str, Any]:
+        governor = self.governor
+        if governor is not None:
+            await governor.acquire(self._estimated_cost(mutations))
+        if governor is None:
+            response = await self._http.post(self.api_url, json={"query": query, "variables": variables})
+            response.raise_for_status()
+            return response.json()
+
+        try:
+            response = await self._http.post(self.api_url, json={"query": query, "variables": variables})
+        except httpx.TransportError:
+            governor.record_server_error()
+            raise
+        except BaseException:
+            governor.release_probe()
+            raise
+        if response.status_code == 429:
+            retry_after = _retry_after_seconds(response.headers.get("Retry-After"))
+            governor.record_rate_limited(retry_after)
+            raise MondayRateLimitedError("Monday.com rate limit exceeded", retry_after or governor.cooldown)
+        if response.status_code >= 500:
+            governor.record_server_error()
+        elif response.is_error:
+            # Monday is up, this request was just bad
+            governor.record_success(None)
+        response.raise_for_status()
+        payload = response.json()
+        retry_after = self._rate_limit_delay(payload)
+        if retry_after is not None:
+            governor.record_rate_limited(retry_after)
+            raise MondayRateLimitedError("Monday.com complexity budget exhausted", retry_after)
+        governor.record_success((payload.get("data") or {}).get("complexity"))
+        return payload
+
+    async def _post(self, query: str, variables: Dict[str, Any]) -> Dict[str, Any]:
+        return self._data(await self._execute(query, variables))
+
+
+def _retry_after_seconds(value: Optional[str]) -> Optional[float]:
+    try:
+        return max(float(value), 0.0) if value else None
+    except ValueError:
+        return None
+
+
+def _h2_available() -> bool:
+    try:
+        import h2  # noqa: F401
+    except ImportError:
+        return False
+    return True
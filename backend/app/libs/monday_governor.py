@@ -0,0 +1,199 @@
+from __future__ import annotations
+
+import asyncio
+import os
+import time
+from typing import Any, Callable, Dict, Literal, Optional
+
+from pydantic import BaseModel
+
+from app.libs.monday_client import MondayRateLimitedError
+
+BreakerState = Literal["closed", "open", "half_open"]
+
+
+class MondayGovernorStats(BaseModel):
+    """Pacing, complexity budget and circuit breaker state for Monday.com calls."""
+
+    budget_per_minute: int
+    tokens_available: float
+    budget_remaining: Optional[int] = None
+    budget_resets_in: Optional[float] = None
+    last_query_complexity: Optional[int] = None
+    complexity_used: int
+    requests: int
+    paced_requests: int
+    paced_seconds: float
+    deferred_requests: int
+    rate_limited: int
+    server_errors: int
+    breaker_state: BreakerState
+    breaker_opens: int
+    breaker_retry_in: float
+
+
+class MondayGovernor:
+    """Client-side pacing for Monday.com's per-minute complexity budget.
+
+    A token bucket holds complexity points and refills at the per-minute
+    budget. Each request waits for its estimated cost before it is sent, and
+    the bucket is pulled down whenever Monday reports less budget left than we
+    think we have. Waits longer than `max_wait` are not slept through; they
+    raise `MondayRateLimitedError` so queued work is rescheduled instead.
+
+    Repeated 429/5xx responses open a circuit breaker. While it is open every
+    request is deferred. After the cooldown a single probe goes through, and
+    its outcome closes or reopens the breaker.
+    """
+
+    def __init__(
+        self,
+        *,
+        budget_per_minute: Optional[int] = None,
+        failure_threshold: int = 5,
+        cooldown: float = 30.0,
+        max_wait: float = 10.0,
+        clock: Callable[[], float] = time.monotonic,
+    ) -> None:
+        if budget_per_minute is None:
+            budget_per_minute = int(os.environ.get("MONDAY_COMPLEXITY_PER_MINUTE", "10000000"))
+        self.budget_per_minute = budget_per_minute
+        self.failure_threshold = failure_threshold
+        self.cooldown = cooldown
+        self.max_wait = max_wait
+        self._clock = clock
+        self._rate = budget_per_minute / 60.0
+        self._tokens = float(budget_per_minute)
+        self._refilled_at = clock()
+        self._lock = asyncio.Lock()
+
+        self._budget_remaining: Optional[int] = None
+        self._budget_resets_at: Optional[float] = None
+        self._last_query_complexity: Optional[int] = None
+        self._complexity_used = 0
+
+        self._failures = 0
+        self._state: BreakerState = "closed"
+        self._open_until = 0.0
+        self._probing = False
+
+        self.requests = 0
+        self.paced_requests = 0
+        self.paced_seconds = 0.0
+        self.deferred_requests = 0
+        self.rate_limited = 0
+        self.server_errors = 0
+        self.breaker_opens = 0
+
+    async def acquire(self, cost: float) -> None:
+        """Wait until `cost` complexity points may be spent, or defer the request."""
+
+        self._check_breaker()
+        cost = min(cost, self.budget_per_minute)
+        try:
+            async with self._lock:
+                self._refill()
+                wait = (cost - self._tokens) / self._rate if self._tokens < cost else 0.0
+                if wait > self.max_wait:
+                    self.deferred_requests += 1
+                    raise MondayRateLimitedError("Monday.com complexity budget is exhausted", wait)
+                if wait > 0:
+                    self.paced_requests += 1
+                    self.paced_seconds += wait
+                    await asyncio.sleep(wait)
+                    self._refill()
+                self._tokens -= cost
+                self.requests += 1
+        except BaseException:
+            self.release_probe()
+            raise
+
+    def record_success(self, complexity: Optional[Dict[str, Any]]) -> None:
+        """Feed back a successful response and the complexity block it reported."""
+
+        self._failures = 0
+        if self._state != "closed":
+            self._state = "closed"
+            self._probing = False
+        if not complexity:
+            return
+        if complexity.get("query") is not None:
+            self._last_query_complexity = int(complexity["query"])
+            self._complexity_used += self._last_query_complexity
+        if complexity.get("after") is not None:
+            self._budget_remaining = int(complexity["after"])
+            self._refill()
+            self._tokens = min(self._tokens, float(self._budget_remaining))
+        if complexity.get("reset_in_x_seconds") is not None:
+            self._budget_resets_at = self._clock() + float(complexity["reset_in_x_seconds"])
+
+    def record_rate_limited(self, retry_after: Optional[float]) -> None:
+        """Monday refused the request for rate or budget reasons."""
+
+        self.rate_limited += 1
+        if retry_after:
+            # Nothing more can be spent until Monday says the budget is back
+            self._refill()
+            self._tokens = min(self._tokens, -retry_after * self._rate)
+            self._budget_resets_at = self._clock() + retry_after
+        self._record_failure(retry_after)
+
+    def record_server_error(self) -> None:
+        self.server_errors += 1
+        self._record_failure(None)
+
+    def stats(self) -> MondayGovernorStats:
+        self._refill()
+        now = self._clock()
+        return MondayGovernorStats(
+            budget_per_minute=self.budget_per_minute,
+            tokens_available=round(self._tokens, 1),
+            budget_remaining=self._budget_remaining,
+            budget_resets_in=(
+                max(self._budget_resets_at - now, 0.0) if self._budget_resets_at is not None else None
+            ),
+            last_query_complexity=self._last_query_complexity,
+            complexity_used=self._complexity_used,
+            requests=self.requests,
+            paced_requests=self.paced_requests,
+            paced_seconds=round(self.paced_seconds, 3),
+            deferred_requests=self.deferred_requests,
+            rate_limited=self.rate_limited,
+            server_errors=self.server_errors,
+            breaker_state=self._state,
+            breaker_opens=self.breaker_opens,
+            breaker_retry_in=max(self._open_until - now, 0.0) if self._state == "open" else 0.0,
+        )
+
+    def _refill(self) -> None:
+        now = self._clock()
+        self._tokens = min(self._tokens + (now - self._refilled_at) * self._rate, float(self.budget_per_minute))
+        self._refilled_at = now
+
+    def _check_breaker(self) -> None:
+        if self._state == "closed":
+            return
+        now = self._clock()
+        if self._state == "open":
+            if now < self._open_until:
+                self.deferred_requests += 1
+                raise MondayRateLimitedError("Monday.com circuit breaker is open", self._open_until - now)
+            self._state = "half_open"
+        if self._probing:
+            self.deferred_requests += 1
+            raise MondayRateLimitedError("Monday.com circuit breaker is probing", self.cooldown)
+        self._probing = True
+
+    def release_probe(self) -> None:
+        """Let another request probe if this one ended without an outcome."""
+
+        if self._state == "half_open":
+            self._probing = False
+
+    def _record_failure(self, retry_after: Optional[float]) -> None:
+        self._failures += 1
+        if self._state == "half_open" or self._failures >= self.failure_threshold:
+            self._state = "open"
+            self._probing = False
+            self._open_until = self._clock() + max(self.cooldown, retry_after or 0.0)
+            self.breaker_opens += 1
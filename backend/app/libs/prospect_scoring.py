@@ -0,0 +1,151 @@
+from __future__ import annotations
+
+import csv
+import io
+import json
+from itertools import islice
+from typing import IO, Dict, Iterator, List, Literal, Optional, Tuple
+
+import numpy as np
+
+from app.libs.roi_calculator import calculate_roi_batch, valid_input_mask
+
+# Rows are parsed and scored this many at a time, which keeps memory flat
+# regardless of how large the uploaded file is.
+DEFAULT_CHUNK_ROWS = 2000
+
+INPUT_COLUMNS = ("hours_per_week", "labor_rate", "tool_cost", "industry")
+METRIC_COLUMNS = (
+    "profile",
+    "annual_labor_cost",
+    "annual_savings_low",
+    "annual_savings_expected",
+    "annual_savings_high",
+    "monthly_savings",
+    "annual_tool_cost",
+    "net_annual_savings",
+    "payback_months",
+    "error",
+)
+
+OutputFormat = Literal["ndjson", "csv"]
+
+
+class ProspectCsvError(ValueError):
+    """Raised when the uploaded CSV is missing required columns."""
+
+
+def _parse_float(value: str | None) -> float:
+    try:
+        return float(value) if value not in (None, "") else np.nan
+    except ValueError:
+        return np.nan
+
+
+def _score_chunk(rows: List[Dict[str, str]]) -> List[Dict[str, object]]:
+    hours = np.array([_parse_float(row.get("hours_per_week")) for row in rows])
+    rate = np.array([_parse_float(row.get("labor_rate")) for row in rows])
+    tool = np.array([_parse_float(row.get("tool_cost")) for row in rows])
+    industries = [(row.get("industry") or "general").strip() for row in rows]
+
+    valid = valid_input_mask(hours, rate, tool)
+    valid_rows = np.flatnonzero(valid)
+    batch = calculate_roi_batch(
+        hours[valid_rows],
+        rate[valid_rows],
+        tool[valid_rows],
+        [industries[i] for i in valid_rows.tolist()],
+    )
+
+    # Surplus cells on ragged rows land under the None key, drop them
+    scored: List[Dict[str, object]] = [
+        {**{k: v for k, v in row.items() if k is not None}, **dict.fromkeys(METRIC_COLUMNS)}
+        for row in rows
+    ]
+    for position, row_index in enumerate(valid_rows.tolist()):
+        payback = float(batch.payback_months[position])
+        scored[row_index].update(
+            profile=batch.profile_keys[position],
+            annual_labor_cost=float(batch.annual_labor_cost[position]),
+            annual_savings_low=float(batch.annual_savings_low[position]),
+            annual_savings_expected=float(batch.annual_savings_expected[position]),
+            annual_savings_high=float(batch.annual_savings_high[position]),
+            monthly_savings=float(batch.monthly_savings[position]),
+            annual_tool_cost=float(batch.annual_tool_cost[position]),
+            net_annual_savings=float(batch.net_annual_savings[position]),
+            payback_months=None if np.isnan(payback) else payback,
+        )
+    for row_index in np.flatnonzero(~valid).tolist():
+        scored[row_index]["error"] = "Missing or out-of-range calculator input"
+    return scored
+
+
+def open_prospect_csv(source: IO[str]) -> csv.DictReader:
+    """Return a reader over `source` after checking the required columns."""
+
+    reader = csv.DictReader(source)
+    fieldnames = [name.strip() for name in reader.fieldnames or []]
+    missing = [column for column in INPUT_COLUMNS[:3] if column not in fieldnames]
+    if missing:
+        raise ProspectCsvError(f"CSV is missing required columns: {', '.join(missing)}")
+    reader.fieldnames = fieldnames
+    return reader
+
+
+def _read_chunk(reader: csv.DictReader, chunk_rows: int) -> Tuple[List[Dict[str, str]], Optional[str]]:
+    """Read up to `chunk_rows` rows; on unreadable input, the rows before it and the error."""
+
+    rows: List[Dict[str, str]] = []
+    try:
+        # Row by row, so the rows read before an error are kept
+        for row in islice(reader, chunk_rows):
+            rows.append(row)  # noqa: PERF402
+    except (UnicodeDecodeError, csv.Error) as exc:
+        return rows, f"CSV could not be read after line {reader.line_num}: {exc}"
+    return rows, None
+
+
+def score_prospect_rows(
+    reader: csv.DictReader,
+    output_format: OutputFormat = "ndjson",
+    *,
+    chunk_rows: int = DEFAULT_CHUNK_ROWS,
+) -> Iterator[str]:
+    """Score prospect rows chunk by chunk, yielding NDJSON or CSV text.
+
+    Only `chunk_rows` rows are held in memory at a time. Extra columns in the
+    source (company, email, ...) are passed through untouched. Rows with bad
+    inputs are emitted with an `error` value instead of aborting the stream.
+    If the file turns out to be unreadable partway (bad UTF-8, malformed
+    CSV), the stream ends with a record holding only `error`, since the
+    response status has already gone out.
+    """
+
+    fieldnames = list(reader.fieldnames or [])
+    csv_columns = fieldnames + [column for column in METRIC_COLUMNS if column not in fieldnames]
+    buffer = io.StringIO()
+    writer = csv.DictWriter(buffer, fieldnames=csv_columns, extrasaction="ignore")
+    if output_format == "csv":
+        writer.writeheader()
+
+    while True:
+        rows, error = _read_chunk(reader, chunk_rows)
+        if rows:
+            scored = _score_chunk(rows)
+            if output_format == "csv":
+                writer.writerows(scored)
+            else:
+                buffer.writelines(json.dumps(row) + "\n" for row in scored)
+        if error is not None:
+            if output_format == "csv":
+                writer.writerow({"error": error})
+            else:
+                buffer.write(json.dumps({"error": error}) + "\n")
+        if not rows or error is not None:
+            break
+        yield buffer.getvalue()
+        buffer.seek(0)
+        buffer.truncate()
+
+    if buffer.tell():
+        yield buffer.getvalue()
@@ -0,0 +1,153 @@
+from __future__ import annotations
+
+import hashlib
+import math
+import os
+import threading
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Tuple
+
+from pydantic import BaseModel
+
+from app.libs.domain_model import RoiInputs
+from app.libs.roi_calculator import INDUSTRY_PROFILES, compute_roi, profiles_version
+
+CacheKey = Tuple[float, float, float, str]
+
+# Slider steps used by the calculator UI. GET requests are snapped to this grid
+# so the CDN sees a small, repeatable set of URLs.
+SNAP_HOURS_PER_WEEK = 1.0
+SNAP_LABOR_RATE = 5.0
+SNAP_TOOL_COST = 50.0
+
+
+@dataclass(slots=True, frozen=True)
+class CachedRoiResult:
+    body: bytes
+    etag: str
+
+
+class RoiCacheStats(BaseModel):
+    """Counters describing how well the ROI result cache is doing."""
+
+    profiles_version: str
+    size: int
+    maxsize: int
+    hits: int
+    misses: int
+    evictions: int
+    invalidations: int
+
+
+def cache_key(payload: RoiInputs) -> CacheKey:
+    """Canonical cache key for a set of calculator inputs.
+
+    Adding 0.0 folds -0.0 into 0.0. Python already hashes the two equally, so
+    results are computed from the canonical values to keep "-0" out of the
+    narrative of a shared entry.
+    """
+
+    return (
+        payload.hours_per_week + 0.0,
+        payload.labor_rate + 0.0,
+        payload.tool_cost + 0.0,
+        payload.industry,
+    )
+
+
+def _snap(value: float, step: float) -> float:
+    # Round half up rather than to even so 2.5 and 3.5 snap the same direction
+    return math.floor(value / step + 0.5) * step + 0.0
+
+
+def snap_inputs(hours_per_week: float, labor_rate: float, tool_cost: float, industry: str) -> RoiInputs:
+    """Build `RoiInputs` snapped to the UI slider grid.
+
+    Industry codes are lower-cased and unknown codes map to "general", which is
+    the profile `calculate_roi` would fall back to anyway. Raises
+    pydantic.ValidationError when a snapped value is out of bounds.
+    """
+
+    industry = industry.strip().lower()
+    return RoiInputs(
+        hours_per_week=_snap(hours_per_week, SNAP_HOURS_PER_WEEK),
+        labor_rate=_snap(labor_rate, SNAP_LABOR_RATE),
+        tool_cost=_snap(tool_cost, SNAP_TOOL_COST),
+        industry=industry if industry in INDUSTRY_PROFILES else "general",
+    )
+
+
+class RoiResultCache:
+    """Bounded LRU cache of serialized `RoiCalculationResult` JSON and its ETag.
+
+    Entries belong to one version of `INDUSTRY_PROFILES`; when the table
+    changes the whole cache is dropped before the next lookup.
+    """
+
+    def __init__(self, maxsize: int = 4096) -> None:
+        self.maxsize = maxsize
+        self._entries: OrderedDict[CacheKey, CachedRoiResult] = OrderedDict()
+        self._lock = threading.Lock()
+        self._version = profiles_version()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.invalidations = 0
+
+    def _check_version(self) -> None:
+        version = profiles_version()
+        if version != self._version:
+            self._entries.clear()
+            self._version = version
+            self.invalidations += 1
+
+    def lookup(self, payload: RoiInputs) -> CachedRoiResult:
+        """Return the serialized result for `payload`, computing it on a miss."""
+
+        key = cache_key(payload)
+        with self._lock:
+            self._check_version()
+            version = self._version
+            entry = self._entries.get(key)
+            if entry is not None:
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return entry
+            self.misses += 1
+
+        body = compute_roi(*key).to_json()
+        digest = hashlib.sha256(body).hexdigest()[:16]
+        entry = CachedRoiResult(body=body, etag=f'"{version}-{digest}"')
+
+        with self._lock:
+            if version == self._version:
+                self._entries[key] = entry
+                self._entries.move_to_end(key)
+                while len(self._entries) > self.maxsize:
+                    self._entries.popitem(last=False)
+                    self.evictions += 1
+        return entry
+
+    def get_json(self, payload: RoiInputs) -> bytes:
+        return self.lookup(payload).body
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+
+    def stats(self) -> RoiCacheStats:
+        with self._lock:
+            self._check_version()
+            return RoiCacheStats(
+                profiles_version=self._version,
+                size=len(self._entries),
+                maxsize=self.maxsize,
+                hits=self.hits,
+                misses=self.misses,
+                evictions=self.evictions,
+                invalidations=self.invalidations,
+            )
+
+
+roi_result_cache = RoiResultCache(maxsize=int(os.environ.get("ROI_CACHE_SIZE", "4096")))
@@ -1,14 +1,19 @@
 from __future__ import annotations
 
-from typing import Dict
+import hashlib
+import json
+from dataclasses import dataclass
+from functools import lru_cache
+from typing import Dict, Optional, Sequence, Tuple
+
+import numpy as np
+import pydantic_core
 
 from app.libs.domain_model import (
     IndustryProfile,
     RoiCalculationResult,
-    RoiChartBar,
     RoiInputs,
     RoiMetrics,
-    RoiNarrative,
 )
 
 # Baseline industry assumptions. Rates represent the share of labor hours than can
@@ -52,40 +57,162 @@ INDUSTRY_PROFILES: Dict[str, IndustryProfile] = {
 }
 
 
-def _build_chart(annual_labor_cost: float, automated_cost: float) -> list[RoiChartBar]:
-    return [
-        RoiChartBar(name="Current Cost", annual=annual_labor_cost),
-        RoiChartBar(name="Automated Cost", annual=max(automated_cost, 0)),
-    ]
+ProfileSnapshot = Tuple[Tuple[str, str, str, float, float, str | None], ...]
 
 
-def calculate_roi(payload: RoiInputs) -> RoiCalculationResult:
-    profile = INDUSTRY_PROFILES.get(payload.industry, INDUSTRY_PROFILES["general"])
-    hours_per_year = payload.hours_per_week * 52
-    annual_labor_cost = hours_per_year * payload.labor_rate
+def _profiles_snapshot() -> ProfileSnapshot:
+    return tuple(
+        (key, p.key, p.label, p.savings_rate, p.variance, p.description)
+        for key, p in INDUSTRY_PROFILES.items()
+    )
+
+
+@lru_cache(maxsize=8)
+def _hash_snapshot(snapshot: ProfileSnapshot) -> str:
+    return hashlib.sha256(json.dumps(snapshot).encode()).hexdigest()[:16]
+
+
+def profiles_version() -> str:
+    """Short content hash of `INDUSTRY_PROFILES`.
+
+    Any edit to the assumption table, including in-place changes to a profile,
+    produces a new version. Callers use it to key caches and ETags.
+    """
+
+    return _hash_snapshot(_profiles_snapshot())
+
+
+@dataclass(slots=True)
+class RoiComputation:
+    """Plain-float result of the ROI formulas for one set of inputs.
+
+    This is what library and batch callers should use; it holds no pydantic
+    models. `to_json` serializes the API payload straight from these floats
+    without building any models. `to_result` builds the models in a single
+    validation call over plain data. In pydantic 2 that is cheaper than
+    model_construct, which runs in Python, or one constructor per nested
+    model.
+    """
+
+    profile: IndustryProfile
+    hours_per_week: float
+    labor_rate: float
+    tool_cost: float
+    industry: str
+    annual_labor_cost: float
+    annual_savings_low: float
+    annual_savings_expected: float
+    annual_savings_high: float
+    monthly_savings: float
+    annual_tool_cost: float
+    net_annual_savings: float
+    payback_months: Optional[float]
+    automated_cost: float
+
+    def metrics_dict(self) -> Dict[str, Optional[float]]:
+        return {
+            "annual_labor_cost": self.annual_labor_cost,
+            "annual_savings_low": self.annual_savings_low,
+            "annual_savings_expected": self.annual_savings_expected,
+            "annual_savings_high": self.annual_savings_high,
+            "monthly_savings": self.monthly_savings,
+            "annual_tool_cost": self.annual_tool_cost,
+            "net_annual_savings": self.net_annual_savings,
+            "payback_months": self.payback_months,
+        }
+
+    def highlights(self) -> list[str]:
+        payback_months = self.payback_months
+        return [
+            f"Automating {self.hours_per_week:.0f} hrs/week in {self.profile.label} unlocks ${self.monthly_savings:,.0f}/month",
+            f"Payback expected in {payback_months:.1f} months" if payback_months else "Savings offset the investment immediately",
+            f"Annual tool spend assumed at ${self.annual_tool_cost:,.0f}",
+        ]
+
+    def inputs_dict(self) -> Dict[str, float | str]:
+        return {
+            "hours_per_week": self.hours_per_week,
+            "labor_rate": self.labor_rate,
+            "tool_cost": self.tool_cost,
+            "industry": self.industry,
+        }
+
+    def headline(self) -> str:
+        return f"${self.net_annual_savings:,.0f} in net savings within year one"
+
+    def metrics(self) -> RoiMetrics:
+        return RoiMetrics.model_validate(self.metrics_dict())
+
+    def chart(self) -> list[Dict[str, object]]:
+        return [
+            {"name": "Current Cost", "annual": self.annual_labor_cost},
+            {"name": "Automated Cost", "annual": max(self.automated_cost, 0.0)},
+        ]
+
+    def to_result(self, inputs: Optional[RoiInputs] = None) -> RoiCalculationResult:
+        """Build the API payload, reusing `inputs` when the caller already has it."""
+
+        return RoiCalculationResult.model_validate(
+            {
+                "profile": self.profile,
+                "inputs": inputs or self.inputs_dict(),
+                "metrics": self.metrics_dict(),
+                "chart": self.chart(),
+                "narrative": {"headline": self.headline(), "highlights": self.highlights()},
+            }
+        )
+
+    def to_json(self) -> bytes:
+        """The same bytes as `to_result().model_dump_json()`, serialized without building the models."""
+
+        return pydantic_core.to_json(
+            {
+                "profile": _profile_dict(self.profile),
+                "inputs": self.inputs_dict(),
+                "metrics": self.metrics_dict(),
+                "chart": self.chart(),
+                "narrative": {"headline": self.headline(), "highlights": self.highlights()},
+            }
+        )
+
+
+def _profile_dict(profile: IndustryProfile) -> Dict[str, object]:
+    return {
+        "key": profile.key,
+        "label": profile.label,
+        "savings_rate": profile.savings_rate,
+        "variance": profile.variance,
+        "description": profile.description,
+    }
+
+
+def compute_roi(hours_per_week: float, labor_rate: float, tool_cost: float, industry: str) -> RoiComputation:
+    """Run the ROI formulas on already validated inputs."""
+
+    # to_json skips validation, so make every number a float as RoiInputs would
+    hours_per_week = float(hours_per_week)
+    labor_rate = float(labor_rate)
+    tool_cost = float(tool_cost)
+    profile = INDUSTRY_PROFILES.get(industry, INDUSTRY_PROFILES["general"])
+    hours_per_year = hours_per_week * 52
+    annual_labor_cost = hours_per_year * labor_rate
     savings_expected = annual_labor_cost * profile.savings_rate
     savings_low = annual_labor_cost * max(profile.savings_rate - profile.variance, 0)
     savings_high = annual_labor_cost * min(profile.savings_rate + profile.variance, 0.95)
     monthly_savings = savings_expected / 12
-    annual_tool_cost = payload.tool_cost * 12
+    annual_tool_cost = tool_cost * 12
     net_annual_savings = savings_expected - annual_tool_cost
-    net_monthly_savings = monthly_savings - payload.tool_cost
+    net_monthly_savings = monthly_savings - tool_cost
     payback_months = None
     if net_monthly_savings > 0:
-        payback_months = payload.tool_cost / net_monthly_savings
+        payback_months = tool_cost / net_monthly_savings
 
-    automated_cost = annual_labor_cost - savings_expected + annual_tool_cost
-
-    narrative = RoiNarrative(
-        headline=f"${net_annual_savings:,.0f} in net savings within year one",
-        highlights=[
-            f"Automating {payload.hours_per_week:.0f} hrs/week in {profile.label} unlocks ${monthly_savings:,.0f}/month",
-            f"Payback expected in {payback_months:.1f} months" if payback_months else "Savings offset the investment immediately",
-            f"Annual tool spend assumed at ${annual_tool_cost:,.0f}",
-        ],
-    )
-
-    metrics = RoiMetrics(
+    return RoiComputation(
+        profile=profile,
+        hours_per_week=hours_per_week,
+        labor_rate=labor_rate,
+        tool_cost=tool_cost,
+        industry=industry,
         annual_labor_cost=annual_labor_cost,
         annual_savings_low=savings_low,
         annual_savings_expected=savings_expected,
@@ -94,12 +221,171 @@ def calculate_roi(payload: RoiInputs) -> RoiCalculationResult:
         annual_tool_cost=annual_tool_cost,
         net_annual_savings=net_annual_savings,
         payback_months=payback_months,
+        automated_cost=annual_labor_cost - savings_expected + annual_tool_cost,
     )
 
-    return RoiCalculationResult(
-        profile=profile,
-        inputs=payload,
-        metrics=metrics,
-        chart=_build_chart(annual_labor_cost, automated_cost),
-        narrative=narrative,
+
+def calculate_roi(payload: RoiInputs) -> RoiCalculationResult:
+    return compute_roi(
+        payload.hours_per_week,
+        payload.labor_rate,
+        payload.tool_cost,
+        payload.industry,
+    ).to_result(payload)
+
+
+@dataclass(slots=True)
+class RoiBatchMetrics:
+    """Columnar metrics for many calculator inputs, one array entry per row.
+
+    Values match `calculate_roi` row for row. Rows without a payback period
+    carry NaN in `payback_months` where the scalar path returns None.
+    """
+
+    profile_keys: np.ndarray
+    annual_labor_cost: np.ndarray
+    annual_savings_low: np.ndarray
+    annual_savings_expected: np.ndarray
+    annual_savings_high: np.ndarray
+    monthly_savings: np.ndarray
+    annual_tool_cost: np.ndarray
+    net_annual_savings: np.ndarray
+    payback_months: np.ndarray
+
+    def __len__(self) -> int:
+        return len(self.profile_keys)
+
+    def row_metrics(self, row: int) -> RoiMetrics:
+        """Metrics for one row as the API model."""
+
+        payback = float(self.payback_months[row])
+        return RoiMetrics(
+            annual_labor_cost=float(self.annual_labor_cost[row]),
+            annual_savings_low=float(self.annual_savings_low[row]),
+            annual_savings_expected=float(self.annual_savings_expected[row]),
+            annual_savings_high=float(self.annual_savings_high[row]),
+            monthly_savings=float(self.monthly_savings[row]),
+            annual_tool_cost=float(self.annual_tool_cost[row]),
+            net_annual_savings=float(self.net_annual_savings[row]),
+            payback_months=None if np.isnan(payback) else payback,
+        )
+
+
+def input_bounds(field_name: str) -> tuple[float, float]:
+    """Read the ge/le constraints declared on a `RoiInputs` field."""
+
+    low, high = -np.inf, np.inf
+    for constraint in RoiInputs.model_fields[field_name].metadata:
+        low = getattr(constraint, "ge", low)
+        high = getattr(constraint, "le", high)
+    return low, high
+
+
+def checked_input_column(field_name: str, values: Sequence[float] | np.ndarray) -> np.ndarray:
+    """Convert `values` to a float64 column, raising ValueError on out-of-bounds entries."""
+
+    column = np.asarray(values, dtype=np.float64)
+    if column.ndim != 1:
+        raise ValueError(f"{field_name} must be a one-dimensional column")
+    low, high = input_bounds(field_name)
+    bad = ~((column >= low) & (column <= high))
+    if bad.any():
+        row = int(np.flatnonzero(bad)[0])
+        raise ValueError(f"{field_name}[{row}] must be between {low:g} and {high:g}")
+    return column
+
+
+def valid_input_mask(
+    hours_per_week: np.ndarray,
+    labor_rate: np.ndarray,
+    tool_cost: np.ndarray,
+) -> np.ndarray:
+    """Return a boolean mask of rows that satisfy the `RoiInputs` bounds.
+
+    NaN entries are treated as invalid, which lets callers parse loosely and
+    filter bad rows instead of failing the whole batch.
+    """
+
+    mask = np.ones(len(hours_per_week), dtype=bool)
+    for field_name, column in (
+        ("hours_per_week", hours_per_week),
+        ("labor_rate", labor_rate),
+        ("tool_cost", tool_cost),
+    ):
+        low, high = input_bounds(field_name)
+        mask &= (column >= low) & (column <= high)
+    return mask
+
+
+def resolve_profiles(industries: Sequence[str] | np.ndarray) -> tuple[np.ndarray, np.ndarray, np.ndarray, np.ndarray]:
+    """Map industry codes to profile keys and savings rates in one pass.
+
+    Unknown industries fall back to the general profile, like `calculate_roi`.
+    The low/high rates are clamped per profile with the same Python expressions
+    the scalar path uses so the results stay bit-identical.
+    """
+
+    keys = list(INDUSTRY_PROFILES)
+    position = {key: index for index, key in enumerate(keys)}
+    fallback = position["general"]
+    profiles = [INDUSTRY_PROFILES[key] for key in keys]
+    expected_rates = np.array([p.savings_rate for p in profiles], dtype=np.float64)
+    low_rates = np.array([max(p.savings_rate - p.variance, 0) for p in profiles], dtype=np.float64)
+    high_rates = np.array([min(p.savings_rate + p.variance, 0.95) for p in profiles], dtype=np.float64)
+
+    codes, inverse = np.unique(np.asarray(industries, dtype=str), return_inverse=True)
+    index = np.array([position.get(code, fallback) for code in codes.tolist()], dtype=np.intp)[inverse]
+    return (
+        np.array(keys, dtype=object)[index],
+        expected_rates[index],
+        low_rates[index],
+        high_rates[index],
+    )
+
+
+def payback_months_array(tool_cost: np.ndarray, net_monthly_savings: np.ndarray) -> np.ndarray:
+    """Broadcasting payback period, NaN wherever `calculate_roi` returns None."""
+
+    shape = np.broadcast_shapes(np.shape(tool_cost), np.shape(net_monthly_savings))
+    payback_months = np.full(shape, np.nan)
+    np.divide(tool_cost, net_monthly_savings, out=payback_months, where=net_monthly_savings > 0)
+    return payback_months
+
+
+def calculate_roi_batch(
+    hours_per_week: Sequence[float] | np.ndarray,
+    labor_rate: Sequence[float] | np.ndarray,
+    tool_cost: Sequence[float] | np.ndarray,
+    industries: Sequence[str] | np.ndarray,
+) -> RoiBatchMetrics:
+    """Vectorized `calculate_roi` over equally sized input columns.
+
+    Raises ValueError when the columns differ in length or when a value falls
+    outside the bounds declared on `RoiInputs`.
+    """
+
+    hours = checked_input_column("hours_per_week", hours_per_week)
+    rate = checked_input_column("labor_rate", labor_rate)
+    tool = checked_input_column("tool_cost", tool_cost)
+    if not (len(hours) == len(rate) == len(tool) == len(industries)):
+        raise ValueError("All input columns must have the same length")
+
+    profile_keys, savings_rate, low_rate, high_rate = resolve_profiles(industries)
+
+    annual_labor_cost = hours * 52 * rate
+    savings_expected = annual_labor_cost * savings_rate
+    monthly_savings = savings_expected / 12
+    annual_tool_cost = tool * 12
+    net_monthly_savings = monthly_savings - tool
+
+    return RoiBatchMetrics(
+        profile_keys=profile_keys,
+        annual_labor_cost=annual_labor_cost,
+        annual_savings_low=annual_labor_cost * low_rate,
+        annual_savings_expected=savings_expected,
+        annual_savings_high=annual_labor_cost * high_rate,
+        monthly_savings=monthly_savings,
+        annual_tool_cost=annual_tool_cost,
+        net_annual_savings=savings_expected - annual_tool_cost,
+        payback_months=payback_months_array(tool, net_monthly_savings),
     )
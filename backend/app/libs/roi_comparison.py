@@ -0,0 +1,69 @@
+from __future__ import annotations
+
+import numpy as np
+from pydantic import ValidationError
+
+from app.libs.domain_model import (
+    RoiComparisonRequest,
+    RoiComparisonResult,
+    RoiInputs,
+    RoiMetrics,
+    RoiScenarioComparison,
+    RoiScenarioOverride,
+)
+from app.libs.roi_calculator import INDUSTRY_PROFILES, calculate_roi_batch
+
+_METRIC_FIELDS = tuple(RoiMetrics.model_fields)
+
+
+def _apply_override(base: RoiInputs, override: RoiScenarioOverride) -> RoiInputs:
+    changes = override.model_dump(exclude={"name"}, exclude_none=True)
+    if not changes:
+        return base
+    try:
+        return RoiInputs.model_validate({**base.model_dump(), **changes})
+    except ValidationError as exc:
+        raise ValueError(f"Scenario {override.name!r}: {exc}") from exc
+
+
+def compare_scenarios(request: RoiComparisonRequest) -> RoiComparisonResult:
+    """Evaluate the base inputs and every override in one vectorized pass.
+
+    Row 0 of the batch is the base, rows 1..N the scenarios. Raises ValueError
+    naming the scenario when an override fails `RoiInputs` validation.
+    """
+
+    rows = [request.base] + [_apply_override(request.base, o) for o in request.scenarios]
+    batch = calculate_roi_batch(
+        [r.hours_per_week for r in rows],
+        [r.labor_rate for r in rows],
+        [r.tool_cost for r in rows],
+        [r.industry for r in rows],
+    )
+
+    # Deltas for every metric in one subtraction; NaN payback propagates to null
+    columns = np.stack([getattr(batch, name) for name in _METRIC_FIELDS])
+    deltas = columns[:, 1:] - columns[:, :1]
+
+    scenarios = []
+    for index, override in enumerate(request.scenarios, start=1):
+        delta_values = {
+            name: (None if np.isnan(value) else float(value))
+            for name, value in zip(_METRIC_FIELDS, deltas[:, index - 1])
+        }
+        scenarios.append(
+            RoiScenarioComparison.model_construct(
+                name=override.name,
+                inputs=rows[index],
+                profile=batch.profile_keys[index],
+                metrics=batch.row_metrics(index),
+                deltas=RoiMetrics.model_construct(**delta_values),
+            )
+        )
+
+    return RoiComparisonResult.model_construct(
+        profile=INDUSTRY_PROFILES[batch.profile_keys[0]],
+        inputs=request.base,
+        metrics=batch.row_metrics(0),
+        scenarios=scenarios,
+    )
@@ -0,0 +1,119 @@
+from __future__ import annotations
+
+from dataclasses import dataclass
+from typing import Optional
+
+import numpy as np
+
+from app.libs.domain_model import IndustryProfile, RoiInputs, RoiMonteCarloResult, RoiPercentiles
+from app.libs.roi_calculator import INDUSTRY_PROFILES, input_bounds, payback_months_array
+
+# Draws are evaluated this many at a time, so temporaries stay a few MB
+# no matter how many draws are requested.
+DEFAULT_CHUNK_DRAWS = 65_536
+
+PERCENTILES = (5, 10, 25, 50, 75, 90, 95)
+
+# Monthly bins from 0 to 24 months plus one open-ended bin for longer paybacks
+PAYBACK_HISTOGRAM_EDGES = np.arange(0, 25, dtype=np.float64)
+
+
+@dataclass(slots=True)
+class MonteCarloDraws:
+    """Per-draw outputs, stored as float32 to halve the footprint of large runs."""
+
+    profile: IndustryProfile
+    seed: int
+    net_annual_savings: np.ndarray
+    payback_months: np.ndarray
+
+
+def _sample_savings_rate(rng: np.random.Generator, profile: IndustryProfile, size: int) -> np.ndarray:
+    # Triangular over the same clamped band calculate_roi reports as low/high,
+    # peaking at the expected rate.
+    low = max(profile.savings_rate - profile.variance, 0)
+    high = min(profile.savings_rate + profile.variance, 0.95)
+    if high <= low:
+        return np.full(size, profile.savings_rate)
+    mode = min(max(profile.savings_rate, low), high)
+    return rng.triangular(low, mode, high, size)
+
+
+def _sample_positive(rng: np.random.Generator, mean: float, spread: float, upper: float, size: int) -> np.ndarray:
+    if spread == 0 or mean == 0:
+        return np.full(size, mean)
+    return np.clip(rng.normal(mean, mean * spread, size), 0, upper)
+
+
+def simulate_roi(
+    payload: RoiInputs,
+    *,
+    draws: int,
+    seed: Optional[int] = None,
+    hours_spread: float = 0.1,
+    labor_rate_spread: float = 0.05,
+    chunk_draws: int = DEFAULT_CHUNK_DRAWS,
+) -> MonteCarloDraws:
+    """Sample savings rate, hours and labor rate and run the ROI formulas per draw.
+
+    The savings rate follows the profile's variance band, hours and labor rate
+    are normal around the given inputs and clipped to the `RoiInputs` bounds.
+    Tool cost is treated as known. Results are reproducible for a given
+    (seed, chunk_draws) pair.
+    """
+
+    profile = INDUSTRY_PROFILES.get(payload.industry, INDUSTRY_PROFILES["general"])
+    if seed is None:
+        seed = int(np.random.SeedSequence().entropy % 2**63)
+    rng = np.random.default_rng(seed)
+
+    net_annual_savings = np.empty(draws, dtype=np.float32)
+    payback_months = np.empty(draws, dtype=np.float32)
+    tool = payload.tool_cost
+    _, max_hours = input_bounds("hours_per_week")
+    _, max_rate = input_bounds("labor_rate")
+
+    for start in range(0, draws, chunk_draws):
+        size = min(chunk_draws, draws - start)
+        savings_rate = _sample_savings_rate(rng, profile, size)
+        hours = _sample_positive(rng, payload.hours_per_week, hours_spread, max_hours, size)
+        rate = _sample_positive(rng, payload.labor_rate, labor_rate_spread, max_rate, size)
+
+        savings_expected = hours * 52 * rate * savings_rate
+        net_annual_savings[start : start + size] = savings_expected - tool * 12
+        payback_months[start : start + size] = payback_months_array(tool, savings_expected / 12 - tool)
+
+    return MonteCarloDraws(
+        profile=profile,
+        seed=seed,
+        net_annual_savings=net_annual_savings,
+        payback_months=payback_months,
+    )
+
+
+def _percentiles(values: np.ndarray) -> RoiPercentiles:
+    points = np.percentile(values, PERCENTILES)
+    return RoiPercentiles(**{f"p{p}": float(v) for p, v in zip(PERCENTILES, points)})
+
+
+def summarize_simulation(payload: RoiInputs, simulation: MonteCarloDraws) -> RoiMonteCarloResult:
+    """Reduce per-draw outputs to percentiles, probabilities and a histogram."""
+
+    draws = len(simulation.net_annual_savings)
+    payback = simulation.payback_months
+    pays_back = payback[~np.isnan(payback)]
+    counts, _ = np.histogram(pays_back, bins=np.append(PAYBACK_HISTOGRAM_EDGES, np.inf))
+
+    return RoiMonteCarloResult(
+        profile=simulation.profile,
+        inputs=payload,
+        draws=draws,
+        seed=simulation.seed,
+        net_annual_savings_mean=float(simulation.net_annual_savings.mean(dtype=np.float64)),
+        net_annual_savings=_percentiles(simulation.net_annual_savings),
+        payback_months=_percentiles(pays_back) if len(pays_back) else None,
+        probability_payback_within_12_months=float(np.count_nonzero(pays_back <= 12)) / draws,
+        probability_no_payback=1 - len(pays_back) / draws,
+        payback_histogram_edges=PAYBACK_HISTOGRAM_EDGES.tolist(),
+        payback_histogram_counts=counts.tolist(),
+    )
@@ -0,0 +1,89 @@
+from __future__ import annotations
+
+import base64
+from dataclasses import dataclass
+from typing import List
+
+import numpy as np
+
+from app.libs.domain_model import IndustryProfile, RoiGridAxis, RoiSensitivityAxis, RoiSensitivityGrid
+from app.libs.roi_calculator import INDUSTRY_PROFILES, checked_input_column, payback_months_array
+
+# Upper bound on evaluated cells, about 8 MB of float64 per metric
+MAX_GRID_CELLS = 1_000_000
+
+
+@dataclass(slots=True)
+class RoiGridMetrics:
+    profile: IndustryProfile
+    axes: List[tuple[str, np.ndarray]]
+    net_annual_savings: np.ndarray
+    payback_months: np.ndarray
+
+
+def _axis_values(name: str, axis: RoiGridAxis | float) -> np.ndarray:
+    if isinstance(axis, RoiGridAxis):
+        values = np.linspace(axis.start, axis.stop, axis.steps)
+    else:
+        values = np.array([axis], dtype=np.float64)
+    return checked_input_column(name, values)
+
+
+def calculate_roi_grid(
+    industry: str,
+    hours_per_week: RoiGridAxis,
+    labor_rate: RoiGridAxis,
+    tool_cost: RoiGridAxis | float = 0,
+) -> RoiGridMetrics:
+    """Evaluate the `calculate_roi` formulas over the full input grid at once.
+
+    The result arrays are shaped (hours, labor_rate) or, when `tool_cost` is an
+    axis, (hours, labor_rate, tool_cost). Raises ValueError when an axis leaves
+    the `RoiInputs` bounds or the grid exceeds MAX_GRID_CELLS.
+    """
+
+    profile = INDUSTRY_PROFILES.get(industry, INDUSTRY_PROFILES["general"])
+    hours = _axis_values("hours_per_week", hours_per_week)
+    rate = _axis_values("labor_rate", labor_rate)
+    tool = _axis_values("tool_cost", tool_cost)
+
+    axes = [("hours_per_week", hours), ("labor_rate", rate)]
+    if isinstance(tool_cost, RoiGridAxis):
+        axes.append(("tool_cost", tool))
+    if np.prod([len(values) for _, values in axes]) > MAX_GRID_CELLS:
+        raise ValueError(f"Grid exceeds {MAX_GRID_CELLS:,} cells")
+
+    # Broadcast to (hours, rate, tool) and drop the tool axis again when fixed
+    annual_labor_cost = hours[:, None, None] * 52 * rate[None, :, None]
+    savings_expected = annual_labor_cost * profile.savings_rate
+    net_monthly_savings = savings_expected / 12 - tool
+    net_annual_savings = savings_expected - tool * 12
+    payback_months = payback_months_array(tool, net_monthly_savings)
+
+    if not isinstance(tool_cost, RoiGridAxis):
+        net_annual_savings = net_annual_savings[:, :, 0]
+        payback_months = payback_months[:, :, 0]
+
+    return RoiGridMetrics(
+        profile=profile,
+        axes=axes,
+        net_annual_savings=net_annual_savings,
+        payback_months=payback_months,
+    )
+
+
+def _encode_f4(values: np.ndarray) -> str:
+    return base64.b64encode(np.ascontiguousarray(values, dtype="<f4").tobytes()).decode("ascii")
+
+
+def to_sensitivity_grid(metrics: RoiGridMetrics) -> RoiSensitivityGrid:
+    """Pack grid metrics into the compact response model."""
+
+    return RoiSensitivityGrid.model_construct(
+        profile=metrics.profile,
+        axes=[RoiSensitivityAxis(name=name, values=values.tolist()) for name, values in metrics.axes],
+        shape=list(metrics.net_annual_savings.shape),
+        dtype="<f4",
+        net_annual_savings=_encode_f4(metrics.net_annual_savings),
+        payback_months=_encode_f4(metrics.payback_months),
+    )
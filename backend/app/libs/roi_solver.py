@@ -0,0 +1,96 @@
+from __future__ import annotations
+
+from dataclasses import dataclass
+from typing import Optional, Sequence
+
+import numpy as np
+
+from app.libs.domain_model import SavingsScenario, SolveFor, SolveTarget
+from app.libs.roi_calculator import checked_input_column, input_bounds, resolve_profiles
+
+# Every target on the year-one model is linear in the monthly savings M and
+# the tool cost T, so it reduces to the requirement  M >= a * T + b:
+#   break_even          M - T >= 0
+#   payback_months P    T / (M - T) <= P   <=>  M >= T * (1 + 1/P)
+#   net_annual_savings  12 * (M - T) >= S  <=>  M >= T + S / 12
+# which has a closed form for each of the three unknowns.
+
+
+@dataclass(slots=True)
+class SolveResult:
+    """Solved values per row, NaN where the target cannot be met at all."""
+
+    values: np.ndarray
+    feasible: np.ndarray
+
+
+def _requirement(target: SolveTarget, target_value: Optional[float]) -> tuple[float, float]:
+    if target == "break_even":
+        return 1.0, 0.0
+    if target_value is None:
+        raise ValueError(f"target_value is required for target {target}")
+    if target == "payback_months":
+        if target_value <= 0:
+            raise ValueError("target_value must be positive for payback_months")
+        return 1 + 1 / target_value, 0.0
+    return 1.0, target_value / 12
+
+
+def _column(name: str, values: Sequence[float] | np.ndarray | None, size: int) -> np.ndarray:
+    if values is None:
+        raise ValueError(f"{name} is required")
+    column = checked_input_column(name, values)
+    if len(column) != size:
+        raise ValueError("All input columns must have the same length")
+    return column
+
+
+def solve_roi_batch(
+    solve_for: SolveFor,
+    target: SolveTarget,
+    target_value: Optional[float],
+    *,
+    industries: Sequence[str] | np.ndarray,
+    hours_per_week: Sequence[float] | np.ndarray | None = None,
+    labor_rate: Sequence[float] | np.ndarray | None = None,
+    tool_cost: Sequence[float] | np.ndarray | None = None,
+    scenario: SavingsScenario = "expected",
+) -> SolveResult:
+    """Answer inverse ROI questions for many prospects at once.
+
+    Solving for tool_cost yields the highest monthly cost that still meets the
+    target; solving for hours_per_week or labor_rate yields the lowest value
+    that does. The column being solved for is ignored.
+    """
+
+    a, b = _requirement(target, target_value)
+    size = len(industries)
+    _, expected_rate, low_rate, high_rate = resolve_profiles(industries)
+    savings_rate = {"expected": expected_rate, "low": low_rate, "high": high_rate}[scenario]
+
+    with np.errstate(divide="ignore", invalid="ignore"):
+        if solve_for == "tool_cost":
+            hours = _column("hours_per_week", hours_per_week, size)
+            rate = _column("labor_rate", labor_rate, size)
+            monthly_savings = hours * 52 * rate * savings_rate / 12
+            values = (monthly_savings - b) / a
+            # Payback only exists while net monthly savings stay positive
+            values = np.where(monthly_savings > 0, values, np.nan)
+        else:
+            tool = _column("tool_cost", tool_cost, size)
+            required_monthly = a * tool + b
+            if solve_for == "hours_per_week":
+                other = _column("labor_rate", labor_rate, size)
+            else:
+                other = _column("hours_per_week", hours_per_week, size)
+            per_unit = other * 52 * savings_rate / 12
+            values = np.where(per_unit > 0, np.maximum(required_monthly / per_unit, 0.0), np.nan)
+
+    low, high = input_bounds(solve_for)
+    if solve_for == "tool_cost":
+        # The most one can pay is capped by the calculator's own upper bound
+        feasible = values >= low
+        values = np.where(feasible, np.minimum(values, high), values)
+    else:
+        feasible = values <= high
+    return SolveResult(values=values, feasible=feasible & ~np.isnan(values))
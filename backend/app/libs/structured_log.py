@@ -0,0 +1,202 @@
+from __future__ import annotations
+
+import json
+import logging
+import os
+import queue
+import sys
+import threading
+from datetime import datetime, timezone
+from logging.handlers import QueueHandler, QueueListener
+from typing import Any, Dict, Literal, Optional, TextIO
+
+from pydantic import BaseModel
+
+FullQueuePolicy = Literal["drop", "block"]
+
+DEFAULT_QUEUE_SIZE = 10_000
+DEFAULT_BLOCK_TIMEOUT = 0.05
+
+# Contact details that stay out of logs unless redaction is switched off
+PII_FIELDS = frozenset({"name", "email", "phone", "notes"})
+
+# LogRecord attributes that are not caller-supplied `extra` fields
+_RECORD_ATTRIBUTES = frozenset(vars(logging.LogRecord("", 0, "", 0, "", None, None))) | {"message", "asctime"}
+
+
+def redact(field: str, value: Any) -> Any:
+    """Mask a PII field, keeping just enough to tell records apart."""
+
+    if value is None or field not in PII_FIELDS:
+        return value
+    text = str(value)
+    if field == "email":
+        return "***@" + text.rpartition("@")[2]
+    if field == "phone":
+        return "***" + text[-2:]
+    if field == "notes":
+        return f"[redacted {len(text)} chars]"
+    return "[redacted]"
+
+
+class JsonLogFormatter(logging.Formatter):
+    """One JSON object per record: timestamp, level, logger, message and any `extra` fields.
+
+    PII fields are redacted at any depth of nested dicts.
+    """
+
+    def __init__(self, *, redact_pii: bool = True) -> None:
+        super().__init__()
+        self.redact_pii = redact_pii
+
+    def format(self, record: logging.LogRecord) -> str:
+        entry: Dict[str, Any] = {
+            "ts": datetime.fromtimestamp(record.created, timezone.utc).isoformat(timespec="milliseconds"),
+            "level": record.levelname,
+            "logger": record.name,
+            "message": record.getMessage(),
+        }
+        for key, value in record.__dict__.items():
+            if key not in _RECORD_ATTRIBUTES and not key.startswith("_"):
+                entry[key] = self._redact(key, value) if self.redact_pii else value
+        if record.exc_info:
+            entry["exc_info"] = self.formatException(record.exc_info)
+        return json.dumps(entry, default=str, ensure_ascii=False)
+
+    def _redact(self, key: str, value: Any) -> Any:
+        if isinstance(value, dict):
+            return {field: self._redact(field, item) for field, item in value.items()}
+        return redact(key, value)
+
+
+class BoundedQueueHandler(QueueHandler):
+    """QueueHandler for a bounded queue that drops, or briefly blocks, when it is full.
+
+    Records are queued as they are; formatting and redaction happen on the
+    listener thread, so a log call on the request path costs one queue put.
+    """
+
+    def __init__(
+        self, log_queue: queue.Queue, *, policy: FullQueuePolicy = "drop", block_timeout: float = DEFAULT_BLOCK_TIMEOUT
+    ) -> None:
+        super().__init__(log_queue)
+        self.policy = policy
+        self.block_timeout = block_timeout
+        self.enqueued = 0
+        self.dropped = 0
+
+    def prepare(self, record: logging.LogRecord) -> logging.LogRecord:
+        return record
+
+    def enqueue(self, record: logging.LogRecord) -> None:
+        try:
+            if self.policy == "block":
+                self.queue.put(record, timeout=self.block_timeout)
+            else:
+                self.queue.put_nowait(record)
+        except queue.Full:
+            self.dropped += 1
+        else:
+            self.enqueued += 1
+
+
+class _Listener(QueueListener):
+    def enqueue_sentinel(self) -> None:
+        # The queue may be full at shutdown; wait for room rather than fail
+        self.queue.put(self._sentinel)
+
+
+class LogPipelineStats(BaseModel):
+    queue_depth: int
+    queue_size: int
+    policy: FullQueuePolicy
+    enqueued: int
+    dropped: int
+    redact_pii: bool
+
+
+class StructuredLogPipeline:
+    """JSON logging for one logger, written to `stream` by a background thread.
+
+    Records go onto a bounded queue and a QueueListener thread formats and
+    writes them, so request handlers never wait on stdout. When the queue is
+    full, records are dropped (`policy="drop"`) or the caller waits up to
+    `block_timeout` seconds for room before dropping (`policy="block"`).
+    """
+
+    def __init__(
+        self,
+        logger_name: str,
+        *,
+        queue_size: int = DEFAULT_QUEUE_SIZE,
+        policy: FullQueuePolicy = "drop",
+        block_timeout: float = DEFAULT_BLOCK_TIMEOUT,
+        redact_pii: bool = True,
+        stream: Optional[TextIO] = None,
+    ) -> None:
+        self.queue: queue.Queue = queue.Queue(maxsize=queue_size)
+        self.queue_size = queue_size
+        self.redact_pii = redact_pii
+        self.handler = BoundedQueueHandler(self.queue, policy=policy, block_timeout=block_timeout)
+        output = logging.StreamHandler(stream or sys.stdout)
+        output.setFormatter(JsonLogFormatter(redact_pii=redact_pii))
+        self.listener = _Listener(self.queue, output)
+        self.logger = logging.getLogger(logger_name)
+        self._lock = threading.Lock()
+        self._started = False
+
+    def start(self) -> None:
+        with self._lock:
+            if self._started:
+                return
+            self.listener.start()
+            self.logger.addHandler(self.handler)
+            self.logger.setLevel(logging.INFO)
+            # Keep records off the root and uvicorn handlers, which write synchronously
+            self.logger.propagate = False
+            self._started = True
+
+    def stop(self) -> None:
+        """Write out everything queued, then stop the listener thread."""
+
+        with self._lock:
+            if not self._started:
+                return
+            self.logger.removeHandler(self.handler)
+            self.listener.stop()
+            self._started = False
+
+    def stats(self) -> LogPipelineStats:
+        return LogPipelineStats(
+            queue_depth=self.queue.qsize(),
+            queue_size=self.queue_size,
+            policy=self.handler.policy,
+            enqueued=self.handler.enqueued,
+            dropped=self.handler.dropped,
+            redact_pii=self.redact_pii,
+        )
+
+
+_lead_log: Optional[StructuredLogPipeline] = None
+_lead_log_lock = threading.Lock()
+
+
+def get_lead_log() -> StructuredLogPipeline:
+    """Process-wide pipeline for lead events, started on first use.
+
+    Configured through LEAD_LOG_QUEUE_SIZE, LEAD_LOG_FULL_POLICY (drop or
+    block) and LEAD_LOG_REDACT_PII (set to 0 to log contact details).
+    """
+
+    global _lead_log
+    with _lead_log_lock:
+        if _lead_log is None:
+            policy = os.environ.get("LEAD_LOG_FULL_POLICY", "drop")
+            _lead_log = StructuredLogPipeline(
+                "app.leads",
+                queue_size=int(os.environ.get("LEAD_LOG_QUEUE_SIZE", DEFAULT_QUEUE_SIZE)),
+                policy="block" if policy == "block" else "drop",
+                redact_pii=os.environ.get("LEAD_LOG_REDACT_PII", "1") != "0",
+            )
+    _lead_log.start()
+    return _lead_log
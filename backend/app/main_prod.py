@@ -1,18 +1,76 @@
+import os
+from contextlib import asynccontextmanager
+
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
 
 # Import your actual logic routers
 from app.apis.leads import router as leads_router
 from app.apis.roi import router as roi_router
+from app.internal.mw.ratelimit_mw import RateLimitMiddleware, SqliteBucketStore
+from app.libs.lead_outbox import OutboxWorker
+from app.libs.lead_search import get_lead_search_index
+from app.libs.lead_store import get_lead_store
+from app.libs.monday_client import AsyncMondayClient
+from app.libs.monday_governor import MondayGovernor
+from app.libs.structured_log import get_lead_log
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    # Open the lead store up front so its recovery check runs at startup
+    lead_store = get_lead_store()
+    lead_store.start()
+    # Index new leads for full-text search in batches behind the writer
+    search_index = get_lead_search_index()
+    search_index.start()
+
+    # Push stored leads to Monday.com in the background when it is configured
+    # over one pooled client so connections are reused across deliveries,
+    # paced so campaign bursts stay inside Monday's complexity budget
+    monday_client = None
+    outbox_worker = None
+    if os.environ.get("MONDAY_API_TOKEN"):
+        monday_client = AsyncMondayClient(governor=MondayGovernor())
+        outbox_worker = OutboxWorker(lead_store, monday_client)
+        outbox_worker.start()
+    app.state.monday_client = monday_client
+    app.state.outbox_worker = outbox_worker
+
+    yield
+
+    if outbox_worker is not None:
+        await outbox_worker.stop()
+    if monday_client is not None:
+        await monday_client.aclose()
+    # Flush pending lead writes before the process exits
+    lead_store.close()
+    search_index.close()
+    # Write out queued lead log records
+    get_lead_log().stop()
+
 
 # Initialize FastAPI with root_path="/api"
 # This tells FastAPI that it is sitting behind a proxy (Vercel)
 app = FastAPI(
     title="ROI Calculator API",
-    root_path="/api"
+    root_path="/api",
+    lifespan=lifespan,
 )
 
+# Throttle scrapers and bots per client IP before they reach the calculator or
+# lead endpoints. Vercel overwrites X-Forwarded-For with the caller's address.
+# Set RATE_LIMIT_STORE_PATH to share buckets across workers on one host.
+if os.environ.get("RATE_LIMIT_DISABLED") != "1":
+    rate_limit_store_path = os.environ.get("RATE_LIMIT_STORE_PATH")
+    app.add_middleware(
+        RateLimitMiddleware,
+        store=SqliteBucketStore(rate_limit_store_path) if rate_limit_store_path else None,
+        trust_forwarded=True,
+    )
+
 # Allow the Frontend to talk to this Backend
+# (added after rate limiting so it wraps it and 429s carry CORS headers too)
 app.add_middleware(
     CORSMiddleware,
     allow_origins=["*"], 
@@ -0,0 +1,121 @@
+"""Notifications per second from DevxClient to a local devx stub.
+
+Compares, for the sync path (log forwarding, import errors) and the async path
+(publish, openapi refresh):
+  fresh   - a new httpx client per notification, as DevxClient used to do
+  pooled  - DevxClient's long-lived clients with keep-alive connections
+
+The stub runs in its own process and answers every post immediately, so the
+numbers are client and connection setup overhead only.
+
+Run from the backend directory:
+
+    python -m benchmarks.bench_devx_notifications
+"""
+
+import asyncio
+import multiprocessing
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import httpx
+
+from app.internal.config import Config
+from app.internal.messages import BackendLog, Topics
+from app.internal.notifications import DevxClient, params_as_json
+from app.internal.utils import utc_now
+
+LOG = BackendLog(timestamp=utc_now(), text="hello from the backend", level="info")
+
+
+class StubHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+    # Headers and body go out in separate writes; without this, keep-alive
+    # connections stall on Nagle plus delayed ACKs and the stub dominates.
+    disable_nagle_algorithm = True
+
+    def log_message(self, *args) -> None:
+        pass
+
+    def do_POST(self) -> None:
+        self.rfile.read(int(self.headers["Content-Length"]))
+        self.send_response(200)
+        self.send_header("Content-Length", "0")
+        self.end_headers()
+
+
+def serve(port) -> None:
+    server = ThreadingHTTPServer(("127.0.0.1", 0), StubHandler)
+    port.value = server.server_port
+    server.serve_forever()
+
+
+def post_fresh_sync(url: str) -> None:
+    with httpx.Client(base_url=url) as client:
+        client.post(
+            f"/workspace/internal/publish/{Topics.backend_log.value}",
+            headers={"Content-Type": "application/json"},
+            content=params_as_json(LOG),
+        )
+
+
+async def post_fresh_async(url: str) -> None:
+    async with httpx.AsyncClient(base_url=url) as client:
+        await client.post(
+            f"/workspace/internal/publish/{Topics.backend_log.value}",
+            headers={"Content-Type": "application/json"},
+            content=params_as_json(LOG),
+        )
+
+
+def rate_sync(notify, number: int) -> float:
+    notify()
+    started = time.perf_counter()
+    for _ in range(number):
+        notify()
+    return number / (time.perf_counter() - started)
+
+
+async def rate_async(notify, number: int) -> float:
+    await notify()
+    started = time.perf_counter()
+    for _ in range(number):
+        await notify()
+    return number / (time.perf_counter() - started)
+
+
+async def bench_async(url: str, number: int) -> dict[str, float]:
+    devx = DevxClient(Config(DEVX_URL_INTERNAL=url))
+    results = {
+        "async fresh": await rate_async(lambda: post_fresh_async(url), number),
+        "async pooled": await rate_async(lambda: devx.notify_devx_async(Topics.backend_log, LOG), number),
+    }
+    await devx.aclose()
+    return results
+
+
+def main(number: int = 1_000) -> None:
+    # The stub gets its own process so it does not share a GIL with the clients
+    port = multiprocessing.Value("i", 0)
+    server = multiprocessing.Process(target=serve, args=(port,), daemon=True)
+    server.start()
+    while not port.value:
+        time.sleep(0.01)
+    url = f"http://127.0.0.1:{port.value}"
+
+    devx = DevxClient(Config(DEVX_URL_INTERNAL=url))
+    results = {
+        "sync fresh": rate_sync(lambda: post_fresh_sync(url), number),
+        "sync pooled": rate_sync(lambda: devx.notify_devx_sync(Topics.backend_log, LOG), number),
+    }
+    devx.close()
+    results.update(asyncio.run(bench_async(url, number)))
+    server.terminate()
+
+    print(f"{'case':<14} {'notifications/s':>16}")
+    for name, rate in results.items():
+        print(f"{name:<14} {rate:>16.0f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,152 @@
+"""Per-request overhead of the internal app's middleware stack.
+
+Compares, per request to a trivial JSON route:
+  none      - no middleware
+  base_http - RequestId, CookieKiller and WorkspacePublish as they were, on
+              Starlette's BaseHTTPMiddleware (copied below)
+  asgi      - the same three as pure ASGI middleware from app.internal.mw
+
+Each stack is installed with app.add_middleware in the same order as
+app.internal.main, with a no-op publish callback (a coroutine for the
+BaseHTTP copy, which awaited it), and driven by direct ASGI calls so no
+server or network is measured.
+
+Run from the backend directory:
+
+    python -m benchmarks.bench_internal_middleware
+"""
+
+import asyncio
+import random
+import time
+
+from fastapi import FastAPI
+from starlette.middleware.base import BaseHTTPMiddleware, RequestResponseEndpoint
+from starlette.requests import Request
+from starlette.responses import Response
+
+from app.internal.exceptionmodel import ExceptionModel
+from app.internal.messages import RequestFinished, RequestStarted, Topics
+from app.internal.mw.cookie_mw import CookieKillerMiddleware
+from app.internal.mw.requestid_mw import RequestIdMiddleware
+from app.internal.mw.workspace_mw import WorkspacePublishMiddleware
+from app.internal.utils import utc_now
+
+
+class BaseHttpRequestId(BaseHTTPMiddleware):
+    async def dispatch(self, request: Request, call_next: RequestResponseEndpoint) -> Response:
+        request.state.request_id = request.headers.get("x-request-id") or "req-" + random.randbytes(8).hex()
+        return await call_next(request)
+
+
+class BaseHttpCookieKiller(BaseHTTPMiddleware):
+    async def dispatch(self, request: Request, call_next: RequestResponseEndpoint) -> Response:
+        request.scope["headers"] = [h for h in request.scope["headers"] if h[0] != b"Cookie"]
+        response = await call_next(request)
+        if "Set-Cookie" in response.headers:
+            del response.headers["Set-Cookie"]
+        return response
+
+
+class BaseHttpWorkspacePublish(BaseHTTPMiddleware):
+    def __init__(self, app, exception_to_model, publish) -> None:
+        super().__init__(app)
+        self.publish = publish
+
+    async def dispatch(self, request: Request, call_next: RequestResponseEndpoint) -> Response:
+        request_id = request.state.request_id
+        await self.publish(
+            Topics.request_started,
+            RequestStarted(requestId=request_id, method=request.method, url=str(request.url.path), timestamp=utc_now()),
+        )
+        start_time = time.monotonic()
+        response = await call_next(request)
+        await self.publish(
+            Topics.request_finished,
+            RequestFinished(
+                requestId=request_id,
+                method=request.method,
+                url=str(request.url.path),
+                timestamp=utc_now(),
+                duration=time.monotonic() - start_time,
+                statusCode=response.status_code,
+            ),
+        )
+        return response
+
+
+async def publish_async(topic, message) -> None:
+    pass
+
+
+def publish(topic, message) -> None:
+    pass
+
+
+def e2m(ex: BaseException) -> ExceptionModel:
+    raise NotImplementedError
+
+
+def make_app(stack) -> FastAPI:
+    app = FastAPI()
+
+    @app.get("/ping")
+    def ping():
+        return {"ok": True}
+
+    if stack is not None:
+        request_id, cookie_killer, workspace_publish = stack
+        callback = publish_async if workspace_publish is BaseHttpWorkspacePublish else publish
+        app.add_middleware(workspace_publish, exception_to_model=e2m, publish=callback)
+        app.add_middleware(cookie_killer)
+        app.add_middleware(request_id)
+    return app
+
+
+STACKS = {
+    "none": None,
+    "base_http": (BaseHttpRequestId, BaseHttpCookieKiller, BaseHttpWorkspacePublish),
+    "asgi": (RequestIdMiddleware, CookieKillerMiddleware, WorkspacePublishMiddleware),
+}
+
+
+async def per_request(app: FastAPI, number: int) -> float:
+    async def receive():
+        return {"type": "http.request", "body": b"", "more_body": False}
+
+    async def send(message):
+        pass
+
+    started = time.perf_counter()
+    for _ in range(number):
+        scope = {
+            "type": "http",
+            "asgi": {"version": "3.0"},
+            "http_version": "1.1",
+            "method": "GET",
+            "scheme": "http",
+            "path": "/ping",
+            "raw_path": b"/ping",
+            "root_path": "",
+            "query_string": b"",
+            "headers": [(b"host", b"localhost"), (b"cookie", b"session=abc"), (b"x-request-id", b"req-1")],
+            "client": ("127.0.0.1", 50000),
+            "server": ("127.0.0.1", 8000),
+        }
+        await app(scope, receive, send)
+    return (time.perf_counter() - started) / number
+
+
+async def main(number: int = 5_000) -> None:
+    apps = {name: make_app(stack) for name, stack in STACKS.items()}
+    results = {}
+    for name, app in apps.items():
+        await per_request(app, 200)
+        results[name] = min([await per_request(app, number) for _ in range(3)])
+    print(f"{'stack':<10} {'us/request':>10} {'overhead us':>12}")
+    for name, seconds in results.items():
+        print(f"{name:<10} {seconds * 1e6:>10.1f} {(seconds - results['none']) * 1e6:>12.1f}")
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
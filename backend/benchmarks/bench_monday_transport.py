@@ -0,0 +1,119 @@
+"""Per-lead delivery latency against a local Monday.com stub.
+
+Compares:
+  requests  - MondayClient, a fresh connection per request via requests.post
+  pooled    - AsyncMondayClient, keep-alive connections on one httpx.AsyncClient
+
+The stub runs in its own process and answers every GraphQL document
+immediately, so the numbers are client and connection overhead only. Against
+the real API each reused connection also skips a TLS handshake and at least
+one extra network round trip, which is where most of the saving comes from.
+The x8 case shows throughput with several leads in flight on one event loop;
+locally it is bound by client CPU, not by the network.
+
+Run from the backend directory:
+
+    python -m benchmarks.bench_monday_transport
+"""
+
+import asyncio
+import json
+import multiprocessing
+import os
+import re
+import statistics
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import List
+
+from app.libs.domain_model import RoiInputs
+from app.libs.monday_client import AsyncMondayClient, LeadDetails, MondayClient
+from app.libs.roi_calculator import calculate_roi
+
+LEAD = LeadDetails(name="Ada", email="ada@example.com", company="Acme", phone="5550100")
+ROI = calculate_roi(RoiInputs(hours_per_week=25, labor_rate=45, tool_cost=750, industry="manufacturing"))
+ALIAS = re.compile(r"(\w+): create_(?:item|update)\(")
+
+
+class StubHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+    # Headers and body go out in separate writes; without this, keep-alive
+    # connections stall on Nagle plus delayed ACKs and the stub dominates.
+    disable_nagle_algorithm = True
+
+    def log_message(self, *args) -> None:
+        pass
+
+    def do_POST(self) -> None:
+        query = json.loads(self.rfile.read(int(self.headers["Content-Length"])))["query"]
+        aliases = ALIAS.findall(query) or ["create_item" if "create_item" in query else "create_update"]
+        body = json.dumps({"data": {alias: {"id": "1"} for alias in aliases}}).encode()
+        self.send_response(200)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+
+def serve(port) -> None:
+    server = ThreadingHTTPServer(("127.0.0.1", 0), StubHandler)
+    port.value = server.server_port
+    server.serve_forever()
+
+
+def summarize(name: str, latencies: List[float], elapsed: float) -> None:
+    ordered = sorted(latencies)
+    p99 = ordered[int(len(ordered) * 0.99) - 1]
+    print(
+        f"{name:<20} {statistics.median(ordered) * 1e3:>8.2f} {p99 * 1e3:>8.2f} "
+        f"{len(latencies) / elapsed:>10.0f}"
+    )
+
+
+def bench_requests(leads: int) -> None:
+    client = MondayClient()
+    latencies = []
+    started = time.perf_counter()
+    for _ in range(leads):
+        t0 = time.perf_counter()
+        client.create_lead_with_roi(LEAD, ROI)
+        latencies.append(time.perf_counter() - t0)
+    summarize("requests", latencies, time.perf_counter() - started)
+
+
+async def bench_pooled(leads: int, concurrency: int) -> None:
+    async with AsyncMondayClient() as client:
+        await client.create_lead_with_roi(LEAD, ROI)  # open the pool
+        semaphore = asyncio.Semaphore(concurrency)
+        latencies = []
+
+        async def one() -> None:
+            async with semaphore:
+                t0 = time.perf_counter()
+                await client.create_lead_with_roi(LEAD, ROI)
+                latencies.append(time.perf_counter() - t0)
+
+        started = time.perf_counter()
+        await asyncio.gather(*(one() for _ in range(leads)))
+        summarize(f"pooled x{concurrency}", latencies, time.perf_counter() - started)
+
+
+def main(leads: int = 500) -> None:
+    # The stub gets its own process so it does not share a GIL with the clients
+    port = multiprocessing.Value("i", 0)
+    server = multiprocessing.Process(target=serve, args=(port,), daemon=True)
+    server.start()
+    while not port.value:
+        time.sleep(0.01)
+    os.environ["MONDAY_API_URL"] = f"http://127.0.0.1:{port.value}"
+    os.environ.setdefault("MONDAY_API_TOKEN", "bench")
+
+    print(f"{'case':<20} {'p50 ms':>8} {'p99 ms':>8} {'leads/s':>10}")
+    bench_requests(leads)
+    asyncio.run(bench_pooled(leads, 1))
+    asyncio.run(bench_pooled(leads, 8))
+    server.terminate()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,80 @@
+"""Per-request cost of RateLimitMiddleware on the allow path.
+
+Compares, per request:
+  bare          - the ASGI app called directly
+  memory        - behind RateLimitMiddleware with the default in-process buckets
+  memory_route  - the same, on a path with a per-route limit (two buckets)
+  sqlite        - behind RateLimitMiddleware sharing buckets through SqliteBucketStore,
+                  whose checks run in a worker thread
+
+and the bucket check alone (`take`), which is what the middleware adds on
+top of one extra ASGI call. Requests come from many client IPs so that every
+one is allowed.
+
+Run from the backend directory:
+
+    python -m benchmarks.bench_rate_limit
+"""
+
+import asyncio
+import tempfile
+import time
+
+from app.internal.mw.ratelimit_mw import DEFAULT_CLIENT_LIMIT, MemoryBucketStore, RateLimitMiddleware, SqliteBucketStore
+
+CLIENTS = 10_000
+
+
+async def app(scope, receive, send):
+    pass
+
+
+async def noop(*args):
+    pass
+
+
+def scopes(path: str):
+    return [
+        {"type": "http", "path": path, "root_path": "", "headers": [], "client": (f"10.0.{i // 256}.{i % 256}", 1234)}
+        for i in range(CLIENTS)
+    ]
+
+
+async def per_request(handler, path: str, rounds: int) -> float:
+    requests = scopes(path)
+    started = time.perf_counter()
+    for _ in range(rounds):
+        for scope in requests:
+            await handler(scope, noop, noop)
+    return (time.perf_counter() - started) / (rounds * len(requests))
+
+
+def per_take(store, rounds: int) -> float:
+    buckets = [[(f"10.0.{i // 256}.{i % 256}", DEFAULT_CLIENT_LIMIT)] for i in range(CLIENTS)]
+    take = store.take
+    now = time.time()
+    started = time.perf_counter()
+    for _ in range(rounds):
+        for bucket in buckets:
+            take(bucket, now)
+    return (time.perf_counter() - started) / (rounds * len(buckets))
+
+
+async def main() -> None:
+    sqlite_store = SqliteBucketStore(tempfile.mkdtemp() + "/buckets.sqlite3")
+    cases = {
+        "bare": (app, "/roi/profiles", 20),
+        "memory": (RateLimitMiddleware(app), "/roi/profiles", 20),
+        "memory_route": (RateLimitMiddleware(app), "/roi/calculate", 20),
+        "sqlite": (RateLimitMiddleware(app, store=sqlite_store), "/roi/profiles", 1),
+    }
+    print(f"{'case':<14} {'us/request':>10}")
+    for name, (handler, path, rounds) in cases.items():
+        await per_request(handler, path, 1)
+        print(f"{name:<14} {await per_request(handler, path, rounds) * 1e6:>10.3f}")
+    print(f"{'take (memory)':<14} {per_take(MemoryBucketStore(), 50) * 1e6:>10.3f}")
+    print(f"{'take (sqlite)':<14} {per_take(SqliteBucketStore(tempfile.mkdtemp() + '/b.sqlite3'), 1) * 1e6:>10.3f}")
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
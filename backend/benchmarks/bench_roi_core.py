@@ -0,0 +1,78 @@
+"""Microbenchmark for the ROI compute core and the payloads built from it.
+
+Compares, per call:
+  validate       - the validated result as a standalone copy: compute core + one
+                   nested model_validate of the whole result
+  calculate_roi  - calculate_roi, what the lead path uses; it needs the models,
+                   and one model_validate is still the cheapest way to build them
+  validate_json  - the /roi/calculate cache-miss body as it was: the validated
+                   result + model_dump_json
+  to_json        - the cache-miss body now: compute core serialized directly
+  core           - compute_roi only, what library and batch callers use
+
+Run from the backend directory:
+
+    python -m benchmarks.bench_roi_core
+"""
+
+import timeit
+import tracemalloc
+
+from app.libs.domain_model import RoiCalculationResult, RoiInputs
+from app.libs.roi_calculator import RoiComputation, calculate_roi, compute_roi
+
+PAYLOAD = RoiInputs(hours_per_week=25, labor_rate=45, tool_cost=750, industry="manufacturing")
+
+
+def validated_result(payload: RoiInputs) -> RoiCalculationResult:
+    c: RoiComputation = compute_roi(payload.hours_per_week, payload.labor_rate, payload.tool_cost, payload.industry)
+    return RoiCalculationResult.model_validate(
+        {
+            "profile": c.profile,
+            "inputs": payload,
+            "metrics": c.metrics_dict(),
+            "chart": [
+                {"name": "Current Cost", "annual": c.annual_labor_cost},
+                {"name": "Automated Cost", "annual": max(c.automated_cost, 0)},
+            ],
+            "narrative": {
+                "headline": f"${c.net_annual_savings:,.0f} in net savings within year one",
+                "highlights": c.highlights(),
+            },
+        }
+    )
+
+
+def core() -> RoiComputation:
+    return compute_roi(PAYLOAD.hours_per_week, PAYLOAD.labor_rate, PAYLOAD.tool_cost, PAYLOAD.industry)
+
+
+CASES = {
+    "validate": lambda: validated_result(PAYLOAD),
+    "calculate_roi": lambda: calculate_roi(PAYLOAD),
+    "validate_json": lambda: validated_result(PAYLOAD).model_dump_json().encode(),
+    "to_json": lambda: core().to_json(),
+    "core": core,
+}
+
+
+def peak_bytes(fn) -> int:
+    fn()
+    tracemalloc.start()
+    tracemalloc.reset_peak()
+    before, _ = tracemalloc.get_traced_memory()
+    fn()
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return peak - before
+
+
+def main(number: int = 20_000) -> None:
+    print(f"{'case':<14} {'us/call':>9} {'peak bytes/call':>16}")
+    for name, fn in CASES.items():
+        seconds = min(timeit.repeat(fn, number=number, repeat=5))
+        print(f"{name:<14} {seconds / number * 1e6:>9.2f} {peak_bytes(fn):>16,}")
+
+
+if __name__ == "__main__":
+    main()
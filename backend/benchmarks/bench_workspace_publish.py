@@ -0,0 +1,111 @@
+"""Request latency with WorkspacePublishMiddleware against a devx that takes time to answer.
+
+Compares, per request to a trivial JSON route:
+  none     - no publishing
+  awaited  - both events posted to devx inline around the request, as the
+             middleware used to do with DevxClient.notify_devx_async
+  queued   - events handed to EventPublisher, posted in batches in the background
+
+devx is an httpx.MockTransport that answers every post after DEVX_LATENCY
+seconds, standing in for the round trip to the devx server. Also reports how
+many events the queued publisher posted, dropped and left unsent.
+
+Run from the backend directory:
+
+    python -m benchmarks.bench_workspace_publish
+"""
+
+import asyncio
+import time
+
+import httpx
+from fastapi import FastAPI
+
+import app.internal.notifications as notifications
+from app.internal.config import Config
+from app.internal.exceptionmodel import ExceptionModel
+from app.internal.messages import RequestFinished, RequestStarted, Topics
+from app.internal.mw.requestid_mw import RequestIdMiddleware
+from app.internal.mw.workspace_mw import WorkspacePublishMiddleware
+from app.internal.publisher import EventPublisher
+from app.internal.utils import utc_now
+
+DEVX_LATENCY = 0.002
+REQUESTS = 500
+
+
+async def devx_handler(request: httpx.Request) -> httpx.Response:
+    await asyncio.sleep(DEVX_LATENCY)
+    return httpx.Response(200)
+
+
+def e2m(ex: BaseException) -> ExceptionModel:
+    raise NotImplementedError
+
+
+def make_app(publish=None) -> FastAPI:
+    app = FastAPI()
+
+    @app.get("/ping")
+    def ping():
+        return {"ok": True}
+
+    if publish is not None:
+        app.add_middleware(WorkspacePublishMiddleware, exception_to_model=e2m, publish=publish)
+    app.add_middleware(RequestIdMiddleware)
+    return app
+
+
+def awaiting_publish(app, devx: notifications.DevxClient):
+    async def wrapped(scope, receive, send):
+        if scope["type"] != "http":
+            await app(scope, receive, send)
+            return
+        started = RequestStarted(requestId="req-1", method=scope["method"], url=scope["path"], timestamp=utc_now())
+        await devx.notify_devx_async(Topics.request_started, started)
+        start_time = time.monotonic()
+        await app(scope, receive, send)
+        finished = RequestFinished(
+            requestId="req-1",
+            method=scope["method"],
+            url=scope["path"],
+            timestamp=utc_now(),
+            duration=time.monotonic() - start_time,
+            statusCode=200,
+        )
+        await devx.notify_devx_async(Topics.request_finished, finished)
+
+    return wrapped
+
+
+async def per_request(app, number: int) -> float:
+    client = httpx.AsyncClient(transport=httpx.ASGITransport(app), base_url="http://test")
+    async with client:
+        started = time.perf_counter()
+        for _ in range(number):
+            await client.get("/ping")
+        return (time.perf_counter() - started) / number
+
+
+async def main() -> None:
+    devx = notifications.DevxClient(
+        Config(DEVX_URL_INTERNAL="http://devx"), async_transport=httpx.MockTransport(devx_handler)
+    )
+    publisher = EventPublisher(devx.notify_devx_batch_async)
+    publisher.start()
+    results = {
+        "none": await per_request(make_app(), REQUESTS),
+        "awaited": await per_request(awaiting_publish(make_app(), devx), REQUESTS),
+        "queued": await per_request(make_app(publisher.publish), REQUESTS),
+    }
+    await publisher.stop()
+    await devx.aclose()
+    print(f"devx latency {DEVX_LATENCY * 1e3:.1f} ms, {REQUESTS} requests")
+    print(f"{'publish':<8} {'ms/request':>10}")
+    for name, seconds in results.items():
+        print(f"{name:<8} {seconds * 1e3:>10.3f}")
+    print(f"queued: published {publisher.published}, dropped {publisher.dropped}, unsent {len(publisher)}")
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
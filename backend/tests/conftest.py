@@ -0,0 +1,31 @@
+from __future__ import annotations
+
+import pytest
+
+from app.libs.lead_store import LeadStore
+from app.libs.monday_client import AsyncMondayClient
+
+from .monday_fake import FakeMonday
+
+
+@pytest.fixture
+def fake_monday() -> FakeMonday:
+    return FakeMonday()
+
+
+@pytest.fixture
+def monday_client(fake_monday: FakeMonday) -> AsyncMondayClient:
+    return AsyncMondayClient(
+        api_token="test-token",
+        api_url="https://api.monday.test/v2",
+        http2=False,
+        transport=fake_monday.transport(),
+    )
+
+
+@pytest.fixture
+def lead_store(tmp_path):
+    store = LeadStore(str(tmp_path / "leads.sqlite3"), max_delay=0.0, dedup_window=0)
+    store.start()
+    yield store
+    store.close()
@@ -0,0 +1,79 @@
+"""Fake Monday.com API and sample leads shared by the tests."""
+
+from __future__ import annotations
+
+import itertools
+import json
+import re
+from typing import Any, Dict, List, Optional, Set
+
+import httpx
+
+from app.libs.domain_model import RoiInputs
+from app.libs.monday_client import LeadDetails
+from app.libs.roi_calculator import calculate_roi
+
+# `alias: create_item(` in batched documents, bare `create_item(` in single ones
+MUTATION = re.compile(r"(?:(\w+): )?(create_item|create_update)\(")
+
+ROI = calculate_roi(RoiInputs(hours_per_week=25, labor_rate=45, tool_cost=750, industry="manufacturing"))
+# The tool costs more than it saves, so there is no payback period
+ROI_NO_PAYBACK = calculate_roi(RoiInputs(hours_per_week=1, labor_rate=10, tool_cost=5000, industry="manufacturing"))
+
+
+def lead(name: str) -> LeadDetails:
+    return LeadDetails(name=name, email=f"{name.lower()}@example.com", company=f"{name} Inc", phone="5550100")
+
+
+class FakeMonday:
+    """Monday.com GraphQL endpoint for `httpx.MockTransport`.
+
+    Creates items and updates in memory and answers single and aliased batch
+    documents the way Monday does. `responses` are returned as they are, in
+    order, before the fake answers normally again; an item whose name contains
+    one of `failing_updates` gets a GraphQL error for its create_update.
+    """
+
+    def __init__(self) -> None:
+        self.items: Dict[str, str] = {}
+        self.updates: Dict[str, str] = {}
+        self.responses: List[httpx.Response] = []
+        self.failing_updates: Set[str] = set()
+        self.documents = 0
+        self._ids = itertools.count(1)
+
+    def transport(self) -> httpx.MockTransport:
+        return httpx.MockTransport(self.handler)
+
+    def handler(self, request: httpx.Request) -> httpx.Response:
+        self.documents += 1
+        if self.responses:
+            return self.responses.pop(0)
+        body = json.loads(request.content)
+        variables: Dict[str, Any] = body["variables"]
+        data: Dict[str, Any] = {}
+        errors: List[Dict[str, Any]] = []
+        for alias, field in MUTATION.findall(body["query"]):
+            suffix = alias[1:] if alias else ""
+            key = alias or field
+            if field == "create_item":
+                item_id = str(next(self._ids))
+                self.items[item_id] = variables[f"itemName{suffix}"]
+                data[key] = {"id": item_id}
+                continue
+            item_id = variables[f"itemId{suffix}"]
+            if any(name in self.items.get(item_id, "") for name in self.failing_updates):
+                data[key] = None
+                errors.append({"message": "Update rejected", "path": [key]})
+                continue
+            update_id = f"u{next(self._ids)}"
+            self.updates[update_id] = variables[f"body{suffix}"]
+            data[key] = {"id": update_id}
+        data["complexity"] = {"query": 30_000, "before": 10_000_000, "after": 9_970_000, "reset_in_x_seconds": 60}
+        payload: Dict[str, Any] = {"data": data}
+        if errors:
+            payload["errors"] = errors
+        return httpx.Response(200, json=payload)
+
+    def update_for(self, name: str) -> Optional[str]:
+        return next((body for body in self.updates.values() if f"Lead: {name} " in body), None)
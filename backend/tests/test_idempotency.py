@@ -0,0 +1,31 @@
+import threading
+
+import pytest
+
+from app.libs.idempotency import IdempotencyInProgressError, IdempotencyStore, IdempotentResponse
+
+
+def test_duplicate_of_a_slow_leader_is_in_progress(tmp_path):
+    store = IdempotencyStore(str(tmp_path / "idempotency.sqlite3"), lease=0.1)
+    started, finish = threading.Event(), threading.Event()
+
+    def slow_handler() -> IdempotentResponse:
+        started.set()
+        finish.wait(timeout=5)
+        return IdempotentResponse(200, b'{"ok": true}')
+
+    leader = threading.Thread(target=store.run, args=("key-1", "hash", slow_handler))
+    leader.start()
+    try:
+        assert started.wait(timeout=5)
+        # Outlasts the lease while the leader is still running
+        with pytest.raises(IdempotencyInProgressError):
+            store.run("key-1", "hash", slow_handler)
+    finally:
+        finish.set()
+        leader.join(timeout=5)
+
+    replay = store.run("key-1", "hash", slow_handler)
+    assert (replay.status_code, replay.body, replay.replayed) == (200, b'{"ok": true}', True)
+    assert store.stats.executed == 1
+    store.close()
@@ -0,0 +1,184 @@
+import asyncio
+import sqlite3
+import time
+
+import httpx
+
+from app.libs.lead_outbox import OutboxWorker
+from app.libs.lead_store import LeadStore, new_lead_record
+from app.libs.monday_client import AsyncMondayClient
+from app.libs.monday_governor import MondayGovernor
+
+from .monday_fake import ROI, ROI_NO_PAYBACK, FakeMonday, lead
+
+
+def add_leads(store: LeadStore, *leads) -> list:
+    records = [new_lead_record(details, roi) for details, roi in leads]
+    for future in [store.append(record) for record in records]:
+        future.result(timeout=5)
+    return [record.lead_id for record in records]
+
+
+def outbox_rows(store: LeadStore) -> dict:
+    conn = store.open_reader()
+    try:
+        rows = conn.execute("SELECT lead_id, status, attempts, item_id, update_id, last_error FROM lead_outbox")
+        return {row[0]: row[1:] for row in rows}
+    finally:
+        conn.close()
+
+
+def test_missing_payback_does_not_duplicate_items(lead_store, fake_monday: FakeMonday, monday_client):
+    lead_ids = add_leads(
+        lead_store, (lead("Ada"), ROI), (lead("Bob"), ROI_NO_PAYBACK), (lead("Cy"), ROI), (lead("Di"), ROI)
+    )
+    worker = OutboxWorker(lead_store, monday_client, concurrency=1)
+
+    asyncio.run(worker.drain())
+
+    rows = outbox_rows(lead_store)
+    assert [rows[lead_id][0] for lead_id in lead_ids] == ["delivered"] * 4
+    assert len(fake_monday.items) == 4
+    assert worker.dead == 0
+
+
+def outbox_value(store: LeadStore, lead_id: str, column: str):
+    conn = store.open_reader()
+    try:
+        return conn.execute(f"SELECT {column} FROM lead_outbox WHERE lead_id = ?", (lead_id,)).fetchone()[0]
+    finally:
+        conn.close()
+
+
+def make_due(store: LeadStore) -> None:
+    """Skip the backoff of every pending delivery."""
+
+    conn = sqlite3.connect(store.path)
+    try:
+        conn.execute("UPDATE lead_outbox SET next_attempt_at = 0 WHERE status = 'pending'")
+        conn.commit()
+    finally:
+        conn.close()
+
+
+def test_delivers_due_leads(lead_store, fake_monday: FakeMonday, monday_client):
+    lead_ids = add_leads(lead_store, (lead("Ada"), ROI), (lead("Bob"), ROI), (lead("Cy"), ROI))
+    worker = OutboxWorker(lead_store, monday_client, concurrency=2)
+
+    assert asyncio.run(worker.drain()) == 3
+
+    rows = outbox_rows(lead_store)
+    for lead_id in lead_ids:
+        status, attempts, item_id, update_id, last_error = rows[lead_id]
+        assert (status, attempts, last_error) == ("delivered", 1, None)
+        assert item_id in fake_monday.items and update_id in fake_monday.updates
+    assert worker.delivered == 3
+    assert lead_store.outbox_counts() == {"delivered": 3}
+
+
+def test_failed_delivery_backs_off_then_retries(lead_store, fake_monday: FakeMonday, monday_client):
+    (lead_id,) = add_leads(lead_store, (lead("Ada"), ROI))
+    fake_monday.responses = [httpx.Response(500)]
+    worker = OutboxWorker(lead_store, monday_client, base_backoff=60.0)
+
+    before = time.time()
+    asyncio.run(worker.drain())
+
+    status, attempts, item_id, _, last_error = outbox_rows(lead_store)[lead_id]
+    assert (status, attempts, item_id) == ("pending", 1, None)
+    assert "500" in last_error
+    # Jittered between half and all of the first backoff step
+    next_attempt_at = outbox_value(lead_store, lead_id, "next_attempt_at")
+    assert before + 30.0 <= next_attempt_at <= time.time() + 60.0
+    assert worker.retried == 1
+
+    # Not due yet
+    assert asyncio.run(worker.drain()) == 0
+
+    make_due(lead_store)
+    asyncio.run(worker.drain())
+
+    assert outbox_rows(lead_store)[lead_id][:2] == ("delivered", 2)
+    assert len(fake_monday.items) == 1
+
+
+def test_partial_delivery_resumes_from_created_item(lead_store, fake_monday: FakeMonday, monday_client):
+    ada, bob = add_leads(lead_store, (lead("Ada"), ROI), (lead("Bob"), ROI))
+    fake_monday.failing_updates = {"Bob"}
+    worker = OutboxWorker(lead_store, monday_client, concurrency=1, base_backoff=60.0)
+
+    asyncio.run(worker.drain())
+
+    rows = outbox_rows(lead_store)
+    assert rows[ada][0] == "delivered"
+    status, attempts, item_id, update_id, last_error = rows[bob]
+    assert (status, attempts, update_id) == ("pending", 1, None)
+    assert item_id in fake_monday.items
+    assert "Update rejected" in last_error
+
+    fake_monday.failing_updates = set()
+    make_due(lead_store)
+    asyncio.run(worker.drain())
+
+    status, _, retried_item_id, update_id, _ = outbox_rows(lead_store)[bob]
+    assert (status, retried_item_id) == ("delivered", item_id)
+    assert update_id in fake_monday.updates
+    assert len(fake_monday.items) == 2
+
+
+def test_dead_letters_after_max_attempts(lead_store, fake_monday: FakeMonday, monday_client):
+    (lead_id,) = add_leads(lead_store, (lead("Ada"), ROI))
+    fake_monday.responses = [httpx.Response(500) for _ in range(3)]
+    # No backoff, so one drain keeps retrying until the lead is given up on
+    worker = OutboxWorker(lead_store, monday_client, max_attempts=3, base_backoff=0.0)
+
+    asyncio.run(worker.drain())
+
+    status, attempts, _, _, last_error = outbox_rows(lead_store)[lead_id]
+    assert (status, attempts) == ("dead", 3)
+    assert worker.retried == 2 and worker.dead == 1
+    conn = lead_store.open_reader()
+    try:
+        dead = conn.execute("SELECT lead_id, attempts, error FROM lead_dead_letters").fetchall()
+    finally:
+        conn.close()
+    assert dead == [(lead_id, 3, last_error)]
+    assert fake_monday.items == {}
+
+
+def test_expired_lease_is_claimed_again(lead_store, fake_monday: FakeMonday, monday_client):
+    lead_ids = add_leads(lead_store, (lead("Ada"), ROI), (lead("Bob"), ROI))
+
+    # A worker claims the leads and dies without settling them
+    claimed = lead_store.claim_outbox(10, lease=0.2)
+    assert sorted(item.lead_id for item in claimed) == sorted(lead_ids)
+    assert lead_store.claim_outbox(10, lease=0.2) == []
+    assert lead_store.outbox_counts() == {"delivering": 2}
+
+    time.sleep(0.3)
+    worker = OutboxWorker(lead_store, monday_client)
+
+    assert asyncio.run(worker.drain()) == 2
+    assert lead_store.outbox_counts() == {"delivered": 2}
+
+
+def test_rate_limited_delivery_is_deferred_without_an_attempt(lead_store, fake_monday: FakeMonday):
+    (lead_id,) = add_leads(lead_store, (lead("Ada"), ROI))
+    fake_monday.responses = [httpx.Response(429, headers={"Retry-After": "30"})]
+    client = AsyncMondayClient(
+        api_token="test-token",
+        api_url="https://api.monday.test/v2",
+        http2=False,
+        transport=fake_monday.transport(),
+        governor=MondayGovernor(),
+    )
+    worker = OutboxWorker(lead_store, client)
+
+    before = time.time()
+    asyncio.run(worker.drain())
+
+    status, attempts, item_id, _, _ = outbox_rows(lead_store)[lead_id]
+    assert (status, attempts, item_id) == ("pending", 0, None)
+    next_attempt_at = outbox_value(lead_store, lead_id, "next_attempt_at")
+    assert next_attempt_at >= before + 30.0
+    assert worker.deferred == 1 and worker.retried == 0
@@ -0,0 +1,46 @@
+import base64
+import json
+
+import pytest
+
+from app.libs.lead_export import LeadExportError
+from app.libs.lead_query import LeadQuery, run_lead_query
+
+from .monday_fake import ROI, lead
+from .test_lead_outbox import add_leads
+
+
+def cursor_for(decoded) -> str:
+    return base64.urlsafe_b64encode(json.dumps(decoded).encode()).decode().rstrip("=")
+
+
+@pytest.mark.parametrize(
+    "cursor",
+    [
+        "not base64!",
+        cursor_for(5),
+        cursor_for(None),
+        cursor_for("created_at"),
+        cursor_for({"sort": "created_at"}),
+        cursor_for(["created_at", "desc", 1.0]),
+        cursor_for(["created_at", "desc", {"at": 1.0}, 7]),
+        cursor_for(["created_at", "desc", 1.0, "7"]),
+        cursor_for(["net_annual_savings", "desc", 1.0, 7]),
+    ],
+)
+def test_bad_cursor_is_a_lead_export_error(cursor: str):
+    with pytest.raises(LeadExportError):
+        LeadQuery(cursor=cursor).sql()
+
+
+def test_cursor_pages_through_leads(lead_store):
+    add_leads(lead_store, (lead("Ada"), ROI), (lead("Bob"), ROI), (lead("Cy"), ROI))
+    conn = lead_store.open_reader()
+    try:
+        first = run_lead_query(conn, LeadQuery(limit=2))
+        rest = run_lead_query(conn, LeadQuery(limit=2, cursor=first.next_cursor))
+    finally:
+        conn.close()
+
+    assert len(first.leads) == 2 and first.next_cursor
+    assert len(rest.leads) == 1 and rest.next_cursor is None
@@ -0,0 +1,30 @@
+from app.libs.lead_search import LeadSearchIndex, search_leads
+from app.libs.lead_store import new_lead_record
+from app.libs.monday_client import LeadDetails
+
+from .monday_fake import ROI
+
+
+def test_highlights_escape_stored_markup(lead_store):
+    details = LeadDetails(
+        name="Eve",
+        email="eve@example.com",
+        company='<img src=x onerror="alert(1)"> Robotics',
+        phone="5550100",
+        notes="<script>alert(1)</script> wants robots & more",
+    )
+    lead_store.append(new_lead_record(details, ROI)).result(timeout=5)
+    index = LeadSearchIndex(lead_store)
+    index.start()
+    try:
+        index.refresh()
+        conn = lead_store.open_reader()
+        try:
+            (hit,) = search_leads(conn, "robot").hits
+        finally:
+            conn.close()
+    finally:
+        index.close()
+
+    assert hit.company == "&lt;img src=x onerror=&quot;alert(1)&quot;&gt; <mark>Robotics</mark>"
+    assert hit.notes == "&lt;script&gt;alert(1)&lt;/script&gt; wants <mark>robots</mark> &amp; more"
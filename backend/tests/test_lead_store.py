@@ -0,0 +1,35 @@
+import queue
+
+import pytest
+
+from app.libs.lead_store import LeadStore, LeadStoreError, new_lead_record
+
+from .monday_fake import ROI, lead
+
+
+def test_rejected_lead_does_not_absorb_its_retry(tmp_path, monkeypatch):
+    store = LeadStore(str(tmp_path / "leads.sqlite3"), max_delay=0.0)
+    store.start()
+    try:
+        rejected = new_lead_record(lead("Ada"), ROI)
+
+        def full(item):
+            raise queue.Full
+
+        with monkeypatch.context() as patch:
+            patch.setattr(store._queue, "put_nowait", full)
+            with pytest.raises(LeadStoreError):
+                store.append(rejected)
+
+        retry = new_lead_record(lead("Ada"), ROI)
+        store.append(retry).result(timeout=5)
+
+        assert not retry.merged and retry.lead_id != rejected.lead_id
+        assert store._pending_keys == {}
+        conn = store.open_reader()
+        try:
+            assert conn.execute("SELECT lead_id FROM leads").fetchall() == [(retry.lead_id,)]
+        finally:
+            conn.close()
+    finally:
+        store.close()
@@ -0,0 +1,45 @@
+import queue
+
+import pytest
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+
+import app.apis.leads as leads_api
+from app.apis.leads import router
+from app.libs.idempotency import IdempotencyStore
+
+SUBMISSION = {
+    "contact": {"name": "Ada Lovelace", "email": "ada@example.com", "company": "Analytical", "phone": "555-0100"},
+    "inputs": {"hours_per_week": 20, "labor_rate": 50, "tool_cost": 100, "industry": "manufacturing"},
+}
+
+
+@pytest.fixture
+def client(lead_store, tmp_path, monkeypatch) -> TestClient:
+    idempotency_store = IdempotencyStore(str(tmp_path / "idempotency.sqlite3"))
+    monkeypatch.setattr(leads_api, "get_lead_store", lambda: lead_store)
+    monkeypatch.setattr(leads_api, "get_idempotency_store", lambda: idempotency_store)
+    app = FastAPI()
+    app.include_router(router)
+    yield TestClient(app)
+    idempotency_store.close()
+
+
+def full(item):
+    raise queue.Full
+
+
+@pytest.mark.parametrize("headers", [{}, {"Idempotency-Key": "submit-1"}])
+def test_full_lead_store_is_a_retryable_503(client: TestClient, lead_store, monkeypatch, headers: dict):
+    with monkeypatch.context() as patch:
+        patch.setattr(lead_store._queue, "put_nowait", full)
+        response = client.post("/leads/submit", json=SUBMISSION, headers=headers)
+
+    assert response.status_code == 503
+    assert response.headers["Retry-After"] == "1"
+
+    retry = client.post("/leads/submit", json=SUBMISSION, headers=headers)
+
+    assert retry.status_code == 200
+    assert "Idempotent-Replayed" not in retry.headers
+    assert retry.json()["lead_id"]
@@ -0,0 +1,48 @@
+import asyncio
+
+from app.libs.monday_client import AsyncMondayClient
+
+from .monday_fake import ROI, ROI_NO_PAYBACK, FakeMonday, lead
+
+
+def test_update_body_without_payback():
+    body = AsyncMondayClient._format_update_body(lead("Ada"), ROI_NO_PAYBACK)
+
+    assert "Payback: n/a\n" in body
+
+
+def test_batch_with_missing_payback_delivers_every_lead(fake_monday: FakeMonday, monday_client: AsyncMondayClient):
+    leads = [(lead("Ada"), ROI), (lead("Bob"), ROI_NO_PAYBACK), (lead("Cy"), ROI), (lead("Di"), ROI)]
+
+    results = asyncio.run(monday_client.create_leads_with_roi(leads))
+
+    assert [result.error for result in results] == [None] * 4
+    assert all(result.item_id and result.update_id for result in results)
+    assert len(fake_monday.items) == 4
+    assert "Payback: n/a" in fake_monday.update_for("Bob")
+
+
+def test_unrenderable_update_fails_only_its_lead(fake_monday: FakeMonday, monday_client: AsyncMondayClient, monkeypatch):
+    format_update_body = AsyncMondayClient._format_update_body
+
+    def failing_for_bob(lead_details, roi):
+        if lead_details.name == "Bob":
+            raise TypeError("cannot render")
+        return format_update_body(lead_details, roi)
+
+    monkeypatch.setattr(AsyncMondayClient, "_format_update_body", staticmethod(failing_for_bob))
+    leads = [(lead("Ada"), ROI), (lead("Bob"), ROI), (lead("Cy"), ROI)]
+
+    results = asyncio.run(monday_client.create_leads_with_roi(leads))
+
+    ada, bob, cy = results
+    assert ada.update_id and cy.update_id and ada.error is None and cy.error is None
+    assert bob.item_id is not None and bob.update_id is None
+    assert bob.error == "TypeError: cannot render"
+
+    # Resuming from the known item only sends the update
+    monkeypatch.setattr(AsyncMondayClient, "_format_update_body", staticmethod(format_update_body))
+    (retried,) = asyncio.run(monday_client.create_leads_with_roi([(lead("Bob"), ROI)], item_ids=[bob.item_id]))
+
+    assert retried.error is None and retried.item_id == bob.item_id and retried.update_id
+    assert len(fake_monday.items) == 3
@@ -0,0 +1,69 @@
+import asyncio
+
+import pytest
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+
+from app.internal.mw.ratelimit_mw import MemoryBucketStore, RateLimit, RateLimitMiddleware, SqliteBucketStore
+
+CLIENT = RateLimit(rate=1.0, burst=3)
+ROUTE = RateLimit(rate=1.0, burst=1)
+
+
+@pytest.fixture(params=["memory", "sqlite"])
+def store(request, tmp_path):
+    if request.param == "memory":
+        return MemoryBucketStore()
+    return SqliteBucketStore(str(tmp_path / "buckets.sqlite3"))
+
+
+def test_route_denial_does_not_spend_the_client_token(store):
+    buckets = [("10.0.0.1", CLIENT), ("10.0.0.1 /roi/calculate", ROUTE)]
+
+    assert store.take(buckets, 100.0) == 0.0
+    # The route bucket is empty; the client bucket must keep its two tokens
+    assert store.take(buckets, 100.0) == pytest.approx(1.0)
+    assert store.take(buckets, 100.0) == pytest.approx(1.0)
+
+    assert store.take(buckets[:1], 100.0) == 0.0
+    assert store.take(buckets[:1], 100.0) == 0.0
+    assert store.take(buckets[:1], 100.0) == pytest.approx(1.0)
+
+
+def test_wait_is_until_every_bucket_has_a_token(store):
+    client, route = ("10.0.0.1", CLIENT), ("10.0.0.1 /leads/submit", RateLimit(rate=0.5, burst=1))
+
+    for _ in range(3):
+        store.take([client], 100.0)
+
+    assert store.take([client, route], 100.0) == pytest.approx(1.0)
+    assert store.take([client, route], 101.0) == 0.0
+    assert store.take([client, route], 101.5) == pytest.approx(1.5)
+
+
+def test_sqlite_checks_run_off_the_event_loop(tmp_path):
+    store = SqliteBucketStore(str(tmp_path / "buckets.sqlite3"))
+    on_loop = []
+    take = store.take
+
+    def recording_take(buckets, now):
+        try:
+            asyncio.get_running_loop()
+            on_loop.append(True)
+        except RuntimeError:
+            on_loop.append(False)
+        return take(buckets, now)
+
+    store.take = recording_take
+    app = FastAPI()
+
+    @app.get("/ping")
+    async def ping():
+        return {}
+
+    app.add_middleware(RateLimitMiddleware, client_limit=CLIENT, route_limits={"/ping": ROUTE}, store=store)
+    client = TestClient(app)
+
+    assert client.get("/ping").status_code == 200
+    assert client.get("/ping").status_code == 429
+    assert on_loop == [False, False]
@@ -0,0 +1,102 @@
+import csv
+import io
+import json
+
+import pytest
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+
+from app.apis.roi import router
+from app.libs.domain_model import MAX_BATCH_ROWS
+
+
+@pytest.fixture
+def client() -> TestClient:
+    app = FastAPI()
+    app.include_router(router)
+    return TestClient(app)
+
+
+@pytest.mark.parametrize("field", ["hours_per_week", "labor_rate", "tool_cost"])
+@pytest.mark.parametrize("value", ["nan", "inf", "-inf"])
+def test_get_calculate_rejects_non_finite_inputs(client: TestClient, field: str, value: str):
+    params = {"hours_per_week": 20, "labor_rate": 50, "tool_cost": 100, field: value}
+
+    response = client.get("/roi/calculate", params=params)
+
+    assert response.status_code == 422
+
+
+def test_get_calculate_snaps_finite_inputs(client: TestClient):
+    response = client.get("/roi/calculate", params={"hours_per_week": 20.2, "labor_rate": 50, "tool_cost": 100})
+
+    assert response.status_code == 200
+    assert response.json()["inputs"]["hours_per_week"] == 20
+
+
+def batch_body(rows: int) -> dict:
+    return {
+        "hours_per_week": [20.0] * rows,
+        "labor_rate": [50.0] * rows,
+        "tool_cost": [100.0] * rows,
+        "industry": ["manufacturing"] * rows,
+    }
+
+
+def test_batch_accepts_max_rows(client: TestClient):
+    response = client.post("/roi/calculate-batch", json=batch_body(MAX_BATCH_ROWS))
+
+    assert response.status_code == 200
+    assert len(response.json()["profile"]) == MAX_BATCH_ROWS
+
+
+@pytest.mark.parametrize("path", ["/roi/calculate-batch", "/roi/solve"])
+def test_batch_rejects_more_than_max_rows(client: TestClient, path: str):
+    body = batch_body(MAX_BATCH_ROWS + 1)
+    if path == "/roi/solve":
+        body.update(solve_for="tool_cost", target="break_even")
+
+    response = client.post(path, json=body)
+
+    assert response.status_code == 422
+
+
+def prospect_csv(rows: int, tail: bytes) -> bytes:
+    lines = ["company,hours_per_week,labor_rate,tool_cost,industry"]
+    lines += [f"Prospect {i},20,50,100,manufacturing" for i in range(rows)]
+    return ("\n".join(lines) + "\n").encode() + tail
+
+
+# Past the header and the first decoded block, so the response has already started
+BAD_TAILS = {
+    "bad utf-8": b"Broken \xff\xfe,20,50,100,general\n",
+    "oversized field": b'"' + b"x" * 200_000 + b'",20,50,100,general\n',
+}
+
+
+@pytest.mark.parametrize("tail", BAD_TAILS.values(), ids=BAD_TAILS.keys())
+def test_score_csv_ndjson_ends_with_an_error_record(client: TestClient, tail: bytes):
+    upload = prospect_csv(3000, tail)
+
+    response = client.post("/roi/score-csv", files={"file": ("prospects.csv", upload, "text/csv")})
+
+    assert response.status_code == 200
+    *scored, error = [json.loads(line) for line in response.text.splitlines()]
+    # Rows decoded before the bad block are scored; the last record says where reading stopped
+    assert 2000 <= len(scored) <= 3000
+    assert all(record["error"] is None for record in scored)
+    assert error.keys() == {"error"} and f"after line {len(scored) + 1}:" in error["error"]
+
+
+def test_score_csv_csv_ends_with_an_error_row(client: TestClient):
+    upload = prospect_csv(3000, BAD_TAILS["bad utf-8"])
+
+    response = client.post(
+        "/roi/score-csv", params={"format": "csv"}, files={"file": ("prospects.csv", upload, "text/csv")}
+    )
+
+    assert response.status_code == 200
+    *scored, error = csv.DictReader(io.StringIO(response.text))
+    assert 2000 <= len(scored) <= 3000
+    assert all(row["error"] == "" for row in scored)
+    assert error["company"] == "" and error["error"].startswith(f"CSV could not be read after line {len(scored) + 1}:")
@@ -0,0 +1,70 @@
+import asyncio
+
+import pytest
+from fastapi.testclient import TestClient
+
+from app.libs.lead_outbox import OutboxWorker
+from app.libs.monday_client import AsyncMondayClient
+from app.libs.monday_governor import MondayGovernor
+from app.main_prod import app
+
+from .monday_fake import ROI, FakeMonday, lead
+from .test_lead_outbox import add_leads
+
+STATS_PATHS = ["/leads/delivery-stats", "/leads/log-stats", "/roi/cache-stats"]
+TOKEN = "ops-test-token"
+
+
+@pytest.fixture
+def client(monkeypatch) -> TestClient:
+    monkeypatch.setenv("OPS_STATS_TOKEN", TOKEN)
+    # No lifespan: the delivery worker is set up by the tests that need it
+    return TestClient(app)
+
+
+@pytest.mark.parametrize("path", STATS_PATHS)
+@pytest.mark.parametrize("authorization", [None, "Bearer wrong-token", f"Basic {TOKEN}"])
+def test_stats_refuse_a_missing_or_wrong_token(client: TestClient, path: str, authorization):
+    headers = {"Authorization": authorization} if authorization else {}
+
+    response = client.get(path, headers=headers)
+
+    assert response.status_code == 401
+
+
+@pytest.mark.parametrize("path", STATS_PATHS)
+def test_stats_are_refused_without_a_configured_token(client: TestClient, monkeypatch, path: str):
+    monkeypatch.delenv("OPS_STATS_TOKEN")
+
+    assert client.get(path, headers={"Authorization": "Bearer "}).status_code == 401
+
+
+@pytest.mark.parametrize("path", ["/leads/log-stats", "/roi/cache-stats"])
+def test_process_stats_with_the_token(client: TestClient, path: str):
+    response = client.get(path, headers={"Authorization": f"Bearer {TOKEN}"})
+
+    assert response.status_code == 200
+
+
+def test_delivery_stats_with_the_token(client: TestClient, monkeypatch, lead_store, fake_monday: FakeMonday):
+    monday_client = AsyncMondayClient(
+        api_token="test-token",
+        api_url="https://api.monday.test/v2",
+        http2=False,
+        transport=fake_monday.transport(),
+        governor=MondayGovernor(budget_per_minute=600_000),
+    )
+    worker = OutboxWorker(lead_store, monday_client)
+    add_leads(lead_store, (lead("Ada"), ROI))
+    asyncio.run(worker.drain())
+    monkeypatch.setattr(app.state, "outbox_worker", worker, raising=False)
+
+    response = client.get("/leads/delivery-stats", headers={"Authorization": f"Bearer {TOKEN}"})
+
+    assert response.status_code == 200
+    stats = response.json()
+    assert stats["outbox"] == {"delivered": 1} and stats["delivered"] == 1
+    governor = stats["governor"]
+    assert governor["budget_per_minute"] == 600_000
+    assert governor["requests"] >= 1
+    assert governor["breaker_state"] == "closed" and governor["breaker_opens"] == 0